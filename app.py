@@ -1,23 +1,38 @@
 import streamlit as st
 import logging
 from src.database import Database
-from config.config import DB_CONFIG
+from src import queries
+from src.read_cache import ReadCache
+from config.config import DB_CONFIG, DB_POOL_CONFIG, READ_CACHE_CONFIG
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-# Inicializando BBDD
+# Inicializando BBDD: una sola instancia con pool de conexiones compartida por todas las
+# sesiones; cada consulta toma prestada su propia conexión y cursor.
+@st.cache_resource
+def get_database():
+    return Database(**DB_CONFIG, **DB_POOL_CONFIG)
+
 try:
-    db = Database(
-        host='localhost',
-        user='root',
-        password='admin',
-        database='quotes_db'
-    )
+    db = get_database()
 except Exception as e:
     st.error(f"Error al inicializar la base de datos: {e}")
     logging.error(f"Error al inicializar la base de datos: {e}")
 
+# Caché de lecturas compartida entre ejecuciones y sesiones. Se comprueba la versión de
+# datos en cada ejecución para descartar los resultados anteriores a una actualización.
+@st.cache_resource
+def get_read_cache():
+    return ReadCache(**READ_CACHE_CONFIG)
+
+read_cache = get_read_cache()
+try:
+    read_cache.set_version(db.get_data_version())
+except Exception as e:
+    read_cache.clear()
+    logging.error(f"Error obteniendo la versión de datos: {e}")
+
 # Streamlit app layout
 st.title("Buscador Frases")
 
@@ -36,81 +51,73 @@ def set_page_main():
     st.session_state.page = 'main'
     st.session_state.selected_tag = None
 
-# Funciones para obtener datos de la base de datos
-def fetch_all_authors():
-    query = "SELECT * FROM authors"
-    return db.fetch_all(query)
+# Funciones para obtener datos de la base de datos (ver src/queries.py)
+@read_cache.cached
+def count_quotes():
+    return queries.count_quotes(db)
 
-def fetch_author_by_id(author_id):
-    query = "SELECT * FROM authors WHERE id = %s"
-    return db.fetch_one(query, (author_id,))
+@read_cache.cached
+def count_authors():
+    return queries.count_authors(db)
 
-def fetch_all_quotes():
-    query = "SELECT * FROM quotes"
-    return db.fetch_all(query)
+@read_cache.cached
+def fetch_quotes_page(page, per_page):
+    return queries.fetch_quotes_page(db, page, per_page)
 
+@read_cache.cached
 def fetch_quote_by_id(quote_id):
-    query = "SELECT * FROM quotes WHERE id = %s"
-    return db.fetch_one(query, (quote_id,))
+    return queries.fetch_quote(db, quote_id)
 
-def fetch_quotes_by_author(author_id):
-    query = "SELECT * FROM quotes WHERE author_id = %s"
-    return db.fetch_all(query, (author_id,))
+@read_cache.cached
+def fetch_authors_page(page, per_page):
+    return queries.fetch_authors_page(db, page, per_page)
 
-def fetch_tags_by_quote(quote_id):
-    query = """
-    SELECT tags.id, tags.name FROM tags
-    JOIN quote_tags ON tags.id = quote_tags.tag_id
-    WHERE quote_tags.quote_id = %s
-    """
-    return db.fetch_all(query, (quote_id,))
+@read_cache.cached
+def fetch_author_by_id(author_id):
+    return queries.fetch_author(db, author_id)
 
+@read_cache.cached
+def fetch_quotes_by_author(author_id):
+    return queries.fetch_quotes_by_author(db, author_id)
+
+@read_cache.cached
 def fetch_quotes_by_tag(tag_id):
-    query = """
-    SELECT quotes.* FROM quotes
-    JOIN quote_tags ON quotes.id = quote_tags.quote_id
-    WHERE quote_tags.tag_id = %s
-    """
-    return db.fetch_all(query, (tag_id,))
+    return queries.fetch_quotes_by_tag(db, tag_id)
+
+@read_cache.cached
+def search_quotes(text):
+    return queries.search_quotes(db, text)
+
+@read_cache.cached
+def search_authors(text):
+    return queries.search_authors(db, text)
 
+@read_cache.cached
 def fetch_top_5_quotes():
-    query = "SELECT * FROM quotes ORDER BY id DESC LIMIT 5"
-    return db.fetch_all(query)
+    return queries.fetch_top_quotes(db, 5)
 
+@read_cache.cached
 def fetch_top_5_authors():
-    query = """
-    SELECT authors.*, COUNT(quotes.id) as quote_count
-    FROM authors
-    LEFT JOIN quotes ON authors.id = quotes.author_id
-    GROUP BY authors.id
-    ORDER BY quote_count DESC
-    LIMIT 5
-    """
-    return db.fetch_all(query)
+    return queries.fetch_top_authors(db, 5)
 
+@read_cache.cached
 def fetch_top_5_tags():
-    query = """
-    SELECT tags.*, COUNT(quote_tags.quote_id) as usage_count
-    FROM tags
-    LEFT JOIN quote_tags ON tags.id = quote_tags.tag_id
-    GROUP BY tags.id
-    ORDER BY usage_count DESC
-    LIMIT 5
-    """
-    return db.fetch_all(query)
+    return queries.fetch_top_tags(db, 5)
 
 # Sidebar para navegación principal
-main_menu = ["Lista Frases", "Frase","Lista Autores", "Autor",  "TOP 5"]
+main_menu = ["Lista Frases", "Frase", "Buscar", "Lista Autores", "Autor",  "TOP 5"]
 main_choice = st.sidebar.selectbox("Menu", main_menu)
 
+with st.sidebar.expander("Métricas"):
+    st.json({'pool': db.pool_stats(), 'cache': read_cache.stats()})
+
 # Función para mostrar frases por etiqueta
 def show_quotes_by_tag(tag_id, tag_name):
     st.subheader(f"Frases con la etiqueta: {tag_name}")
     try:
         tag_quotes = fetch_quotes_by_tag(tag_id)
         for quote in tag_quotes:
-            author = fetch_author_by_id(quote[2])
-            author_name = author[1] if author else "Autor desconocido"
+            author_name = quote[2] or "Autor desconocido"
             st.markdown(f"**Frase:** '{quote[1]}'")
             st.markdown(f"**Autor:** {author_name}")
             st.markdown("---")
@@ -136,24 +143,20 @@ else:
     if main_choice == "Lista Frases":
         st.subheader("Lista Frases")
         try:
-            quotes = fetch_all_quotes()
             quotes_per_page = 5
-            total_quotes = len(quotes)    
+            total_quotes = count_quotes()
             total_pages = (total_quotes + quotes_per_page - 1) // quotes_per_page
             selected_page = st.selectbox("Selecciona página", range(1, total_pages + 1))
-            start = (selected_page - 1) * quotes_per_page
-            end = start + quotes_per_page
-        
-            for quote in quotes[start:end]:
-                author = fetch_author_by_id(quote[2])
-                author_name = author[1] if author else "Autor desconocido"
-                about_author = author[3] if author else ""
-                tags = fetch_tags_by_quote(quote[0])
-                
-                st.markdown(f"**Frase:** '{quote[1]}'")
+
+            for quote in fetch_quotes_page(selected_page, quotes_per_page) if selected_page else []:
+                author_name = quote.author_name or "Autor desconocido"
+                about_author = quote.about_link or ""
+
+                st.markdown(f"**Frase:** '{quote.text}'")
                 st.markdown(f"**Autor:** {author_name} - [About]({about_author})")
-                
-                show_tag_buttons(tags, quote[0])
+
+                if quote.tags:
+                    show_tag_buttons(quote.tags, quote.id)
                 
                 st.markdown("---")
 
@@ -168,15 +171,13 @@ else:
             try:
                 quote = fetch_quote_by_id(quote_id)
                 if quote:
-                    author = fetch_author_by_id(quote[2])
-                    author_name = author[1] if author else "Autor desconocido"
-                    about_author = author[3] if author else ""
-                    tags = fetch_tags_by_quote(quote_id)
-                    
-                    st.markdown(f"**Frase:** '{quote[1]}'")
+                    author_name = quote.author_name or "Autor desconocido"
+                    about_author = quote.about_link or ""
+
+                    st.markdown(f"**Frase:** '{quote.text}'")
                     st.markdown(f"**Autor:** {author_name} - [About]({about_author})")
-                    
-                    tag_list = ", ".join([tag[1] for tag in tags]) if tags else "Sin etiquetas"
+
+                    tag_list = ", ".join([tag[1] for tag in quote.tags]) if quote.tags else "Sin etiquetas"
                     st.markdown(f"**Etiquetas:** {tag_list}")
                     
                     st.markdown("---")                
@@ -186,18 +187,39 @@ else:
                 st.error(f"Error buscando Frase: {e}")
                 logging.error(f"Error buscando Frase: {e}")
                 
+    elif main_choice == "Buscar":
+        st.subheader("Buscar")
+        search_text = st.text_input("Introduzca palabras de la Frase, el autor o su biografía")
+        if search_text.strip():
+            try:
+                found_quotes = search_quotes(search_text.strip())
+                found_authors = search_authors(search_text.strip())
+                if not found_quotes and not found_authors:
+                    st.warning("No se encontraron resultados")
+                if found_authors:
+                    st.markdown("### Autores")
+                    for author in found_authors:
+                        st.markdown(f"**Autor:** {author[1]} (ID {author[0]}) - [About]({author[2]})")
+                if found_quotes:
+                    st.markdown("### Frases")
+                    for quote in found_quotes:
+                        author_name = quote[2] or "Autor desconocido"
+                        st.markdown(f"**Frase:** '{quote[1]}'")
+                        st.markdown(f"**Autor:** {author_name}")
+                        st.markdown("---")
+            except Exception as e:
+                st.error(f"Error en la búsqueda: {e}")
+                logging.error(f"Error en la búsqueda: {e}")
+
     elif main_choice == "Lista Autores":
         st.subheader("Lista de Autores")
         try:
-            authors = fetch_all_authors()
             authors_per_page = 5
-            total_authors = len(authors)
+            total_authors = count_authors()
             total_pages = (total_authors + authors_per_page - 1) // authors_per_page
             selected_page = st.selectbox("Selecciona página", range(1, total_pages + 1))
-            start = (selected_page - 1) * authors_per_page
-            end = start + authors_per_page
-            
-            for author in authors[start:end]:
+
+            for author in fetch_authors_page(selected_page, authors_per_page) if selected_page else []:
                 # Crear columnas para autor, biografía (About) y botón de ver frases
                 cols = st.columns([3, 2, 1])
                 # Mostrar el nombre del autor
@@ -214,9 +236,6 @@ else:
                     else:
                         st.warning("No se encontraron frases para este autor")
                 st.markdown("---")
-            #for author in authors[start:end]:
-                #st.markdown(f"**Autor:** {author[1]} - [About]({author[3]})")
-                #st.write(f"Nombre: {author[1]}, About: {author[3]}")
         except Exception as e:
             st.error(f"Error buscando autores: {e}")
             logging.error(f"Error buscando autores: {e}")
@@ -253,8 +272,7 @@ else:
             try:
                 top_quotes = fetch_top_5_quotes()
                 for quote in top_quotes:
-                    author = fetch_author_by_id(quote[2])
-                    author_name = author[1] if author else "Autor desconocido"
+                    author_name = quote[2] or "Autor desconocido"
                     st.markdown(f"**Frase:** '{quote[1]}'")
                     st.markdown(f"**Autor:** {author_name}")
                     st.markdown("---")
@@ -268,7 +286,7 @@ else:
                 top_authors = fetch_top_5_authors()
                 for author in top_authors:
                     st.markdown(f"**Autor:** {author[1]}")
-                    st.markdown(f"**Número de frases:** {author[4]}")
+                    st.markdown(f"**Número de frases:** {author[2]}")
                     st.markdown("---")
             except Exception as e:
                 st.error(f"Error buscando TOP 5 Autores: {e}")
@@ -0,0 +1,81 @@
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models import Quote  # noqa: E402
+
+'''
+Benchmark de memoria de los modelos (src/models.py).
+
+Construye N Frases tal como las produce el parser (cada campo es una cadena nueva, aunque el
+autor, el enlace y las etiquetas se repitan) y mide con tracemalloc los bytes por Frase de la
+clase anterior (con `__dict__`, lista de etiquetas y cadenas duplicadas) frente a la actual
+(`__slots__`, tupla de etiquetas y cadenas internadas).
+
+Uso:
+    python benchmarks/bench_models.py --count 1000000
+'''
+
+
+class LegacyQuote:
+    """Modelo anterior, para comparar."""
+    def __init__(self, text, author, tags, author_about_link):
+        self.text = text
+        self.author = author
+        self.tags = tags
+        self.author_about_link = author_about_link
+
+
+AUTHORS = [f"Autor {i}" for i in range(50)]
+TAGS = [f"etiqueta-{i}" for i in range(150)]
+
+
+def parsed_fields(count, seed=0):
+    """Genera los campos de `count` Frases como cadenas nuevas, igual que al parsear HTML."""
+    rng = random.Random(seed)
+    for i in range(count):
+        author = rng.choice(AUTHORS)
+        yield (
+            f"“Frase número {i} con un texto de longitud realista para la prueba.”",
+            ''.join(author),
+            [''.join(tag) for tag in rng.sample(TAGS, rng.randint(0, 4))],
+            ''.join(f"https://quotes.toscrape.com/author/{author.replace(' ', '-')}"),
+        )
+
+
+def measure(model, count):
+    """Devuelve (bytes por Frase, segundos) al construir `count` instancias de `model`."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    before = tracemalloc.get_traced_memory()[0]
+    quotes = [model(*fields) for fields in parsed_fields(count)]
+    elapsed = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del quotes
+    return used / count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memoria de los modelos")
+    parser.add_argument('--count', type=int, default=1_000_000, help="Número de Frases")
+    args = parser.parse_args()
+
+    text_bytes = sum(sys.getsizeof(fields[0]) for fields in parsed_fields(min(args.count, 10000))) / min(args.count, 10000)
+    print(f"Frases: {args.count} (el texto ocupa {text_bytes:.0f} bytes por Frase en ambos modelos)")
+    results = {}
+    for name, model in (("anterior", LegacyQuote), ("actual", Quote)):
+        per_quote, elapsed = measure(model, args.count)
+        results[name] = per_quote
+        print(f"{name:>9}: {per_quote:8.1f} bytes/Frase  {per_quote * args.count / 2**20:8.1f} MB  ({elapsed:.1f} s)")
+    print(f"Ahorro: {results['anterior'] - results['actual']:.1f} bytes/Frase "
+          f"({1 - results['actual'] / results['anterior']:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+import re
+import sys
+import time
+import random
+import argparse
+from html import unescape
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.clean_data import clean_data  # noqa: E402
+from src.models import Quote, Author  # noqa: E402
+from src.normalizer import TextNormalizer  # noqa: E402
+
+'''
+Microbenchmark del motor de normalización (src/normalizer.py).
+
+Genera un corpus sintético con la forma de los datos reales (textos únicos, unas decenas de
+autores y un vocabulario pequeño de etiquetas) y mide el rendimiento en MB de texto por
+segundo de la implementación anterior (patrones sin compilar y sin cachés) frente a la actual.
+
+Uso:
+    python benchmarks/bench_normalizer.py --mb 8 --repeat 3
+'''
+
+WORDS = ("vida amor tiempo mundo verdad &amp; “sueño” éxito miedo libertad cambio "
+         "persona camino corazón palabra libro música luz noche día").split()
+AUTHORS = [f"{title}Autor {surname}" for title in ("", "Dr. ", "Mr. ") for surname in
+           ("Einstein", "Austen", "Rowling", "Twain", "Wilde", "Lennon", "Seuss", "Roosevelt",
+            "Hemingway", "Gandhi", "Churchill", "Picasso", "Tolkien", "Lewis", "Marley")]
+TAGS = [f"Tag{i}" for i in range(120)] + ["Vida", "AMOR", "inspiración", "humor"]
+
+
+def legacy_clean_text(text):
+    text = unescape(text)
+    text = ' '.join(text.split())
+    text = re.sub(r'[^\w\s.,!?"-]', '', text)
+    return text.strip()
+
+
+def legacy_clean_author_name(name):
+    name = re.sub(r'^(Mr\.|Mrs\.|Ms\.|Dr\.|Prof\.)\s+', '', name)
+    name = ' '.join(word.capitalize() for word in name.split())
+    return legacy_clean_text(name)
+
+
+def legacy_clean_tags(tags):
+    return list(dict.fromkeys(legacy_clean_text(tag.lower()) for tag in tags))
+
+
+def build_corpus(megabytes, seed=0):
+    """Genera Frases hasta alcanzar aproximadamente `megabytes` MB de texto."""
+    rng = random.Random(seed)
+    quotes, size = [], 0
+    while size < megabytes * 1024 * 1024:
+        text = "  “" + ' '.join(rng.choices(WORDS, k=rng.randint(8, 30))) + ".”  "
+        author = rng.choice(AUTHORS)
+        tags = rng.sample(TAGS, rng.randint(0, 5))
+        quotes.append((text, author, tags))
+        size += len(text.encode('utf-8')) + len(author) + sum(len(tag) for tag in tags)
+    return quotes, size
+
+
+def run_legacy(corpus):
+    return [(legacy_clean_text(t), legacy_clean_author_name(a), legacy_clean_tags(g)) for t, a, g in corpus]
+
+
+def run_engine(corpus):
+    engine = TextNormalizer()
+    result = [(engine.text(t), engine.author_name(a), engine.tags(g)) for t, a, g in corpus]
+    return result, engine.stats()
+
+
+def measure(function, corpus, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(corpus)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark del motor de normalización")
+    parser.add_argument('--mb', type=float, default=8, help="MB de texto del corpus")
+    parser.add_argument('--repeat', type=int, default=3, help="Repeticiones (se toma la mejor)")
+    args = parser.parse_args()
+
+    corpus, size = build_corpus(args.mb)
+    megabytes = size / (1024 * 1024)
+    print(f"Corpus: {len(corpus)} Frases, {megabytes:.2f} MB")
+
+    legacy_time, legacy_result = measure(run_legacy, corpus, args.repeat)
+    engine_time, (engine_result, stats) = measure(run_engine, corpus, args.repeat)
+    assert engine_result == legacy_result, "El motor no produce el mismo resultado que la implementación anterior"
+
+    quotes = [Quote(t, a, g, "quotes.toscrape.com/author/x") for t, a, g in corpus]
+    authors = [Author(a, "Biografía &amp; obra", "quotes.toscrape.com/author/x") for a in AUTHORS]
+    clean_time, _ = measure(lambda _: clean_data(quotes, authors), corpus, args.repeat)
+
+    for name, elapsed in (("anterior", legacy_time), ("motor", engine_time), ("clean_data", clean_time)):
+        print(f"{name:>10}: {elapsed:.3f} s  {megabytes / elapsed:8.2f} MB/s  {elapsed / megabytes * 1000:8.1f} ms/MB")
+    print(f"Mejora del motor: x{legacy_time / engine_time:.2f}")
+    print(f"Cachés: {stats}")
+
+
+if __name__ == '__main__':
+    main()
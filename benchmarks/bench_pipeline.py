@@ -0,0 +1,212 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.site_server import SyntheticSite, SiteServer  # noqa: E402
+from src.clean_data import clean_data, iter_clean_pages  # noqa: E402
+from src.database import Database  # noqa: E402
+from src.parsers import get_parser  # noqa: E402
+from src.scraper import Scraper  # noqa: E402
+
+'''
+Benchmark del pipeline completo sin red: Scraper -> clean_data -> Database.insert_data.
+
+Levanta el sitio sintético de benchmarks/site_server.py, ejecuta el pipeline contra una base
+de datos SQLite temporal y mide por etapa el tiempo, páginas/s, Frases/s, filas/s y el pico
+de RSS. Los resultados se guardan en JSON (benchmarks/results/) para comparar entre commits.
+
+Uso:
+    python benchmarks/bench_pipeline.py --pages 100 --authors 50 --latency 0.005
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/<anterior>.json
+'''
+
+
+class RssSampler:
+    """Muestrea en segundo plano la memoria residente del proceso y guarda el pico."""
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def current():
+        """RSS actual en bytes (Linux); en otros sistemas, el máximo histórico del proceso."""
+        try:
+            with open('/proc/self/statm') as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, AttributeError):
+            import resource
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.current())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.peak = self.current()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.current())
+
+
+def run_stage(results, name, function, **counters):
+    """
+    Ejecuta una etapa y guarda su duración, pico de RSS y ritmos (contador / segundo).
+
+    Args:
+        counters: Funciones que reciben el resultado de la etapa y devuelven cada contador
+            (por ejemplo, pages=lambda result: ...).
+    """
+    with RssSampler() as sampler:
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+    stage = {'seconds': round(elapsed, 4), 'rss_peak_mb': round(sampler.peak / 2**20, 1)}
+    for key, counter in counters.items():
+        value = counter(result)
+        stage[key] = value
+        stage[f"{key}_per_s"] = round(value / elapsed, 1) if elapsed else None
+    results[name] = stage
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(pages=50, authors=50, quotes_per_page=10, latency=0.0, concurrency=8,
+                  parser='auto', streaming=False, batch_size=100):
+    """
+    Ejecuta el pipeline completo contra el sitio sintético.
+
+    Returns:
+        dict: Configuración, entorno y métricas por etapa.
+    """
+    site = SyntheticSite(pages=pages, authors=authors, quotes_per_page=quotes_per_page, latency=latency)
+    stages = {}
+    with SiteServer(site) as server, tempfile.TemporaryDirectory() as tmp:
+        scraper = Scraper(server.url, concurrency=concurrency, parser=get_parser(parser))
+        db = Database(database=os.path.join(tmp, 'bench.db'))
+        try:
+            run_stage(stages, 'schema', db.create_tables)
+            if streaming:
+                # Scraping, limpieza e inserción encadenados página a página
+                quotes = run_stage(
+                    stages, 'pipeline',
+                    lambda: db.insert_stream(iter_clean_pages(scraper.iter_pages()), batch_size=batch_size),
+                    pages=lambda _: scraper.pages_fetched,
+                    quotes=lambda processed: processed,
+                    rows=lambda _: db.rows_written,
+                )
+            else:
+                run_stage(
+                    stages, 'scrape', scraper.scrape,
+                    pages=lambda _: scraper.pages_fetched,
+                    quotes=lambda _: len(scraper.quotes),
+                )
+                cleaned_quotes, cleaned_authors = run_stage(
+                    stages, 'clean', lambda: clean_data(scraper.quotes, scraper.authors.values()),
+                    quotes=lambda result: len(result[0]),
+                )
+                run_stage(
+                    stages, 'insert', lambda: db.insert_data(cleaned_quotes, cleaned_authors),
+                    quotes=lambda counts: counts['quotes'],
+                    rows=lambda counts: sum(counts.values()),
+                )
+            stored = db.fetch_one("SELECT COUNT(*) FROM quotes")[0]
+        finally:
+            scraper.close()
+            db.close()
+
+    measured = [stage for name, stage in stages.items() if name != 'schema']
+    total = sum(stage['seconds'] for stage in measured)
+    stages['total'] = {
+        'seconds': round(total, 4),
+        'quotes_per_s': round(site.total_quotes / total, 1) if total else None,
+        'rss_peak_mb': max(stage['rss_peak_mb'] for stage in measured),
+    }
+    if stored != site.total_quotes:
+        raise RuntimeError(f"Se esperaban {site.total_quotes} Frases en la base de datos y hay {stored}")
+    return {
+        'benchmark': 'pipeline',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            'pages': pages, 'authors': authors, 'quotes_per_page': quotes_per_page, 'latency': latency,
+            'concurrency': concurrency, 'parser': get_parser(parser).name, 'streaming': streaming,
+            'batch_size': batch_size,
+        },
+        'requests': site.requests,
+        'stages': stages,
+    }
+
+
+def compare(current, baseline):
+    """Imprime la variación de cada ritmo (x_per_s) y de la duración respecto a una ejecución anterior."""
+    print(f"Comparación con {baseline.get('commit')} ({baseline.get('timestamp')}):")
+    for name, stage in current['stages'].items():
+        before = baseline.get('stages', {}).get(name)
+        if not before:
+            continue
+        for key, value in stage.items():
+            if (key.endswith('_per_s') or key == 'seconds') and before.get(key) and value is not None:
+                change = (value - before[key]) / before[key]
+                print(f"  {name:>8}.{key:<16} {before[key]:>10} -> {value:>10}  ({change:+.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline del pipeline completo")
+    parser.add_argument('--pages', type=int, default=50, help="Páginas del listado")
+    parser.add_argument('--authors', type=int, default=50, help="Autores distintos")
+    parser.add_argument('--quotes-per-page', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0, help="Retardo por respuesta en segundos")
+    parser.add_argument('--concurrency', type=int, default=8, help="Peticiones simultáneas del scraper")
+    parser.add_argument('--parser', default='auto', help="Parser HTML: soup, lxml o auto")
+    parser.add_argument('--streaming', action='store_true', help="Usar el pipeline en streaming")
+    parser.add_argument('--batch-size', type=int, default=100, help="Tamaño de lote en streaming")
+    parser.add_argument('--output', help="Fichero JSON de resultados (por defecto, en benchmarks/results/)")
+    parser.add_argument('--compare', help="JSON de una ejecución anterior con el que comparar")
+    args = parser.parse_args()
+
+    result = run_benchmark(
+        pages=args.pages, authors=args.authors, quotes_per_page=args.quotes_per_page, latency=args.latency,
+        concurrency=args.concurrency, parser=args.parser, streaming=args.streaming, batch_size=args.batch_size,
+    )
+    print(json.dumps(result['stages'], indent=2))
+
+    output = Path(args.output) if args.output else (
+        ROOT / 'benchmarks' / 'results' / f"pipeline-{result['commit'] or 'local'}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f"Resultados guardados en {output}")
+
+    if args.compare:
+        compare(result, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == '__main__':
+    main()
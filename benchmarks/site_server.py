@@ -0,0 +1,136 @@
+import time
+import random
+import threading
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+'''
+Servidor HTTP local que imita quotes.toscrape.com para los benchmarks:
+- `/page/N/` sirve N páginas de listado con `quotes_per_page` Frases sintéticas
+(la página siguiente a la última no tiene Frases, como en el sitio real).
+- `/author/<slug>/` sirve la biografía de cada uno de los `authors` autores.
+- `latency` añade un retardo fijo (segundos) a cada respuesta.
+El contenido es determinista para una misma semilla.
+'''
+
+WORDS = ("life love time world truth dream success fear freedom change person road heart "
+         "word book music light night day friend mind soul hope").split()
+TAGS = [f"tag-{i}" for i in range(60)] + ["love", "life", "humor", "inspirational", "books"]
+
+
+class SyntheticSite:
+    """
+    Contenido del sitio sintético.
+
+    Attributes:
+        pages (int): Número de páginas del listado con Frases.
+        authors (int): Número de autores distintos.
+        quotes_per_page (int): Frases por página.
+        latency (float): Retardo añadido a cada respuesta en segundos.
+    """
+    def __init__(self, pages=50, authors=50, quotes_per_page=10, latency=0.0, seed=0):
+        self.pages = pages
+        self.authors = authors
+        self.quotes_per_page = quotes_per_page
+        self.latency = latency
+        self.seed = seed
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_quotes(self):
+        return self.pages * self.quotes_per_page
+
+    def author_name(self, index):
+        return f"Author Number {index}"
+
+    def author_slug(self, index):
+        return f"Author-Number-{index}"
+
+    def listing(self, page):
+        """HTML de una página del listado."""
+        divs = []
+        if 1 <= page <= self.pages:
+            for i in range((page - 1) * self.quotes_per_page, page * self.quotes_per_page):
+                rng = random.Random(self.seed * 1_000_003 + i)
+                text = f"“Quote {i}: " + ' '.join(rng.choices(WORDS, k=rng.randint(8, 30))) + ".”"
+                author = i % self.authors
+                tags = ''.join(
+                    f'<a class="tag" href="/tag/{tag}/page/1/">{tag}</a>' for tag in rng.sample(TAGS, rng.randint(0, 5))
+                )
+                divs.append(
+                    f'<div class="quote" itemscope itemtype="http://schema.org/CreativeWork">'
+                    f'<span class="text" itemprop="text">{escape(text)}</span>'
+                    f'<span>by <small class="author" itemprop="author">{self.author_name(author)}</small> '
+                    f'<a href="/author/{self.author_slug(author)}">(about)</a></span>'
+                    f'<div class="tags">Tags: {tags}</div></div>'
+                )
+        body = ''.join(divs) or 'No quotes found!'
+        return f'<html><head><title>Quotes to Scrape</title></head><body><div class="container"><div class="row"><div class="col-md-8">{body}</div></div></div></body></html>'
+
+    def author(self, slug):
+        """HTML de la página de un autor, o None si no existe."""
+        index = slug.rsplit('-', 1)[-1]
+        if not index.isdigit() or int(index) >= self.authors:
+            return None
+        rng = random.Random(self.seed * 7_919 + int(index))
+        description = ' '.join(rng.choices(WORDS, k=120))
+        return (
+            f'<html><body><div class="author-details"><h3 class="author-title">{self.author_name(int(index))}</h3>'
+            f'<p><strong>Born:</strong> <span class="author-born-date">March 14, 1879</span> '
+            f'<span class="author-born-location">in Ulm, Germany</span></p>'
+            f'<div class="author-description">\n        {description}\n    </div></div></body></html>'
+        )
+
+    def render(self, path):
+        """Devuelve (código de estado, HTML) para una ruta."""
+        parts = [part for part in path.split('?')[0].split('/') if part]
+        if len(parts) == 2 and parts[0] == 'page' and parts[1].isdigit():
+            return 200, self.listing(int(parts[1]))
+        if len(parts) == 2 and parts[0] == 'author':
+            html = self.author(parts[1])
+            if html is not None:
+                return 200, html
+        return 404, '<html><body>Not found</body></html>'
+
+
+def _handler(site):
+    class SiteHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Sin Nagle: la cabecera y el cuerpo se envían por separado y el retardo de ACK falsearía la latencia
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            with site._lock:
+                site.requests += 1
+            if site.latency:
+                time.sleep(site.latency)
+            status, html = site.render(self.path)
+            body = html.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+    return SiteHandler
+
+
+class SiteServer:
+    """Servidor HTTP/1.1 (con keep-alive) del sitio sintético en un puerto libre de 127.0.0.1."""
+    def __init__(self, site):
+        self.site = site
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _handler(site))
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
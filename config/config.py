@@ -21,9 +21,123 @@ DB_CONFIG = {
     'database': os.getenv('DB_NAME', 'quotes_db')
 }
 
+# Pool de conexiones de la aplicación Streamlit (una conexión por consulta concurrente)
+DB_POOL_CONFIG = {
+    'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+    'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+}
+
 # # URL del sitio web a scrapear
 SCRAPE_URL = os.getenv('SCRAPE_URL', 'https://quotes.toscrape.com/')
 
+# Número de peticiones simultáneas del scraper (1 = modo secuencial)
+SCRAPER_CONCURRENCY = int(os.getenv('SCRAPER_CONCURRENCY', '8'))
+
+# Parser HTML del scraper: 'soup' (referencia), 'lxml' (rápido) o 'auto'
+PARSER_BACKEND = os.getenv('PARSER_BACKEND', 'auto')
+
+# Configuración de la sesión HTTP del scraper (pool de conexiones, timeouts y reintentos)
+HTTP_CONFIG = {
+    'pool_connections': int(os.getenv('HTTP_POOL_CONNECTIONS', '4')),
+    'pool_maxsize': int(os.getenv('HTTP_POOL_MAXSIZE', '16')),
+    'connect_timeout': float(os.getenv('HTTP_CONNECT_TIMEOUT', '5')),
+    'read_timeout': float(os.getenv('HTTP_READ_TIMEOUT', '15')),
+    'retries': int(os.getenv('HTTP_RETRIES', '3')),
+    'backoff_factor': float(os.getenv('HTTP_BACKOFF_FACTOR', '0.5')),
+    'status_forcelist': (500, 502, 503, 504),
+}
+
+# Limitador adaptativo de peticiones por host (AIMD): ritmo inicial, mínimo y máximo en
+# peticiones/s, ventana inicial y máxima de peticiones simultáneas (la máxima efectiva es
+# SCRAPER_CONCURRENCY), latencia objetivo en segundos y reintentos de los 429/503
+RATE_LIMIT_CONFIG = {
+    'enabled': os.getenv('RATE_LIMIT_ENABLED', 'true').lower() in ('1', 'true', 'yes'),
+    'rate': float(os.getenv('RATE_LIMIT_RATE', '5')),
+    'min_rate': float(os.getenv('RATE_LIMIT_MIN_RATE', '0.5')),
+    'max_rate': float(os.getenv('RATE_LIMIT_MAX_RATE', '50')),
+    'burst': int(os.getenv('RATE_LIMIT_BURST', '5')),
+    'concurrency': int(os.getenv('RATE_LIMIT_CONCURRENCY', '2')),
+    'max_concurrency': SCRAPER_CONCURRENCY,
+    'latency_target': float(os.getenv('RATE_LIMIT_LATENCY_TARGET', '1.0')),
+    'max_retry_after': float(os.getenv('RATE_LIMIT_MAX_RETRY_AFTER', '60')),
+    'retries': int(os.getenv('RATE_LIMIT_RETRIES', '3')),
+}
+
+# Almacén persistente de biografías de autores (se reutilizan mientras no superen el TTL)
+AUTHOR_STORE_CONFIG = {
+    'path': os.getenv('AUTHOR_STORE_PATH', os.path.join(project_dir, 'data', 'author_store.db')),
+    'ttl': float(os.getenv('AUTHOR_STORE_TTL', str(7 * 24 * 3600))),
+}
+
+# Caché HTTP condicional (ETag / Last-Modified) de las páginas descargadas
+HTTP_CACHE_CONFIG = {
+    'path': os.getenv('HTTP_CACHE_PATH', os.path.join(project_dir, 'data', 'http_cache.db')),
+    'max_bytes': int(os.getenv('HTTP_CACHE_MAX_BYTES', str(64 * 1024 * 1024))),
+}
+
+# Frontera persistente del recorrido por lotes: las ejecuciones interrumpidas o con autores
+# fallidos se reanudan donde se quedaron. Cada URL fallida se reintenta hasta `max_attempts`
+# veces, esperando `backoff` segundos tras el primer fallo (el doble en cada intento, hasta
+# `max_backoff`); un recorrido sin terminar se descarta pasados `max_age` segundos
+FRONTIER_CONFIG = {
+    'enabled': os.getenv('FRONTIER_ENABLED', 'true').lower() in ('1', 'true', 'yes'),
+    'path': os.getenv('FRONTIER_PATH', os.path.join(project_dir, 'data', 'frontier.db')),
+    'max_attempts': int(os.getenv('FRONTIER_MAX_ATTEMPTS', '3')),
+    'backoff': float(os.getenv('FRONTIER_BACKOFF', '60')),
+    'max_backoff': float(os.getenv('FRONTIER_MAX_BACKOFF', '3600')),
+    'max_age': float(os.getenv('FRONTIER_MAX_AGE', str(24 * 3600))),
+}
+
+# Pipeline en streaming: extrae, limpia e inserta página a página en lotes de `batch_size` Frases
+PIPELINE_CONFIG = {
+    'streaming': os.getenv('PIPELINE_STREAMING', 'false').lower() in ('1', 'true', 'yes'),
+    'batch_size': int(os.getenv('PIPELINE_BATCH_SIZE', '100')),
+    # Actualización incremental: solo se procesan las páginas cuya huella ha cambiado y el
+    # recorrido se detiene tras `stop_after` páginas seguidas sin cambios (0 = recorrer todo).
+    # Detenerse pronto ahorra peticiones, pero no detecta las Frases añadidas detrás de una
+    # página sin cambios: por eso cada `full_sweep_interval` segundos (y en la primera
+    # ejecución del proceso) se recorre el listado completo (0 = nunca)
+    'incremental': os.getenv('PIPELINE_INCREMENTAL', 'true').lower() in ('1', 'true', 'yes'),
+    'stop_after': int(os.getenv('PIPELINE_STOP_AFTER', '1')),
+    'full_sweep_interval': float(os.getenv('PIPELINE_FULL_SWEEP_INTERVAL', str(24 * 3600))),
+}
+
+# Limpieza de datos en paralelo: número de procesos (1 = secuencial) y tamaño mínimo de la
+# entrada (Frases + autores) a partir del cual se usa el pool de procesos
+CLEAN_CONFIG = {
+    'workers': int(os.getenv('CLEAN_WORKERS', str(os.cpu_count() or 1))),
+    'threshold': int(os.getenv('CLEAN_PARALLEL_THRESHOLD', '5000')),
+}
+
+# Actualización periódica: intervalo y presupuesto de tiempo de cada ejecución (segundos) y
+# fichero de bloqueo que impide ejecuciones simultáneas
+SCHEDULER_CONFIG = {
+    'interval': float(os.getenv('SCHEDULER_INTERVAL', '60')),
+    'budget': float(os.getenv('SCHEDULER_BUDGET', '300')) or None,
+    'lock_path': os.getenv('SCHEDULER_LOCK_PATH', os.path.join(project_dir, 'data', 'update.lock')),
+}
+
+# Caché de lecturas de la aplicación Streamlit (se invalida al cambiar la versión de datos)
+READ_CACHE_CONFIG = {
+    'ttl': float(os.getenv('READ_CACHE_TTL', '300')),
+    'maxsize': int(os.getenv('READ_CACHE_MAXSIZE', '256')),
+}
+
+# Métricas del pipeline: puerto del endpoint Prometheus (/metrics) del programador de
+# actualizaciones (0 = desactivado). El resumen JSON de cada ejecución va a logs/metrics.log
+METRICS_CONFIG = {
+    'port': int(os.getenv('METRICS_PORT', '0')),
+}
+
+# Perfilado de las rutas críticas (también con --profile en main.py y update_database.py): un
+# fichero .prof por ámbito y ejecución en `output_dir` y las `top_n` funciones más costosas en el log
+PROFILE_CONFIG = {
+    'enabled': os.getenv('PROFILE', 'false').lower() in ('1', 'true', 'yes'),
+    'output_dir': os.getenv('PROFILE_DIR', os.path.join(project_dir, 'profiles')),
+    'top_n': int(os.getenv('PROFILE_TOP_N', '15')),
+    'sort': os.getenv('PROFILE_SORT', 'tottime'),
+}
+
 # Configuración mejorada de logs
 LOG_CONFIG = {
     'version': 1,
@@ -32,6 +146,9 @@ LOG_CONFIG = {
         'standard': {
             'format': '%(asctime)s - %(levelname)s - %(message)s'
         },
+        'json': {
+            'format': '%(message)s'
+        },
     },
     'handlers': {
         'file': {
@@ -41,14 +158,26 @@ LOG_CONFIG = {
             'formatter': 'standard',
             'encoding': 'utf-8',
         
-        }
+        },
+        'metrics_file': {
+            'class': 'logging.FileHandler',
+            'filename': 'logs/metrics.log',
+            'mode': 'a',
+            'formatter': 'json',
+            'encoding': 'utf-8',
+        },
     },
     'loggers': {
         '': {  # root logger
             'handlers': ['file'],
             'level': 'INFO',
             'propagate': True
-        }
+        },
+        'metrics': {  # una línea JSON por ejecución (ver src/metrics.py)
+            'handlers': ['metrics_file'],
+            'level': 'INFO',
+            'propagate': False
+        },
     }
 }
 
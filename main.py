@@ -1,10 +1,18 @@
+import argparse
 import logging
 import logging.config
 import os
-from config.config import LOG_CONFIG, DB_CONFIG, SCRAPE_URL
-from src.clean_data import clean_data
+import time
+from config.config import LOG_CONFIG, DB_CONFIG, SCRAPE_URL, SCRAPER_CONCURRENCY, AUTHOR_STORE_CONFIG, HTTP_CACHE_CONFIG, RATE_LIMIT_CONFIG, FRONTIER_CONFIG, PIPELINE_CONFIG, CLEAN_CONFIG, PROFILE_CONFIG
+from src.clean_data import clean_data, iter_clean_pages
 from src.scraper import Scraper
+from src.author_store import AuthorStore
+from src.http_cache import ResponseCache
+from src.rate_limiter import create_rate_limiter
+from src.frontier import create_frontier
 from src.database import Database
+from src import metrics
+from src.profiling import start_session
 
 
 def setup_logging():
@@ -13,7 +21,7 @@ def setup_logging():
     """
     logging.config.dictConfig(LOG_CONFIG)
 
-def main():
+def main(profile=PROFILE_CONFIG['enabled']):
     """
     Punto de entrada principal del programa.
 
@@ -22,36 +30,81 @@ def main():
         2. Realiza el web scraping para obtener Frases y autores.
         3. Limpia los datos obtenidos.
         4. Inserta los datos limpios en la base de datos.
+
+    Con PIPELINE_CONFIG['streaming'] activo, los pasos 2 a 4 se encadenan página a página
+    y los datos se insertan en lotes acotados a medida que se extraen. En modo por lotes, el
+    estado del recorrido se guarda en la frontera (ver src/frontier.py): si falla un autor se
+    insertan las demás Frases y una ejecución interrumpida se reanuda donde se quedó.
+
+    Con `profile` (PROFILE=1 o --profile) se perfilan las rutas críticas (ver src/profiling.py).
     
     En caso de errores, los mismos son registrados y la conexión a la base de datos se cierra adecuadamente.
     """
     setup_logging()
+    start = time.perf_counter()
+    profiler = start_session('main', **dict(PROFILE_CONFIG, enabled=profile))
     db = None
+    scraper = None
     try:
         logging.info("Iniciando el proceso de scraping")
-        scraper = Scraper(SCRAPE_URL)
-        scraper.scrape_quotes()
-        scraper.scrape_authors()
-        logging.info("Scraping completado")
+        scraper = Scraper(
+            SCRAPE_URL,
+            concurrency=SCRAPER_CONCURRENCY,
+            author_store=AuthorStore(**AUTHOR_STORE_CONFIG),
+            cache=ResponseCache(**HTTP_CACHE_CONFIG),
+            rate_limiter=create_rate_limiter(RATE_LIMIT_CONFIG),
+            # En modo por lotes el recorrido se reanuda si se interrumpe o fallan autores
+            frontier=None if PIPELINE_CONFIG['streaming'] else create_frontier(FRONTIER_CONFIG),
+        )
+        if PIPELINE_CONFIG['streaming']:
+            logging.info("Conectando a la base de datos")
+            db = Database(**DB_CONFIG)
+            db.create_tables()
+
+            logging.info("Iniciando scraping, limpieza e inserción en streaming")
+            pages = iter_clean_pages(scraper.iter_pages())
+            with metrics.stage('stream'):
+                processed = db.insert_stream(pages, batch_size=PIPELINE_CONFIG['batch_size'])
+            db.bump_data_version()
+            logging.info(f"Extracción y almacenamiento en streaming completados con éxito ({processed} Frases procesadas)")
+        else:
+            with metrics.stage('scrape'):
+                scraper.scrape()
+            logging.info("Scraping completado")
         
-        logging.info("Iniciando la limpieza de datos")
-        cleaned_quotes, cleaned_authors = clean_data(scraper.quotes, scraper.authors.values())
-        logging.info("Limpieza de datos completada")
+            logging.info("Iniciando la limpieza de datos")
+            with metrics.stage('clean'):
+                cleaned_quotes, cleaned_authors = clean_data(scraper.quotes, scraper.authors.values(), **CLEAN_CONFIG)
+            logging.info("Limpieza de datos completada")
 
-        logging.info("Conectando a la base de datos")
-        db = Database(**DB_CONFIG)
-        db.create_tables()
-        logging.info("Tablas creadas en la base de datos")
+            logging.info("Conectando a la base de datos")
+            db = Database(**DB_CONFIG)
+            db.create_tables()
+            logging.info("Tablas creadas en la base de datos")
 
-        logging.info("Insertando datos en la base de datos")
-        db.insert_data(cleaned_quotes, cleaned_authors)
-        logging.info("Extracción y almacenamiento de datos completados con éxito")
+            logging.info("Insertando datos en la base de datos")
+            with metrics.stage('insert'):
+                inserted = db.insert_data(cleaned_quotes, cleaned_authors)
+            if inserted is not None:
+                db.bump_data_version()
+                if scraper.frontier is not None:
+                    scraper.frontier.finish()
+            logging.info("Extracción y almacenamiento de datos completados con éxito")
 
     except Exception as e:
         logging.error(f"Ha ocurrido un error: {str(e)}")
     finally:
+        if scraper:
+            scraper.close()
         if db:
             db.close()
+        if profiler:
+            profiler.stop()
+        metrics.log_summary('main', duration=round(time.perf_counter() - start, 3))
             
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Extracción de Frases y autores y carga en la base de datos")
+    parser.add_argument('--profile', action='store_true', default=PROFILE_CONFIG['enabled'],
+                        help="Perfila el scraping, la limpieza y la inserción y resume los puntos calientes en el log")
+    args = parser.parse_args()
+    main(profile=args.profile)
\ No newline at end of file
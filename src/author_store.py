@@ -0,0 +1,99 @@
+import os
+import re
+import sqlite3
+import time
+import logging
+from urllib.parse import urlsplit, urlunsplit
+
+'''
+En este archivo se define el almacén persistente de páginas de autores:
+- Normaliza los enlaces "about" para usarlos como clave canónica.
+- Guarda la biografía extraída de cada autor en un fichero SQLite local.
+- Sirve las biografías más recientes que el TTL configurado sin volver a descargarlas.
+'''
+
+
+def canonical_link(url):
+    """
+    Normaliza un enlace a la página de un autor.
+
+    Pone en minúsculas el esquema y el host, colapsa las barras repetidas y
+    elimina la barra final, la query y el fragmento, de modo que
+    'https://quotes.toscrape.com//author/Albert-Einstein/' y
+    'https://Quotes.toscrape.com/author/Albert-Einstein' tienen la misma clave.
+    """
+    parts = urlsplit(url.strip())
+    path = re.sub(r'/{2,}', '/', parts.path).rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, '', ''))
+
+
+class AuthorStore:
+    """
+    Almacén persistente de biografías de autores indexado por enlace canónico.
+
+    Attributes:
+        path (str): Ruta del fichero SQLite (':memory:' para un almacén temporal).
+        ttl (float): Segundos durante los que una biografía se considera vigente.
+        hits (int): Biografías servidas desde el almacén.
+        misses (int): Autores que no estaban en el almacén.
+        stale (int): Autores presentes pero con la biografía caducada.
+    """
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS author_pages (
+                link TEXT PRIMARY KEY,
+                about TEXT,
+                about_link TEXT,
+                fetched_at REAL
+            )
+        """)
+        self.connection.commit()
+        logging.info(f"Almacén de autores abierto en {path} (TTL {ttl} s)")
+
+    def get(self, link, now=None):
+        """
+        Devuelve la biografía vigente de un autor o None si falta o ha caducado.
+
+        Args:
+            link (str): Enlace a la página del autor (se normaliza internamente).
+            now (float, optional): Marca de tiempo de referencia.
+        """
+        now = time.time() if now is None else now
+        row = self.connection.execute(
+            "SELECT about, fetched_at FROM author_pages WHERE link = ?", (canonical_link(link),)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        about, fetched_at = row
+        if now - fetched_at >= self.ttl:
+            self.stale += 1
+            return None
+        self.hits += 1
+        return about
+
+    def put(self, link, about, about_link=None, now=None):
+        """Guarda o actualiza la biografía de un autor."""
+        now = time.time() if now is None else now
+        self.connection.execute(
+            "INSERT OR REPLACE INTO author_pages (link, about, about_link, fetched_at) VALUES (?, ?, ?, ?)",
+            (canonical_link(link), about, about_link or link, now)
+        )
+        self.connection.commit()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'stale': self.stale}
+
+    def close(self):
+        if self.connection:
+            logging.info(f"Estadísticas del almacén de autores: {self.stats()}")
+            self.connection.close()
+            self.connection = None
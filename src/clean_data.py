@@ -1,36 +1,29 @@
-import re
-from html import unescape 
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 from src.models import Author, Quote
+from src.normalizer import normalizer
+from src import metrics
+from src.profiling import profiled
 
 def clean_text(text):
     """
     Limpia el texto eliminando espacios extra, caracteres especiales y decodificando entidades HTML.
     """
-    # Decodificar entidades HTML
-    text = unescape(text)
-    # Eliminar espacios extra
-    text = ' '.join(text.split())
-    # Eliminar caracteres especiales, manteniendo puntuación básica
-    text = re.sub(r'[^\w\s.,!?"-]', '', text)
-    return text.strip()
+    return normalizer.text(text)
 
 def clean_author_name(name):
     """
     Limpia el nombre del autor, asegurándose de que esté en un formato consistente.
+    El resultado se memoriza (ver src/normalizer.py).
     """
-    # Eliminar títulos comunes
-    name = re.sub(r'^(Mr\.|Mrs\.|Ms\.|Dr\.|Prof\.)\s+', '', name)
-    # Asegurarse de que cada palabra comience con mayúscula
-    name = ' '.join(word.capitalize() for word in name.split())
-    return clean_text(name)
+    return normalizer.author_name(name)
 
 def clean_tags(tags):
     """
     Limpia la lista de tags, eliminando duplicados y asegurando un formato consistente.
     """
-    cleaned_tags = [clean_text(tag.lower()) for tag in tags]
-    return list(set(cleaned_tags))  # Eliminar duplicados
+    return normalizer.tags(tags)
 
 def clean_url(url):
     """
@@ -40,28 +33,102 @@ def clean_url(url):
         url = 'http://' + url
     return url.strip()
 
-def clean_data(quotes, authors):
+def clean_quote(quote):
     """
-    Limpia todos los datos antes de la inserción en la base de datos.
+    Devuelve una copia limpia de una Frase.
     """
-    cleaned_quotes = []
-    cleaned_authors = {}
+    return Quote(
+        text=clean_text(quote.text),
+        author=clean_author_name(quote.author),
+        tags=clean_tags(quote.tags),
+        author_about_link=clean_url(quote.author_about_link)
+    )
 
+def clean_author(author):
+    """
+    Devuelve una copia limpia de un autor.
+    """
+    return Author(
+        name=clean_author_name(author.name),
+        about=clean_text(author.about),
+        about_link=clean_url(author.about_link)
+    )
+
+def iter_clean_quotes(quotes):
+    """
+    Limpia las Frases de una en una, sin construir la lista completa.
+    """
     for quote in quotes:
-        cleaned_quote = Quote(
-            text=clean_text(quote.text),
-            author=clean_author_name(quote.author),
-            tags=clean_tags(quote.tags),
-            author_about_link=clean_url(quote.author_about_link)
-        )
-        cleaned_quotes.append(cleaned_quote)
-
-    for author in authors:  # Cambiado de authors.items() a authors
-        cleaned_author = Author(
-            name=clean_author_name(author.name),
-            about=clean_text(author.about),
-            about_link=clean_url(author.about_link)
-        )
+        yield clean_quote(quote)
+
+def iter_clean_pages(pages):
+    """
+    Limpia en streaming las páginas que produce Scraper.iter_pages().
+
+    Yields:
+        tuple: (lista de Frases limpias, diccionario de autores limpios) por página.
+    """
+    for quotes, authors in pages:
+        with metrics.CLEAN_SECONDS.time(mode='stream'):
+            cleaned_authors = {}
+            for author in authors.values():
+                cleaned_author = clean_author(author)
+                cleaned_authors[cleaned_author.name] = cleaned_author
+            cleaned_quotes = list(iter_clean_quotes(quotes))
+        yield cleaned_quotes, cleaned_authors
+
+def _clean_quote_chunk(quotes):
+    """
+    Limpia un bloque de Frases en un proceso del pool.
+    """
+    return [clean_quote(quote) for quote in quotes]
+
+def _clean_author_chunk(authors):
+    """
+    Limpia un bloque de autores en un proceso del pool.
+    """
+    return [clean_author(author) for author in authors]
+
+def _chunks(items, size):
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+@profiled('clean_data')
+def clean_data(quotes, authors, workers=1, threshold=5000):
+    """
+    Limpia todos los datos antes de la inserción en la base de datos.
+
+    Con `workers` > 1 y al menos `threshold` Frases y autores, la limpieza se reparte en
+    bloques entre un pool de procesos. Los bloques se recogen en orden, por lo que el
+    resultado es idéntico al de la limpieza secuencial.
+
+    Args:
+        quotes (iterable): Objetos Quote a limpiar.
+        authors (iterable): Objetos Author a limpiar.
+        workers (int): Número de procesos (1 = limpieza en el propio proceso).
+        threshold (int): Tamaño mínimo de la entrada para usar el pool de procesos.
+
+    Returns:
+        tuple: (lista de Frases limpias, diccionario de autores limpios por nombre).
+    """
+    start = time.perf_counter()
+    quotes = list(quotes)
+    authors = list(authors)  # Cambiado de authors.items() a authors
+    parallel = workers > 1 and len(quotes) + len(authors) >= threshold
+    if parallel:
+        # Unos 4 bloques por proceso para repartir la carga sin multiplicar el coste de serializar
+        size = max(1, -(-(len(quotes) + len(authors)) // (workers * 4)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            quote_chunks = executor.map(_clean_quote_chunk, _chunks(quotes, size))
+            author_chunks = executor.map(_clean_author_chunk, _chunks(authors, size))
+            cleaned_quotes = [quote for chunk in quote_chunks for quote in chunk]
+            cleaned_author_list = [author for chunk in author_chunks for author in chunk]
+    else:
+        cleaned_quotes = list(iter_clean_quotes(quotes))
+        cleaned_author_list = [clean_author(author) for author in authors]
+
+    cleaned_authors = {}
+    for cleaned_author in cleaned_author_list:
         cleaned_authors[cleaned_author.name] = cleaned_author
 
-    return cleaned_quotes, cleaned_authors
\ No newline at end of file
+    metrics.CLEAN_SECONDS.observe(time.perf_counter() - start, mode='parallel' if parallel else 'serial')
+    return cleaned_quotes, cleaned_authors
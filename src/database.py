@@ -1,7 +1,39 @@
 import sqlite3
 import mysql.connector
 from mysql.connector import Error
+import time
 import logging
+from contextlib import contextmanager
+from .db_pool import ConnectionPool
+from collections import Counter
+from .id_cache import IdCache
+from .search import get_search_index
+from .models import content_hash, PageFingerprint
+from . import migrations
+from . import metrics
+from .profiling import profiled
+
+
+class _MeteredCursor:
+    """Envoltorio de un cursor que cuenta las sentencias ejecutadas por tipo (ver src/metrics.py)."""
+    __slots__ = ('_cursor',)
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, *args, **kwargs):
+        metrics.DB_QUERIES.inc(kind=metrics.statement_kind(query))
+        return self._cursor.execute(query, *args, **kwargs)
+
+    def executemany(self, query, *args, **kwargs):
+        metrics.DB_QUERIES.inc(kind=metrics.statement_kind(query))
+        return self._cursor.executemany(query, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
 
 class Database:
     """
@@ -11,36 +43,100 @@ class Database:
         connection (mysql.connector.connection.MySQLConnection or sqlite3.Connection): Conexión a la base de datos.
         cursor (mysql.connector.cursor.MySQLCursor or sqlite3.Cursor): Cursor para ejecutar queries SQL.
         is_mysql (bool): Determina si la base de datos es MySQL o SQLite.
+        placeholder (str): Marcador de parámetros de las consultas ('%s' en MySQL, '?' en SQLite).
+        batch_size (int): Número máximo de filas por sentencia en las inserciones y consultas en bloque.
+        author_ids (IdCache): Caché de IDs de autores por nombre.
+        tag_ids (IdCache): Caché de IDs de etiquetas por nombre.
+        rows_written (int): Filas insertadas o actualizadas por insert_data desde la conexión.
+        pool (ConnectionPool): Pool de conexiones si se indica `pool_size`; en ese modo no hay
+            conexión compartida y `fetch_all`, `fetch_one` y `execute_query` toman prestada
+            una conexión y un cursor propios en cada llamada (uso concurrente desde varios hilos).
     """
+    batch_size = 500
 
-    def __init__(self, **kwargs):
+    def __init__(self, pool_size=None, pool_timeout=None, **kwargs):
         self.config = kwargs
         self.connection = None
         self.cursor = None
         self.is_mysql = 'host' in kwargs  # Determina si es MySQL o SQLite
-        self.connect() 
+        self.placeholder = '%s' if self.is_mysql else '?'
+        self.author_ids = IdCache('authors')
+        self.tag_ids = IdCache('tags')
+        self._search_index = None
+        self.rows_written = 0
+        self.pool = None
+        if pool_size:
+            self.pool = ConnectionPool(self._open_connection, pool_size, pool_timeout,
+                                       validate=self._is_connected)
+            logging.info(f"Pool de {pool_size} conexiones a la base de datos {'MySQL' if self.is_mysql else 'SQLite'}")
+        else:
+            self.connect()
+
+    def _open_connection(self):
+        """Abre una conexión nueva a la base de datos MySQL o SQLite."""
+        if self.is_mysql:
+            return mysql.connector.connect(**self.config)
+        # En modo pool la conexión puede usarse desde distintos hilos (nunca a la vez)
+        return sqlite3.connect(self.config['database'], check_same_thread=self.pool is None)
+
+    def _is_connected(self, connection):
+        return connection.is_connected() if self.is_mysql else True
 
     def connect(self):
         """Establece la conexión a la base de datos MySQL o SQLite."""
         try:
+            self.connection = self._open_connection()
             if self.is_mysql:
-                self.connection = mysql.connector.connect(**self.config)
                 if self.connection.is_connected():
-                    self.cursor = self.connection.cursor()
+                    self.cursor = _MeteredCursor(self.connection.cursor())
                     logging.info("Conectado a la base de datos MySQL")
                 else:
                     logging.error("No se pudo establecer la conexión a MySQL")
             else:
-                self.connection = sqlite3.connect(self.config['database'])
-                self.cursor = self.connection.cursor()
+                self.cursor = _MeteredCursor(self.connection.cursor())
                 logging.info("Conectado a la base de datos SQLite")
         except Error as e:
             logging.error(f"Error al conectarse a la base de datos: {e}")
             raise
+
+    @contextmanager
+    def checkout(self, commit=False):
+        """
+        Contexto que proporciona el cursor de una operación: uno propio sobre una conexión
+        prestada por el pool o, sin pool, el cursor compartido.
+
+        Args:
+            commit (bool): Confirma la transacción al salir sin errores.
+        """
+        if self.pool is None:
+            yield self.cursor
+            if commit:
+                self.commit()
+            return
+        with self.pool.connection() as connection:
+            # Cursor con buffer en MySQL para poder cerrarlo aunque queden filas sin leer
+            cursor = _MeteredCursor(connection.cursor(buffered=True) if self.is_mysql else connection.cursor())
+            try:
+                yield cursor
+                if commit:
+                    connection.commit()
+                    metrics.DB_COMMITS.inc()
+            finally:
+                cursor.close()
+
+    def commit(self):
+        """Confirma la transacción de la conexión compartida."""
+        self.connection.commit()
+        metrics.DB_COMMITS.inc()
+
+    def pool_stats(self):
+        """Devuelve las métricas del pool de conexiones (None si no se usa pool)."""
+        return self.pool.stats() if self.pool else None
         
     def create_tables(self):
         """
-        Crea las tablas necesarias en la base de datos si no existen.
+        Crea las tablas necesarias en la base de datos si no existen y aplica
+        las migraciones de esquema pendientes (ver src/migrations.py).
 
         Raises:
             Exception: Si ocurre un error al crear las tablas.
@@ -52,7 +148,9 @@ class Database:
             else:
                 self._create_sqlite_tables()
                 logging.info("Tablas SQLite creadas con éxito")
-            self.connection.commit()
+            migrations.migrate(self)
+            self.commit()
+            self._search_index = None  # El esquema puede haber cambiado el índice disponible
         except Error as e:
             logging.error(f"Error creando tablas: {str(e)}")
             raise
@@ -73,6 +171,8 @@ class Database:
                         id INT AUTO_INCREMENT PRIMARY KEY,
                         text VARCHAR(1000),
                         author_id INT,
+                        content_hash CHAR(64) NOT NULL,
+                        UNIQUE KEY uq_quotes_hash_author (content_hash, author_id),
                         FOREIGN KEY (author_id) REFERENCES authors(id)
                     )
                 """)
@@ -86,11 +186,12 @@ class Database:
                     CREATE TABLE IF NOT EXISTS quote_tags (
                         quote_id INT,
                         tag_id INT,
+                        PRIMARY KEY (quote_id, tag_id),
                         FOREIGN KEY (quote_id) REFERENCES quotes(id),
                         FOREIGN KEY (tag_id) REFERENCES tags(id)
                     )
                 """)
-            self.connection.commit()
+            self.commit()
         except Error as e:
             logging.error(f"Error creando tablas MySQL: {str(e)}")
             raise
@@ -111,6 +212,7 @@ class Database:
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         text TEXT,
                         author_id INTEGER,
+                        content_hash TEXT NOT NULL,
                         FOREIGN KEY (author_id) REFERENCES authors(id)
                     )
                 """)
@@ -124,145 +226,421 @@ class Database:
                     CREATE TABLE IF NOT EXISTS quote_tags (
                         quote_id INTEGER,
                         tag_id INTEGER,
+                        PRIMARY KEY (quote_id, tag_id),
                         FOREIGN KEY (quote_id) REFERENCES quotes(id),
                         FOREIGN KEY (tag_id) REFERENCES tags(id)
                     )
                 """)
-            self.connection.commit()
+            self.commit()
         except Error as e:
             logging.error(f"Error creando tablas SQLite: {str(e)}")
             raise
         
+    @profiled('insert_data')
     def insert_data(self, quotes, authors):
         """
         Inserta los datos extraídos en la base de datos.
 
+        Los autores, Frases, etiquetas y relaciones se escriben con `executemany` en
+        lotes de `batch_size` filas y los IDs se resuelven con consultas `IN (...)`,
+        todo dentro de una única transacción, junto con los contadores de `author_stats`
+        y `tag_stats` y el índice de búsqueda.
+
         Args:
             quotes (list): Lista de objetos Quote a insertar.
             authors (dict): Diccionario de objetos Author a insertar.
 
+        Returns:
+            dict: Número de filas afectadas por tabla.
+
         Raises:
             Exception: Si ocurre un error al insertar los datos.
         """
+        start = time.perf_counter()
         try:
-            for author_name, author in authors.items():
-                self._insert_author(author)
+            counts = {'authors': 0, 'quotes': 0, 'tags': 0, 'quote_tags': 0}
+            counts['authors'] = self._bulk_insert_authors(authors.values())
+            author_ids = self._resolve_ids(
+                self.author_ids, {quote.author for quote in quotes} | {author.name for author in authors.values()}
+            )
 
-            for quote in quotes:
-                self._insert_quote(quote)
+            new_quotes = self._bulk_insert_quotes(quotes, author_ids)
+            counts['quotes'] = len(new_quotes)
 
-            self.connection.commit()
-            logging.info("Datos insertados con éxito")
-        except Error as e:
+            tag_names = {tag for _, quote in new_quotes for tag in quote.tags}
+            counts['tags'] = self._bulk_insert_tags(tag_names)
+            tag_ids = self._resolve_ids(self.tag_ids, tag_names)
+
+            links = {(quote_id, tag_ids[tag]) for quote_id, quote in new_quotes for tag in quote.tags if tag in tag_ids}
+            counts['quote_tags'] = self.executemany(
+                f"{self._insert_ignore} INTO quote_tags (quote_id, tag_id) VALUES ({self.placeholder}, {self.placeholder})",
+                sorted(links)
+            )
+
+            author_counts = Counter({author_ids[author.name]: 0 for author in authors.values() if author.name in author_ids})
+            author_counts.update(author_ids[quote.author] for _, quote in new_quotes)
+            self._update_stats(author_counts, Counter(tag_id for _, tag_id in links))
+            self.search_index.index_quotes([(quote_id, quote.text) for quote_id, quote in new_quotes])
+            self.search_index.index_authors([
+                (author_ids[author.name], author.name, author.about)
+                for author in authors.values() if author.name in author_ids
+            ])
+
+            self.commit()
+            self.rows_written += sum(counts.values())
+            metrics.DB_INSERT_SECONDS.observe(time.perf_counter() - start)
+            for table, count in counts.items():
+                metrics.DB_ROWS.inc(count, table=table)
+            logging.info(f"Datos insertados con éxito: {counts}")
+            return counts
+        except (Error, sqlite3.Error) as e:
             logging.error(f"Error al insertar datos: {str(e)}")
-            self.connection.rollback()
-            
-    def _insert_author(self, author):
-        """Inserta un autor en la base de datos si no existe."""    
-        try:
+            self.rollback()
+
+    def _update_stats(self, author_counts, tag_counts):
+        """
+        Suma las Frases nuevas por autor y las relaciones nuevas por etiqueta a los contadores.
+        Los autores sin Frases nuevas se registran con 0 para que aparezcan en las estadísticas.
+        """
+        for table, key, column, counts in (
+            ('author_stats', 'author_id', 'quote_count', author_counts),
+            ('tag_stats', 'tag_id', 'usage_count', tag_counts),
+        ):
             if self.is_mysql:
-                query = """
-                    INSERT INTO authors (name, about, about_link) 
-                    VALUES (%s, %s, %s) 
-                    ON DUPLICATE KEY UPDATE 
-                    about = VALUES(about), about_link = VALUES(about_link)
+                query = f"""
+                    INSERT INTO {table} ({key}, {column}) VALUES (%s, %s)
+                    ON DUPLICATE KEY UPDATE {column} = {column} + VALUES({column})
                 """
             else:
-                query = """
-                    INSERT OR REPLACE INTO authors (name, about, about_link)
-                    VALUES (?, ?, ?)
+                query = f"""
+                    INSERT INTO {table} ({key}, {column}) VALUES (?, ?)
+                    ON CONFLICT({key}) DO UPDATE SET {column} = {column} + excluded.{column}
                 """
-            self.cursor.execute(query, (author.name, author.about, author.about_link))
-        except Error as e:
-            logging.error(f"Error al insertar autor {author.name}: {str(e)}")
-            raise  
-        
-    def _insert_quote(self, quote):
-        """Inserta una Frase en la base de datos si no existe."""
-        try:
-            author_id = self.get_author_id(quote.author)
-            if author_id:
-                if self.is_mysql:
-                    query = """
-                        INSERT INTO quotes (text, author_id)
-                        SELECT %s, %s
-                        WHERE NOT EXISTS (
-                            SELECT 1 FROM quotes
-                            WHERE text = %s AND author_id = %s
-                        )
-                    """
-                    self.cursor.execute(query, (quote.text, author_id, quote.text, author_id))
-                else:
-                    query = """
-                        INSERT OR IGNORE INTO quotes (text, author_id)
-                        VALUES (?, ?)
-                    """
-                    self.cursor.execute(query, (quote.text, author_id))
-                quote_id = self.cursor.lastrowid
-                if quote_id:
-                    logging.info(f"Frase insertada: {quote.text[:30]}...")
-                    for tag in quote.tags:
-                        tag_id = self._insert_tag(tag)
-                        self._insert_quote_tag(quote_id, tag_id)
-            else:
-                logging.warning(f"No se encontró el autor {quote.author} para la Frase.")
-        except Error as e:
-            logging.error(f"Error al insertar Frase: {str(e)}")
-            raise
-        
-    def _insert_tag(self, tag):
-        """Inserta una etiqueta en la base de datos si no existe."""
-        try:
-            if self.is_mysql:
-                query = "INSERT IGNORE INTO tags (name) VALUES (%s)"
-            else:
-                query = "INSERT OR IGNORE INTO tags (name) VALUES (?)"
-            self.cursor.execute(query, (tag,))
-            self.connection.commit()
-            return self.get_tag_id(tag)
-        except Error as e:
-            logging.error(f"Error al insertar tag {tag}: {str(e)}")
-            raise
-        
-    def _insert_quote_tag(self, quote_id, tag_id):
-        """Inserta la relación entre una Frase y una etiqueta en la base de datos."""
+            self.executemany(query, sorted(counts.items()))
+
+    def _rebuild_stats(self):
+        """Recalcula desde cero los contadores de `author_stats` y `tag_stats` (sin confirmar)."""
+        self.cursor.execute("DELETE FROM author_stats")
+        self.cursor.execute("""
+            INSERT INTO author_stats (author_id, quote_count)
+            SELECT authors.id, COUNT(quotes.id) FROM authors
+            LEFT JOIN quotes ON quotes.author_id = authors.id
+            GROUP BY authors.id
+        """)
+        self.cursor.execute("DELETE FROM tag_stats")
+        self.cursor.execute("""
+            INSERT INTO tag_stats (tag_id, usage_count)
+            SELECT tags.id, COUNT(quote_tags.quote_id) FROM tags
+            LEFT JOIN quote_tags ON quote_tags.tag_id = tags.id
+            GROUP BY tags.id
+        """)
+
+    def rebuild_stats(self):
+        """
+        Repara los contadores de `author_stats` y `tag_stats` recalculándolos desde las
+        tablas de datos, en una única transacción.
+
+        Returns:
+            dict: Número de filas de cada tabla de contadores.
+        """
         try:
-            if self.is_mysql:
-                query = "INSERT IGNORE INTO quote_tags (quote_id, tag_id) VALUES (%s, %s)"
-            else:
-                query = "INSERT OR IGNORE INTO quote_tags (quote_id, tag_id) VALUES (?, ?)"
-            self.cursor.execute(query, (quote_id, tag_id))
-            self.connection.commit()
-        except Error as e:
-            logging.error(f"Error al insertar quote_tag: {str(e)}")
+            self._rebuild_stats()
+            self.commit()
+        except (Error, sqlite3.Error) as e:
+            logging.error(f"Error reconstruyendo las estadísticas: {e}")
+            self.rollback()
             raise
+        counts = {
+            'author_stats': self.fetch_one("SELECT COUNT(*) FROM author_stats")[0],
+            'tag_stats': self.fetch_one("SELECT COUNT(*) FROM tag_stats")[0],
+        }
+        logging.info(f"Estadísticas reconstruidas: {counts}")
+        return counts
+
+    def insert_stream(self, pages, batch_size=100):
+        """
+        Inserta en lotes acotados los datos que llegan en streaming.
+
+        Args:
+            pages (iterable): Pares (lista de Quote, diccionario de Author) por página,
+                como los que produce clean_data.iter_clean_pages().
+            batch_size (int): Número de Frases a partir del cual se inserta y confirma un lote.
+
+        Returns:
+            int: Número de Frases procesadas.
+        """
+        processed = 0
+        batch_quotes = []
+        batch_authors = {}
+        for quotes, authors in pages:
+            batch_quotes.extend(quotes)
+            batch_authors.update(authors)
+            if len(batch_quotes) >= batch_size:
+                self.insert_data(batch_quotes, batch_authors)
+                processed += len(batch_quotes)
+                logging.info(f"Lote insertado en streaming ({processed} Frases procesadas)")
+                batch_quotes = []
+                batch_authors = {}
+        if batch_quotes or batch_authors:
+            self.insert_data(batch_quotes, batch_authors)
+            processed += len(batch_quotes)
+        return processed
+
+    @property
+    def search_index(self):
+        """Índice de búsqueda de texto completo (ver src/search.py), elegido en el primer uso."""
+        if self._search_index is None:
+            self._search_index = get_search_index(self)
+        return self._search_index
+
+    @property
+    def _insert_ignore(self):
+        return "INSERT IGNORE" if self.is_mysql else "INSERT OR IGNORE"
+
+    def executemany(self, query, rows):
+        """Ejecuta `query` para todas las filas en lotes de `batch_size` y devuelve las filas afectadas."""
+        affected = 0
+        for start in range(0, len(rows), self.batch_size):
+            self.cursor.executemany(query, rows[start:start + self.batch_size])
+            affected += max(self.cursor.rowcount, 0)
+        return affected
+
+    def _select_ids(self, table, column, values):
+        """
+        Obtiene en bloque los IDs de las filas de `table` cuyo `column` está en `values`.
+
+        Returns:
+            dict: {valor: id}
+        """
+        values = list(values)
+        ids = {}
+        for start in range(0, len(values), self.batch_size):
+            chunk = values[start:start + self.batch_size]
+            placeholders = ', '.join([self.placeholder] * len(chunk))
+            self.cursor.execute(f"SELECT {column}, id FROM {table} WHERE {column} IN ({placeholders})", chunk)
+            ids.update(self.cursor.fetchall())
+        return ids
+
+    def _resolve_ids(self, cache, names):
+        """
+        Resuelve los IDs de `names` usando la caché y consulta en bloque solo los que faltan.
+
+        La primera vez precarga la tabla completa con una sola consulta.
+
+        Returns:
+            dict: {nombre: id} de los nombres que existen en la tabla.
+        """
+        if not cache.loaded:
+            self.cursor.execute(f"SELECT name, id FROM {cache.table}")
+            cache.load(self.cursor.fetchall())
+        found, missing = cache.lookup(names)
+        if missing:
+            fetched = self._select_ids(cache.table, 'name', missing)
+            cache.update(fetched)
+            found.update(fetched)
+        return found
+
+    def id_cache_stats(self):
+        """Devuelve las estadísticas de las cachés de IDs."""
+        return {'authors': self.author_ids.stats(), 'tags': self.tag_ids.stats()}
+
+    def rollback(self):
+        """Deshace la transacción en curso e invalida las cachés de IDs, que pueden contener filas deshechas."""
+        self.connection.rollback()
+        self.author_ids.clear()
+        self.tag_ids.clear()
+        if self._search_index is not None:
+            self._search_index.reset()
+
+    def _bulk_insert_authors(self, authors):
+        """
+        Inserta o actualiza los autores en bloque, conservando sus IDs.
+
+        Solo se escriben los autores nuevos o con datos distintos, para que repetir la
+        carga no cuente filas escritas ni cambie `data_version`.
+
+        Returns:
+            int: Número de autores insertados o actualizados.
+        """
+        rows = [(a.name, a.about, a.about_link) for a in authors]
+        if self.is_mysql:
+            # MySQL cuenta como afectadas las filas duplicadas sin cambios: se descartan antes
+            rows = self._changed_authors(rows)
+            self.executemany("""
+                INSERT INTO authors (name, about, about_link)
+                VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                about = VALUES(about), about_link = VALUES(about_link)
+            """, rows)
+            return len(rows)
+        return self.executemany("""
+            INSERT INTO authors (name, about, about_link)
+            VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+            about = excluded.about, about_link = excluded.about_link
+            WHERE authors.about IS NOT excluded.about OR authors.about_link IS NOT excluded.about_link
+        """, rows)
+
+    def _changed_authors(self, rows):
+        """Filtra las filas (name, about, about_link) que ya existen con los mismos datos."""
+        stored = set()
+        names = [row[0] for row in rows]
+        for start in range(0, len(names), self.batch_size):
+            chunk = names[start:start + self.batch_size]
+            placeholders = ', '.join([self.placeholder] * len(chunk))
+            self.cursor.execute(
+                f"SELECT name, about, about_link FROM authors WHERE name IN ({placeholders})", chunk
+            )
+            stored.update(tuple(row) for row in self.cursor.fetchall())
+        return [row for row in rows if row not in stored]
+
+    def _bulk_insert_quotes(self, quotes, author_ids):
+        """
+        Inserta en bloque las Frases que aún no existen para su autor.
+
+        Las Frases se identifican por su clave natural (content_hash, author_id): las
+        existentes se descartan con una consulta indexada y el resto se inserta con
+        un upsert, por lo que repetir la carga no duplica filas.
+
+        Returns:
+            list: Pares (id, Quote) de las Frases insertadas.
+        """
+        pending = {}
+        for quote in quotes:
+            author_id = author_ids.get(quote.author)
+            if author_id is None:
+                logging.warning(f"No se encontró el autor {quote.author} para la Frase.")
+                continue
+            pending.setdefault((content_hash(quote.text), author_id), quote)
+
+        existing = self._select_quote_ids(pending)
+        new_keys = [key for key in pending if key not in existing]
+        if self.is_mysql:
+            query = """
+                INSERT INTO quotes (text, author_id, content_hash) VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE id = id
+            """
+        else:
+            query = """
+                INSERT INTO quotes (text, author_id, content_hash) VALUES (?, ?, ?)
+                ON CONFLICT(content_hash, author_id) DO NOTHING
+            """
+        self.executemany(query, [(pending[key].text, key[1], key[0]) for key in new_keys])
+        inserted = self._select_quote_ids(new_keys)
+        return [(inserted[key], pending[key]) for key in new_keys if key in inserted]
+
+    def _select_quote_ids(self, keys):
+        """Obtiene en bloque los IDs de las Frases identificadas por (content_hash, author_id)."""
+        keys = set(keys)
+        hashes = list({digest for digest, _ in keys})
+        ids = {}
+        for start in range(0, len(hashes), self.batch_size):
+            chunk = hashes[start:start + self.batch_size]
+            placeholders = ', '.join([self.placeholder] * len(chunk))
+            self.cursor.execute(
+                f"SELECT content_hash, author_id, id FROM quotes WHERE content_hash IN ({placeholders})", chunk
+            )
+            for digest, author_id, quote_id in self.cursor.fetchall():
+                if (digest, author_id) in keys:
+                    ids[(digest, author_id)] = quote_id
+        return ids
+
+    def _bulk_insert_tags(self, tag_names):
+        """Inserta en bloque las etiquetas que no existen."""
+        return self.executemany(
+            f"{self._insert_ignore} INTO tags (name) VALUES ({self.placeholder})",
+            [(tag,) for tag in sorted(tag_names)]
+        )
 
     def get_author_id(self, author_name):
-        """Obtiene el ID de un autor por su nombre."""
+        """Obtiene el ID de un autor por su nombre, consultando primero la caché."""
+        cached = self.author_ids.get(author_name)
+        if cached is not None:
+            return cached
         try:
             query = "SELECT id FROM authors WHERE name = ?" if not self.is_mysql else "SELECT id FROM authors WHERE name = %s"
             self.cursor.execute(query, (author_name,))
             result = self.cursor.fetchone()
+            if result:
+                self.author_ids.put(author_name, result[0])
             return result[0] if result else None
         except Error as e:
             logging.error(f"Error obteniendo el ID del autor: {e}")
             return None
 
     def get_tag_id(self, tag_name):
-        """Obtiene el ID de una etiqueta por su nombre."""
+        """Obtiene el ID de una etiqueta por su nombre, consultando primero la caché."""
+        cached = self.tag_ids.get(tag_name)
+        if cached is not None:
+            return cached
         try:
             query = "SELECT id FROM tags WHERE name = ?" if not self.is_mysql else "SELECT id FROM tags WHERE name = %s"
             self.cursor.execute(query, (tag_name,))
             result = self.cursor.fetchone()
+            if result:
+                self.tag_ids.put(tag_name, result[0])
             return result[0] if result else None
         except Error as e:
             logging.error(f"Error obteniendo el ID del tag: {e}")
             return None    
 
+    def get_page_fingerprints(self):
+        """Devuelve las huellas guardadas de las páginas del listado: {url: PageFingerprint}."""
+        rows = self.fetch_all("SELECT url, body_hash, quotes_hash, quote_count FROM page_fingerprints")
+        return {row[0]: PageFingerprint(*row) for row in rows}
+
+    def save_page_fingerprint(self, fingerprint, commit=True):
+        """
+        Guarda la huella de una página del listado.
+
+        Con `commit=False` queda en la transacción en curso, de modo que la confirma (o la
+        deshace) la siguiente llamada a insert_data junto con las Frases de la página.
+        """
+        if self.is_mysql:
+            query = """
+                INSERT INTO page_fingerprints (url, body_hash, quotes_hash, quote_count, changed_at)
+                VALUES (%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE body_hash = VALUES(body_hash), quotes_hash = VALUES(quotes_hash),
+                quote_count = VALUES(quote_count), changed_at = VALUES(changed_at)
+            """
+        else:
+            query = """
+                INSERT INTO page_fingerprints (url, body_hash, quotes_hash, quote_count, changed_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET body_hash = excluded.body_hash, quotes_hash = excluded.quotes_hash,
+                quote_count = excluded.quote_count, changed_at = excluded.changed_at
+            """
+        self.cursor.execute(query, tuple(fingerprint) + (time.time(),))
+        if commit:
+            self.commit()
+
+    def record_run(self, run):
+        """Guarda en la tabla `runs` el resultado de una ejecución de la actualización (RunRecord)."""
+        p = self.placeholder
+        self.execute_query(
+            f"INSERT INTO runs (started_at, duration, status, rows_changed, pages_fetched, overrun_intervals, error) "
+            f"VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p})",
+            tuple(run)
+        )
+
+    def get_data_version(self):
+        """Devuelve la versión de datos actual."""
+        row = self.fetch_one("SELECT version FROM data_version WHERE id = 1")
+        return row[0] if row else 0
+
+    def bump_data_version(self):
+        """
+        Incrementa la versión de datos tras una inserción correcta, para que las
+        cachés de lectura de la aplicación descarten sus resultados.
+        """
+        self.execute_query("UPDATE data_version SET version = version + 1 WHERE id = 1")
+        return self.get_data_version()
+
     def fetch_all(self, query, params=None):
         try:
-            self.cursor.execute(query, params)
-            return self.cursor.fetchall()
+            with self.checkout() as cursor:
+                cursor.execute(query, params or ())
+                return cursor.fetchall()
         except Error as e:
             logging.error(f"Error ejecutando la consulta: {e}")
             return []
@@ -270,8 +648,9 @@ class Database:
     def fetch_one(self, query, params=None):
         """Ejecuta una consulta y retorna el primer resultado."""
         try:
-            self.cursor.execute(query, params)
-            return self.cursor.fetchone()
+            with self.checkout() as cursor:
+                cursor.execute(query, params or ())
+                return cursor.fetchone()
         except Error as e:
             logging.error(f"Error ejecutando la consulta: {e}")
             return None
@@ -279,11 +658,11 @@ class Database:
     def execute_query(self, query, params=None):
         """Ejecuta una consulta SQL."""
         try:
-            if params:
-                self.cursor.execute(query, params)
-            else:
-                self.cursor.execute(query)
-            self.connection.commit()
+            with self.checkout(commit=True) as cursor:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
             logging.info(f"Consulta ejecutada: {query} con parámetros: {params}")
         except Error as e:
             logging.error(f"Error ejecutando la consulta: {e}")
@@ -292,7 +671,11 @@ class Database:
             raise
         
     def close(self):
+        if self.pool:
+            logging.info(f"Estadísticas del pool de conexiones: {self.pool_stats()}")
+            self.pool.close()
         if self.connection:
+            logging.info(f"Estadísticas de las cachés de IDs: {self.id_cache_stats()}")
             self.cursor.close()
             self.connection.close()
             logging.info("Conexión a la base de datos cerrada")
\ No newline at end of file
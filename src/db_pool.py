@@ -0,0 +1,197 @@
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from mysql.connector import errors as mysql_errors
+
+'''
+En este archivo se define el pool de conexiones de la aplicación Streamlit:
+- Mantiene como máximo `size` conexiones abiertas, que se crean bajo demanda y se reutilizan.
+- Cada consulta toma prestada una conexión en exclusiva y la devuelve al terminar, de modo que
+las sesiones concurrentes no comparten cursor.
+- Si todas las conexiones están ocupadas, la petición espera (hasta `timeout` segundos) y el
+tiempo de espera queda registrado en las métricas del pool.
+'''
+
+
+# Errores que indican que la propia conexión ha dejado de ser utilizable (caída, cerrada...);
+# el resto de errores (SQL, de la aplicación) dejan la conexión sana y se devuelve al pool
+CONNECTION_ERRORS = (mysql_errors.OperationalError, mysql_errors.InterfaceError, sqlite3.OperationalError)
+
+
+class PoolTimeoutError(Exception):
+    """No se ha podido obtener una conexión del pool dentro del tiempo de espera."""
+
+
+class ConnectionPool:
+    """
+    Pool acotado de conexiones a la base de datos, válido para MySQL y SQLite.
+
+    Attributes:
+        factory (callable): Función que abre una conexión nueva.
+        size (int): Número máximo de conexiones abiertas.
+        timeout (float): Segundos máximos de espera por una conexión libre (None = sin límite).
+        validate (callable): Comprueba si una conexión libre sigue siendo válida antes de prestarla.
+    """
+    def __init__(self, factory, size, timeout=None, validate=None):
+        if size < 1:
+            raise ValueError("El tamaño del pool debe ser al menos 1")
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self.validate = validate
+        self._idle = deque()
+        self._created = 0
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        # Métricas
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.peak_in_use = 0
+        self._busy_time = 0.0
+        self._busy_since = time.monotonic()
+        self._started = self._busy_since
+
+    def _account_busy(self, now):
+        """Acumula el tiempo de conexión ocupada (conexiones en uso x segundos) desde la última medida."""
+        self._busy_time += self._in_use * (now - self._busy_since)
+        self._busy_since = now
+
+    def acquire(self):
+        """
+        Toma prestada una conexión, esperando si todas están ocupadas.
+
+        Raises:
+            PoolTimeoutError: Si no queda ninguna conexión libre dentro de `timeout`.
+        """
+        start = time.monotonic()
+        with self._cond:
+            waited = False
+            while not self._idle and self._created >= self.size:
+                if self._closed:
+                    raise RuntimeError("El pool de conexiones está cerrado")
+                waited = True
+                remaining = None if self.timeout is None else self.timeout - (time.monotonic() - start)
+                if remaining is not None and remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeoutError(f"Ninguna conexión libre tras {self.timeout} s")
+                self._cond.wait(remaining)
+            if self._closed:
+                raise RuntimeError("El pool de conexiones está cerrado")
+            now = time.monotonic()
+            elapsed = now - start
+            self.checkouts += 1
+            if waited:
+                self.waits += 1
+                self.wait_time += elapsed
+                self.max_wait = max(self.max_wait, elapsed)
+            self._account_busy(now)
+            self._in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self._in_use)
+            connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                self._created += 1
+
+        if connection is not None and self.validate is not None and not self.validate(connection):
+            self._close_quietly(connection)
+            connection = None
+        if connection is None:
+            try:
+                connection = self.factory()
+            except Exception:
+                self._discard()
+                raise
+        return connection
+
+    def release(self, connection, discard=False):
+        """
+        Devuelve una conexión al pool, descartando la transacción en curso para que la siguiente
+        consulta vea los datos actuales. Con `discard=True` (o si falla el rollback) se cierra.
+        """
+        if not discard:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+        if discard or self._closed:
+            self._close_quietly(connection)
+            self._discard()
+            return
+        with self._cond:
+            self._account_busy(time.monotonic())
+            self._in_use -= 1
+            self._idle.append(connection)
+            self._cond.notify()
+
+    def _discard(self):
+        """Libera el hueco de una conexión que se ha cerrado o no se ha podido abrir."""
+        with self._cond:
+            self._account_busy(time.monotonic())
+            self._in_use -= 1
+            self._created -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self):
+        """
+        Contexto que presta una conexión y la devuelve al salir. Si el bloque falla con un error
+        de conexión (CONNECTION_ERRORS) la descarta; con cualquier otro error la devuelve tras
+        deshacer la transacción (y la descarta si el rollback también falla).
+        """
+        connection = self.acquire()
+        try:
+            yield connection
+        except BaseException as e:
+            self.release(connection, discard=isinstance(e, CONNECTION_ERRORS))
+            raise
+        else:
+            self.release(connection)
+
+    def close(self):
+        """Cierra las conexiones libres; las prestadas se cierran al devolverse."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for connection in idle:
+            self._close_quietly(connection)
+
+    def stats(self):
+        """
+        Devuelve las métricas del pool.
+
+        Returns:
+            dict: Tamaño, conexiones abiertas / en uso, préstamos, esperas, tiempo de espera
+            (total, medio y máximo, en segundos) y utilización media (fracción de la capacidad
+            ocupada desde la creación del pool).
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._account_busy(now)
+            elapsed = now - self._started
+            return {
+                'size': self.size,
+                'open': self._created,
+                'in_use': self._in_use,
+                'peak_in_use': self.peak_in_use,
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'wait_time': round(self.wait_time, 6),
+                'avg_wait': round(self.wait_time / self.checkouts, 6) if self.checkouts else 0.0,
+                'max_wait': round(self.max_wait, 6),
+                'utilisation': round(self._busy_time / (elapsed * self.size), 3) if elapsed > 0 else 0.0,
+            }
@@ -0,0 +1,204 @@
+import os
+import json
+import sqlite3
+import threading
+import time
+import logging
+
+'''
+En este archivo se define la frontera persistente del recorrido del scraper (modo por lotes):
+- Guarda en un fichero SQLite local cada página del listado y de autor ya procesada junto con
+su resultado parseado, y las páginas de autor pendientes o fallidas.
+- Si una ejecución se interrumpe o fallan algunos autores, la siguiente reanuda el recorrido:
+las páginas hechas se sirven desde la frontera sin descargarlas y los autores fallidos se
+reintentan según la política de reintentos (número de intentos y espera exponencial).
+- Cuando los datos se han insertado y no quedan autores por reintentar, la frontera se vacía
+y la siguiente ejecución empieza un recorrido nuevo.
+'''
+
+
+class RetryPolicy:
+    """
+    Política de reintentos de una URL fallida.
+
+    Attributes:
+        max_attempts (int): Intentos como máximo antes de darla por perdida en este recorrido.
+        backoff (float): Espera en segundos tras el primer fallo; se duplica en cada intento.
+        max_backoff (float): Espera máxima en segundos.
+    """
+    def __init__(self, max_attempts=3, backoff=60.0, max_backoff=3600.0):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def delay(self, attempts):
+        """Segundos de espera antes del intento siguiente a `attempts` fallos."""
+        return min(self.max_backoff, self.backoff * 2 ** max(0, attempts - 1))
+
+
+class CrawlFrontier:
+    """
+    Estado persistente de un recorrido del sitio.
+
+    Attributes:
+        path (str): Ruta del fichero SQLite (':memory:' para una frontera temporal).
+        retry_policy (RetryPolicy): Política de reintentos de las URLs fallidas.
+        max_age (float): Segundos tras los que un recorrido sin terminar se descarta y empieza de nuevo.
+        resumed (int): Páginas servidas desde la frontera sin descargarlas.
+    """
+    def __init__(self, path, retry_policy=None, max_age=24 * 3600):
+        self.path = path
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.max_age = max_age
+        self.resumed = 0
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                url TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                last_error TEXT,
+                payload TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self.connection.commit()
+        self._expire()
+        counts = self.counts()
+        if any(counts.values()):
+            logging.info(f"Reanudando el recorrido guardado en {path}: {counts}")
+        else:
+            logging.info(f"Frontera del recorrido abierta en {path}")
+
+    def _expire(self, now=None):
+        """Descarta el recorrido guardado si empezó hace más de `max_age` segundos."""
+        now = time.time() if now is None else now
+        started = self.connection.execute("SELECT MIN(created_at) FROM frontier").fetchone()[0]
+        if started is not None and now - started >= self.max_age:
+            logging.info("El recorrido guardado ha caducado; se empieza uno nuevo")
+            self.clear()
+
+    def get_done(self, url):
+        """Devuelve el resultado guardado de una página ya procesada, o None."""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT payload FROM frontier WHERE url = ? AND status = 'done'", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        self.resumed += 1
+        return json.loads(row[0])
+
+    def enqueue(self, urls, kind, now=None):
+        """Registra como pendientes las URLs que aún no están en la frontera."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO frontier (url, kind, status, created_at, updated_at) VALUES (?, ?, 'pending', ?, ?)",
+                [(url, kind, now, now) for url in urls]
+            )
+            self.connection.commit()
+
+    def mark_done(self, url, kind, payload, now=None):
+        """Marca una página como procesada y guarda su resultado (serializable en JSON)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self.connection.execute("""
+                INSERT INTO frontier (url, kind, status, payload, created_at, updated_at)
+                VALUES (?, ?, 'done', ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET status = 'done', payload = excluded.payload,
+                last_error = NULL, updated_at = excluded.updated_at
+            """, (url, kind, json.dumps(payload, ensure_ascii=False), now, now))
+            self.connection.commit()
+
+    def mark_failed(self, url, kind, error, now=None):
+        """
+        Registra un intento fallido y programa el siguiente según la política de reintentos.
+
+        Returns:
+            int: Número de intentos fallidos de la URL.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self.connection.execute("SELECT attempts FROM frontier WHERE url = ?", (url,)).fetchone()
+            attempts = (row[0] if row else 0) + 1
+            self.connection.execute("""
+                INSERT INTO frontier (url, kind, status, attempts, next_attempt_at, last_error, created_at, updated_at)
+                VALUES (?, ?, 'failed', ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET status = 'failed', attempts = excluded.attempts,
+                next_attempt_at = excluded.next_attempt_at, last_error = excluded.last_error,
+                updated_at = excluded.updated_at
+            """, (url, kind, attempts, now + self.retry_policy.delay(attempts), error, now, now))
+            self.connection.commit()
+        return attempts
+
+    def should_fetch(self, url, now=None):
+        """Indica si hay que pedir la URL: no ha fallado, o le toca reintento y le quedan intentos."""
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT status, attempts, next_attempt_at FROM frontier WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None or row[0] != 'failed':
+            return True
+        return row[1] < self.retry_policy.max_attempts and row[2] <= now
+
+    def retryable(self):
+        """Número de URLs fallidas a las que aún les quedan intentos."""
+        with self._lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM frontier WHERE status = 'failed' AND attempts < ?",
+                (self.retry_policy.max_attempts,)
+            ).fetchone()[0]
+
+    def counts(self):
+        """Devuelve el número de URLs por estado: {'done': ..., 'pending': ..., 'failed': ...}."""
+        with self._lock:
+            rows = self.connection.execute("SELECT status, COUNT(*) FROM frontier GROUP BY status").fetchall()
+        counts = {'done': 0, 'pending': 0, 'failed': 0}
+        counts.update(rows)
+        return counts
+
+    def finish(self):
+        """
+        Cierra el recorrido una vez insertados sus datos: vacía la frontera si no quedan
+        URLs por reintentar; si quedan, la conserva para que la siguiente ejecución las reintente.
+
+        Returns:
+            bool: True si el recorrido ha terminado.
+        """
+        retryable = self.retryable()
+        if retryable:
+            logging.warning(f"Recorrido incompleto: {retryable} URLs fallidas se reintentarán en la próxima ejecución")
+            return False
+        self.clear()
+        logging.info("Recorrido completado; frontera vaciada")
+        return True
+
+    def clear(self):
+        with self._lock:
+            self.connection.execute("DELETE FROM frontier")
+            self.connection.commit()
+
+    def stats(self):
+        return dict(self.counts(), resumed=self.resumed)
+
+    def close(self):
+        if self.connection:
+            logging.info(f"Estadísticas de la frontera del recorrido: {self.stats()}")
+            self.connection.close()
+            self.connection = None
+
+
+def create_frontier(config):
+    """Abre la frontera del recorrido a partir de FRONTIER_CONFIG (None si está desactivada)."""
+    if not config['enabled']:
+        return None
+    policy = RetryPolicy(config['max_attempts'], config['backoff'], config['max_backoff'])
+    return CrawlFrontier(config['path'], retry_policy=policy, max_age=config['max_age'])
@@ -0,0 +1,163 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+
+'''
+En este archivo se define la caché HTTP condicional del scraper:
+- Guarda en disco el cuerpo de cada página junto con sus validadores (ETag / Last-Modified).
+- Permite enviar peticiones condicionales (If-None-Match / If-Modified-Since) y
+reutilizar el cuerpo, y el resultado ya parseado, cuando el servidor responde 304.
+- Limita el tamaño total de la caché expulsando las entradas usadas menos recientemente.
+'''
+
+
+class CacheEntry:
+    """
+    Entrada de la caché HTTP.
+
+    Attributes:
+        url (str): URL de la página.
+        etag (str): Valor de la cabecera ETag, si la hay.
+        last_modified (str): Valor de la cabecera Last-Modified, si la hay.
+        body (str): Cuerpo de la respuesta.
+        payload: Resultado ya parseado de la página (serializable en JSON), si se ha guardado.
+    """
+    def __init__(self, url, etag, last_modified, body, payload=None):
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.payload = payload
+
+    def conditional_headers(self):
+        """Cabeceras para revalidar la entrada con una petición condicional."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Caché de respuestas HTTP en disco con validadores y expulsión LRU.
+
+    Attributes:
+        path (str): Ruta del fichero SQLite de la caché (':memory:' para una caché temporal).
+        max_bytes (int): Tamaño máximo total de los cuerpos almacenados.
+        hits (int): Revalidaciones respondidas con 304.
+        misses (int): Peticiones sin entrada previa en la caché.
+        updates (int): Entradas existentes que el servidor devolvió modificadas.
+        evictions (int): Entradas expulsadas por superar el tamaño máximo.
+    """
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.updates = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body TEXT,
+                payload TEXT,
+                size INTEGER,
+                last_access REAL
+            )
+        """)
+        self.connection.commit()
+        self.total_bytes = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        logging.info(f"Caché HTTP abierta en {path} ({self.total_bytes} bytes)")
+
+    def get(self, url):
+        """Devuelve la entrada de `url` o None si no está en la caché."""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT etag, last_modified, body, payload FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.connection.execute("UPDATE responses SET last_access = ? WHERE url = ?", (time.time(), url))
+            self.connection.commit()
+        etag, last_modified, body, payload = row
+        return CacheEntry(url, etag, last_modified, body, json.loads(payload) if payload else None)
+
+    def record_hit(self):
+        """Registra una revalidación respondida con 304."""
+        with self._lock:
+            self.hits += 1
+
+    def put(self, url, headers, body):
+        """
+        Guarda la respuesta de `url` si trae algún validador.
+
+        Args:
+            url (str): URL de la página.
+            headers (Mapping): Cabeceras de la respuesta.
+            body (str): Cuerpo de la respuesta.
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        size = len(body.encode('utf-8'))
+        with self._lock:
+            previous = self.connection.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            if previous:
+                self.updates += 1
+                self.total_bytes -= previous[0]
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses (url, etag, last_modified, body, payload, size, last_access) "
+                "VALUES (?, ?, ?, ?, NULL, ?, ?)",
+                (url, etag, last_modified, body, size, time.time())
+            )
+            self.total_bytes += size
+            self._evict()
+            self.connection.commit()
+
+    def set_payload(self, url, payload):
+        """Guarda el resultado parseado de `url` para no tener que volver a parsearlo tras un 304."""
+        with self._lock:
+            self.connection.execute(
+                "UPDATE responses SET payload = ? WHERE url = ?", (json.dumps(payload), url)
+            )
+            self.connection.commit()
+
+    def _evict(self):
+        """Expulsa las entradas usadas menos recientemente hasta respetar `max_bytes`."""
+        if self.total_bytes <= self.max_bytes:
+            return
+        rows = self.connection.execute("SELECT url, size FROM responses ORDER BY last_access ASC").fetchall()
+        for url, size in rows:
+            if self.total_bytes <= self.max_bytes:
+                break
+            self.connection.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'updates': self.updates,
+            'evictions': self.evictions,
+            'bytes': self.total_bytes,
+        }
+
+    def close(self):
+        if self.connection:
+            logging.info(f"Estadísticas de la caché HTTP: {self.stats()}")
+            self.connection.close()
+            self.connection = None
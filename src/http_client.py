@@ -0,0 +1,129 @@
+import threading
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+'''
+En este archivo se define la sesión HTTP compartida por el scraper:
+- Un adaptador con pool de conexiones keep-alive y reintentos con backoff.
+- Contadores de conexiones abiertas y peticiones realizadas, para comprobar
+que las conexiones se reutilizan.
+'''
+
+
+class ConnectionStats:
+    """
+    Contadores de uso del pool de conexiones HTTP.
+
+    Attributes:
+        requests (int): Número de peticiones enviadas (incluye reintentos).
+        connections (int): Número de conexiones TCP/TLS nuevas abiertas.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    @property
+    def reused(self):
+        """Número de peticiones servidas sobre una conexión ya abierta."""
+        return max(0, self.requests - self.connections)
+
+    @property
+    def reuse_ratio(self):
+        """Proporción de peticiones que reutilizaron una conexión."""
+        return self.reused / self.requests if self.requests else 0.0
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'connections': self.connections,
+            'reused': self.reused,
+            'reuse_ratio': round(self.reuse_ratio, 3),
+        }
+
+
+def _counting_pool_class(base, stats):
+    """Crea una subclase del pool de urllib3 que registra conexiones y peticiones en `stats`."""
+    class CountingConnectionPool(base):
+        def _new_conn(self):
+            stats.record_connection()
+            return super()._new_conn()
+
+        def _make_request(self, *args, **kwargs):
+            stats.record_request()
+            return super()._make_request(*args, **kwargs)
+
+    return CountingConnectionPool
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    Adaptador HTTP con pool de conexiones que lleva la cuenta de la reutilización de conexiones.
+
+    Attributes:
+        stats (ConnectionStats): Contadores de conexiones y peticiones.
+    """
+    def __init__(self, stats=None, **kwargs):
+        self.stats = stats or ConnectionStats()
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool_class(HTTPConnectionPool, self.stats),
+            'https': _counting_pool_class(HTTPSConnectionPool, self.stats),
+        }
+
+
+def build_retry(config):
+    """Construye la política de reintentos de urllib3 a partir de la configuración."""
+    return Retry(
+        total=config['retries'],
+        backoff_factor=config['backoff_factor'],
+        status_forcelist=tuple(config['status_forcelist']),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        raise_on_status=False,
+    )
+
+
+def create_session(config, pool_maxsize=None):
+    """
+    Crea una sesión de requests con pool de conexiones keep-alive y reintentos.
+
+    Args:
+        config (dict): Configuración HTTP (ver HTTP_CONFIG en config/config.py).
+        pool_maxsize (int, optional): Tamaño mínimo del pool por host; se usa el mayor
+            entre este valor y el configurado.
+
+    Returns:
+        requests.Session: Sesión lista para usar.
+    """
+    maxsize = max(config['pool_maxsize'], pool_maxsize or 0)
+    adapter = PooledHTTPAdapter(
+        pool_connections=config['pool_connections'],
+        pool_maxsize=maxsize,
+        max_retries=build_retry(config),
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    logging.info(f"Sesión HTTP creada (pool de {maxsize} conexiones por host, {config['retries']} reintentos)")
+    return session
+
+
+def connection_stats(session, url):
+    """Devuelve los contadores de conexión del adaptador que atiende `url`, o None si no los tiene."""
+    adapter = session.get_adapter(url)
+    stats = getattr(adapter, 'stats', None)
+    return stats.as_dict() if stats else None
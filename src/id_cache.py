@@ -0,0 +1,77 @@
+class IdCache:
+    """
+    Caché en memoria de IDs de una tabla indexada por nombre (autores o etiquetas).
+
+    Attributes:
+        table (str): Tabla a la que pertenecen los IDs.
+        loaded (bool): Indica si la caché se ha precargado con toda la tabla.
+        hits (int): Búsquedas resueltas desde la caché.
+        misses (int): Búsquedas que han tenido que ir a la base de datos.
+    """
+    def __init__(self, table):
+        self.table = table
+        self.loaded = False
+        self.hits = 0
+        self.misses = 0
+        self._ids = {}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def get(self, name):
+        """Devuelve el ID de `name` o None si no está en la caché."""
+        value = self._ids.get(name)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def lookup(self, names):
+        """
+        Busca varios nombres a la vez.
+
+        Returns:
+            tuple: (diccionario {nombre: id} encontrados, lista de nombres que faltan)
+        """
+        found = {}
+        missing = []
+        for name in names:
+            value = self._ids.get(name)
+            if value is None:
+                missing.append(name)
+            else:
+                found[name] = value
+        self.hits += len(found)
+        self.misses += len(missing)
+        return found, missing
+
+    def put(self, name, value):
+        if value is not None:
+            self._ids[name] = value
+
+    def update(self, ids):
+        self._ids.update(ids)
+
+    def load(self, ids):
+        """Reemplaza el contenido de la caché con todos los IDs de la tabla."""
+        self._ids = dict(ids)
+        self.loaded = True
+
+    def clear(self):
+        """Vacía la caché; se vuelve a precargar en el siguiente uso."""
+        self._ids = {}
+        self.loaded = False
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            'size': len(self._ids),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hit_rate, 3),
+        }
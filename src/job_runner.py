@@ -0,0 +1,174 @@
+import os
+import time
+import logging
+from collections import namedtuple
+import schedule
+from .scraper import BudgetExceededError
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+'''
+En este archivo se define el ejecutor de la actualización periódica:
+- Un bloqueo de fichero impide que dos procesos ejecuten la actualización a la vez; el sistema
+lo libera si el proceso termina, por lo que no quedan bloqueos huérfanos.
+- Cada ejecución tiene un presupuesto de tiempo: el scraper deja de pedir páginas al agotarlo
+y el trabajo lo comprueba entre etapas (RunContext.check_deadline). Una etapa ya empezada, como
+la inserción en su transacción, no se interrumpe, pero si la ejecución termina fuera de plazo
+se registra como 'timeout'.
+- `schedule` programa la siguiente ejecución al terminar la actual, así que una ejecución que
+dura más que el intervalo no deja ticks pendientes; los intervalos completos que ha durado de
+más se registran como `overrun_intervals`.
+- Cada ejecución se registra en la tabla `runs` con su duración, filas modificadas y páginas descargadas.
+'''
+
+# Resultado de una ejecución. `status` es 'ok', 'timeout' (presupuesto agotado), 'error' o 'skipped'.
+RunRecord = namedtuple('RunRecord', [
+    'started_at', 'duration', 'status', 'rows_changed', 'pages_fetched', 'overrun_intervals', 'error'
+])
+
+
+class RunContext:
+    """
+    Estado de una ejecución que el trabajo va actualizando.
+
+    Attributes:
+        deadline (float): Instante (time.monotonic) a partir del cual se detiene el trabajo (None = sin límite).
+        rows_changed (int): Filas insertadas o actualizadas.
+        pages_fetched (int): Páginas descargadas.
+    """
+    def __init__(self, budget=None):
+        self.deadline = time.monotonic() + budget if budget else None
+        self.rows_changed = 0
+        self.pages_fetched = 0
+
+    def expired(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def check_deadline(self, stage):
+        """
+        Comprueba el presupuesto antes de empezar una etapa del trabajo.
+
+        Raises:
+            BudgetExceededError: Si se ha superado `deadline`.
+        """
+        if self.expired():
+            raise BudgetExceededError(f"Presupuesto de tiempo agotado antes de {stage}")
+
+
+class FileLock:
+    """Bloqueo exclusivo y no bloqueante sobre un fichero."""
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+
+    def acquire(self):
+        """Intenta obtener el bloqueo; devuelve False si lo tiene otro proceso."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+
+class JobRunner:
+    """
+    Ejecuta un trabajo periódicamente sin solapamientos.
+
+    Attributes:
+        job (callable): Trabajo a ejecutar; recibe un RunContext.
+        interval (float): Segundos entre ejecuciones.
+        budget (float): Presupuesto de tiempo de cada ejecución en segundos (None = sin límite).
+        lock (FileLock): Bloqueo compartido entre procesos.
+        recorder (callable): Función que guarda cada RunRecord (por ejemplo, en la tabla `runs`).
+    """
+    def __init__(self, job, interval, budget=None, lock=None, recorder=None):
+        self.job = job
+        self.interval = interval
+        self.budget = budget
+        self.lock = lock
+        self.recorder = recorder
+
+    def tick(self):
+        """
+        Ejecuta el trabajo una vez si no hay otra ejecución en curso.
+
+        Returns:
+            RunRecord: Resultado de la ejecución (estado 'skipped' si el bloqueo estaba ocupado).
+        """
+        started_at = time.time()
+        if self.lock is not None and not self.lock.acquire():
+            logging.warning("Hay otra actualización en curso; se omite esta ejecución")
+            return self._record(RunRecord(started_at, 0.0, 'skipped', 0, 0, 0, None))
+
+        context = RunContext(self.budget)
+        start = time.monotonic()
+        status, error = 'ok', None
+        try:
+            self.job(context)
+            if context.expired():
+                status, error = 'timeout', f"Presupuesto de {self.budget:g} s superado"
+                logging.warning(f"La actualización ha terminado fuera de su presupuesto de tiempo ({self.budget:g} s)")
+        except BudgetExceededError as e:
+            status, error = 'timeout', str(e)
+            logging.warning(f"Actualización detenida por presupuesto de tiempo: {e}")
+        except Exception as e:
+            status, error = 'error', str(e)
+            logging.error(f"Error durante la actualización: {e}")
+        finally:
+            if self.lock is not None:
+                self.lock.release()
+        duration = time.monotonic() - start
+        # Intervalos completos que ha durado de más la ejecución
+        overrun_intervals = int(duration // self.interval) if self.interval else 0
+        if overrun_intervals:
+            logging.warning(f"La actualización ha durado {duration:.1f} s, {overrun_intervals} intervalos más de lo programado")
+        return self._record(RunRecord(
+            started_at, duration, status, context.rows_changed, context.pages_fetched, overrun_intervals, error
+        ))
+
+    def _record(self, run):
+        logging.info(f"Ejecución: {run._asdict()}")
+        if self.recorder is not None:
+            try:
+                self.recorder(run)
+            except Exception as e:
+                logging.error(f"Error registrando la ejecución: {e}")
+        return run
+
+    def run_forever(self):
+        """
+        Programa `tick` cada `interval` segundos. `schedule` calcula la siguiente ejecución
+        al terminar la actual, de modo que una ejecución lenta no deja ticks acumulados.
+        """
+        schedule.every(self.interval).seconds.do(self.tick)
+        while True:
+            schedule.run_pending()
+            time.sleep(1)
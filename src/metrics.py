@@ -0,0 +1,243 @@
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+'''
+En este archivo se define la capa de métricas del pipeline:
+- Contadores e histogramas con etiquetas, en memoria y seguros entre hilos.
+- `log_summary` escribe un resumen en JSON en el logger `metrics` (ver LOG_CONFIG).
+- `serve_prometheus` expone las métricas en formato de texto de Prometheus desde el
+proceso del programador de actualizaciones.
+Las métricas son acumuladas desde el arranque del proceso, como en Prometheus.
+'''
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _escape_label(value):
+    """Escapa un valor de etiqueta como exige el formato de texto de Prometheus (\\, \" y \\n)."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key, extra=()):
+    items = list(key) + list(extra)
+    if not items:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in items) + '}'
+
+
+class Counter:
+    """Contador monótono con etiquetas."""
+    kind = 'counter'
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(_label_key(labels), 0)
+
+    def snapshot(self):
+        with self._lock:
+            return {_format_labels(key) or 'total': value for key, value in self._values.items()}
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Histogram:
+    """Histograma con cubetas acumuladas, suma y número de observaciones por etiquetas."""
+    kind = 'histogram'
+
+    def __init__(self, name, help, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'counts': [0] * len(self.buckets), 'count': 0, 'sum': 0.0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][index] += 1
+                    break
+            series['count'] += 1
+            series['sum'] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Contexto que observa la duración del bloque en segundos."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _quantile(self, series, q):
+        """Estimación del cuantil `q` a partir de las cubetas (límite superior de la cubeta)."""
+        target = q * series['count']
+        cumulative = 0
+        for bound, count in zip(self.buckets, series['counts']):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return float('inf')
+
+    def snapshot(self):
+        with self._lock:
+            result = {}
+            for key, series in self._series.items():
+                count = series['count']
+                result[_format_labels(key) or 'total'] = {
+                    'count': count,
+                    'sum': round(series['sum'], 6),
+                    'avg': round(series['sum'] / count, 6) if count else 0.0,
+                    'p50': self._quantile(series, 0.5),
+                    'p95': self._quantile(series, 0.95),
+                    'p99': self._quantile(series, 0.99),
+                }
+            return result
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series['counts']):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(key, [('le', bound)])} {cumulative}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', '+Inf')])} {series['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+class Registry:
+    """Conjunto de métricas del proceso."""
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, help, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, **kwargs)
+            return metric
+
+    def counter(self, name, help):
+        return self._register(Counter, name, help)
+
+    def histogram(self, name, help, buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, help, buckets=buckets)
+
+    def snapshot(self):
+        """Devuelve {nombre: valores por etiquetas} de todas las métricas."""
+        return {name: metric.snapshot() for name, metric in sorted(self._metrics.items())}
+
+    def render_prometheus(self):
+        """Devuelve las métricas en formato de texto de Prometheus."""
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            help_text = metric.help.replace('\\', '\\\\').replace('\n', '\\n')
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        with self._lock:
+            self._metrics.clear()
+
+
+REGISTRY = Registry()
+
+# Métricas del pipeline
+HTTP_REQUEST_SECONDS = REGISTRY.histogram('quotes_http_request_seconds', "Latencia de las peticiones HTTP del scraper")
+HTTP_THROTTLED = REGISTRY.counter('quotes_http_throttled_total', "Respuestas 429/503 reintentadas por el limitador")
+PARSE_SECONDS = REGISTRY.histogram('quotes_parse_seconds', "Tiempo de parseo por página")
+CLEAN_SECONDS = REGISTRY.histogram('quotes_clean_seconds', "Tiempo de limpieza por llamada")
+DB_QUERIES = REGISTRY.counter('quotes_db_queries_total', "Sentencias SQL ejecutadas por tipo")
+DB_COMMITS = REGISTRY.counter('quotes_db_commits_total', "Transacciones confirmadas")
+DB_ROWS = REGISTRY.counter('quotes_db_rows_total', "Filas escritas por insert_data por tabla")
+DB_INSERT_SECONDS = REGISTRY.histogram('quotes_db_insert_seconds', "Duración de cada llamada a insert_data")
+STAGE_SECONDS = REGISTRY.histogram('quotes_stage_seconds', "Duración de cada etapa del pipeline",
+                                   buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0))
+
+
+def stage(name):
+    """Contexto que mide la duración de una etapa del pipeline (scrape, clean, insert...)."""
+    return STAGE_SECONDS.time(stage=name)
+
+
+def statement_kind(query):
+    """Tipo de una sentencia SQL (select, insert, update...) para etiquetar las métricas."""
+    words = query.lstrip().split(None, 1)
+    return words[0].lower() if words else 'unknown'
+
+
+def rows_per_second(registry=REGISTRY):
+    """Filas por segundo de insert_data por tabla (filas escritas / tiempo total de insert_data)."""
+    rows = registry.snapshot().get(DB_ROWS.name, {})
+    seconds = sum(series['sum'] for series in registry.snapshot().get(DB_INSERT_SECONDS.name, {}).values())
+    return {labels: round(count / seconds, 1) for labels, count in rows.items()} if seconds else {}
+
+
+def log_summary(event, registry=REGISTRY, **fields):
+    """Escribe en el logger `metrics` una línea JSON con el estado de todas las métricas."""
+    record = {'event': event, 'timestamp': time.time(), **fields,
+              'metrics': registry.snapshot(), 'rows_per_s': rows_per_second(registry)}
+    logging.getLogger('metrics').info(json.dumps(record, ensure_ascii=False, default=str))
+    return record
+
+
+def serve_prometheus(port, registry=REGISTRY, host='0.0.0.0'):
+    """
+    Sirve las métricas en `http://host:port/metrics` desde un hilo en segundo plano.
+
+    Returns:
+        ThreadingHTTPServer: Servidor en marcha (llamar a shutdown() para detenerlo).
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logging.info(f"Métricas Prometheus en http://{host}:{server.server_address[1]}/metrics")
+    return server
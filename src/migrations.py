@@ -0,0 +1,367 @@
+import time
+import logging
+from collections import namedtuple
+from .models import content_hash
+from .search import fts5_available
+
+'''
+En este archivo se definen las migraciones versionadas del esquema de la base de datos:
+- Cada migración tiene un número de versión y una función que recibe la instancia de
+Database y funciona tanto en MySQL como en SQLite.
+- La tabla `schema_version` registra las versiones aplicadas.
+- `migrate` aplica en orden las migraciones pendientes; se ejecuta desde Database.create_tables.
+'''
+
+Migration = namedtuple('Migration', ['version', 'description', 'apply'])
+
+
+def _has_column(db, table, column):
+    """Indica si `table` tiene la columna `column`."""
+    if db.is_mysql:
+        db.cursor.execute(f"SHOW COLUMNS FROM {table} LIKE %s", (column,))
+        return db.cursor.fetchone() is not None
+    db.cursor.execute(f"PRAGMA table_info({table})")
+    return any(row[1] == column for row in db.cursor.fetchall())
+
+
+def _index_columns(db, table):
+    """Devuelve {nombre del índice: tupla de columnas} para los índices de `table`."""
+    indexes = {}
+    if db.is_mysql:
+        db.cursor.execute("""
+            SELECT index_name, column_name FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = %s
+            ORDER BY index_name, seq_in_index
+        """, (table,))
+        for name, column in db.cursor.fetchall():
+            indexes[name] = indexes.get(name, ()) + (column,)
+    else:
+        db.cursor.execute(f"PRAGMA index_list({table})")
+        for row in db.cursor.fetchall():
+            db.cursor.execute(f"PRAGMA index_info({row[1]})")
+            indexes[row[1]] = tuple(info[2] for info in sorted(db.cursor.fetchall()))
+    return indexes
+
+
+def _ensure_index(db, name, table, columns):
+    """
+    Crea el índice `name` salvo que ya exista otro que empiece por las mismas columnas
+    (por ejemplo, el que MySQL crea automáticamente para una clave foránea).
+    """
+    columns = tuple(columns)
+    for existing in _index_columns(db, table).values():
+        if existing[:len(columns)] == columns:
+            return
+    db.cursor.execute(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})")
+    logging.info(f"Índice {name} creado en {table}{columns}")
+
+
+def _has_table(db, table):
+    """Indica si existe la tabla `table`."""
+    if db.is_mysql:
+        db.cursor.execute("SHOW TABLES LIKE %s", (table,))
+    else:
+        db.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+    return db.cursor.fetchone() is not None
+
+
+def _primary_key(db, table):
+    """Devuelve la tupla de columnas de la clave primaria de `table` (vacía si no tiene)."""
+    if db.is_mysql:
+        return _index_columns(db, table).get('PRIMARY', ())
+    db.cursor.execute(f"PRAGMA table_info({table})")
+    return tuple(row[1] for row in sorted(db.cursor.fetchall(), key=lambda row: row[5]) if row[5])
+
+
+def _natural_keys(db):
+    """
+    Claves naturales en quotes y quote_tags.
+
+    Añade y rellena `quotes.content_hash`, fusiona las Frases duplicadas (las relaciones
+    pasan a la de menor ID), elimina las relaciones repetidas y crea la clave única
+    (content_hash, author_id) y la clave primaria (quote_id, tag_id).
+
+    Cada paso comprueba si ya está hecho: MySQL confirma cada sentencia DDL por separado,
+    así que un intento fallido puede dejar el esquema a medias y el reintento debe
+    completar solo lo que falta.
+    """
+    rename = "RENAME TABLE quote_tags_new TO quote_tags" if db.is_mysql else "ALTER TABLE quote_tags_new RENAME TO quote_tags"
+    if _has_table(db, 'quote_tags_new'):
+        if _has_table(db, 'quote_tags'):
+            # La copia no llegó a sustituir a la tabla original: se repite desde el principio
+            db.cursor.execute("DROP TABLE quote_tags_new")
+        else:
+            # La tabla original ya se borró tras copiar las relaciones: solo falta renombrar
+            db.cursor.execute(rename)
+    if not _has_column(db, 'quotes', 'content_hash'):
+        column_type = 'CHAR(64) NULL' if db.is_mysql else 'TEXT'
+        db.cursor.execute(f"ALTER TABLE quotes ADD COLUMN content_hash {column_type}")
+    if db.is_mysql:
+        db.cursor.execute("UPDATE quotes SET content_hash = SHA2(text, 256) WHERE content_hash IS NULL")
+    else:
+        db.cursor.execute("SELECT id, text FROM quotes WHERE content_hash IS NULL")
+        hashes = [(content_hash(text or ''), quote_id) for quote_id, text in db.cursor.fetchall()]
+        db.executemany("UPDATE quotes SET content_hash = ? WHERE id = ?", hashes)
+
+    db.cursor.execute("""
+        SELECT quotes.id, keep.keep_id FROM quotes
+        JOIN (
+            SELECT content_hash, author_id, MIN(id) AS keep_id FROM quotes
+            GROUP BY content_hash, author_id HAVING COUNT(*) > 1
+        ) keep ON quotes.content_hash = keep.content_hash AND quotes.author_id = keep.author_id
+        WHERE quotes.id <> keep.keep_id
+    """)
+    duplicates = db.cursor.fetchall()
+    # Si quote_tags ya tiene su clave primaria, las relaciones repetidas no se mueven y se borran
+    update_ignore = 'UPDATE IGNORE' if db.is_mysql else 'UPDATE OR IGNORE'
+    db.executemany(
+        f"{update_ignore} quote_tags SET quote_id = {db.placeholder} WHERE quote_id = {db.placeholder}",
+        [(keep_id, quote_id) for quote_id, keep_id in duplicates]
+    )
+    db.executemany(
+        f"DELETE FROM quote_tags WHERE quote_id = {db.placeholder}", [(quote_id,) for quote_id, _ in duplicates]
+    )
+    db.executemany(
+        f"DELETE FROM quotes WHERE id = {db.placeholder}", [(quote_id,) for quote_id, _ in duplicates]
+    )
+
+    if _primary_key(db, 'quote_tags') != ('quote_id', 'tag_id'):
+        id_type = 'INT' if db.is_mysql else 'INTEGER'
+        insert_ignore = 'INSERT IGNORE' if db.is_mysql else 'INSERT OR IGNORE'
+        db.cursor.execute(f"""
+            CREATE TABLE quote_tags_new (
+                quote_id {id_type},
+                tag_id {id_type},
+                PRIMARY KEY (quote_id, tag_id),
+                FOREIGN KEY (quote_id) REFERENCES quotes(id),
+                FOREIGN KEY (tag_id) REFERENCES tags(id)
+            )
+        """)
+        db.cursor.execute(f"{insert_ignore} INTO quote_tags_new (quote_id, tag_id) SELECT quote_id, tag_id FROM quote_tags")
+        db.cursor.execute("DROP TABLE quote_tags")
+        db.cursor.execute(rename)
+
+    if 'uq_quotes_hash_author' not in _index_columns(db, 'quotes'):
+        if db.is_mysql:
+            db.cursor.execute("""
+                ALTER TABLE quotes
+                MODIFY content_hash CHAR(64) NOT NULL,
+                ADD UNIQUE KEY uq_quotes_hash_author (content_hash, author_id)
+            """)
+        else:
+            db.cursor.execute("CREATE UNIQUE INDEX uq_quotes_hash_author ON quotes (content_hash, author_id)")
+    logging.info(f"Claves naturales creadas: {len(duplicates)} Frases duplicadas fusionadas")
+
+
+def _query_indexes(db):
+    """
+    Índices para las consultas de la aplicación.
+
+    - quotes(author_id): Frases de un autor y TOP 5 de autores.
+    - quote_tags(tag_id, quote_id): Frases de una etiqueta y TOP 5 de etiquetas.
+    Las búsquedas por quote_tags.quote_id usan la clave primaria (quote_id, tag_id) y
+    las de authors.name y tags.name sus restricciones UNIQUE.
+    """
+    _ensure_index(db, 'idx_quotes_author', 'quotes', ['author_id'])
+    _ensure_index(db, 'idx_quote_tags_tag', 'quote_tags', ['tag_id', 'quote_id'])
+
+
+def _data_version(db):
+    """
+    Tabla `data_version` con un contador que el proceso de actualización incrementa tras
+    cada inserción, usado para invalidar la caché de lecturas de la aplicación.
+    """
+    version_type = 'BIGINT' if db.is_mysql else 'INTEGER'
+    db.cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY,
+            version {version_type} NOT NULL
+        )
+    """)
+    insert_ignore = 'INSERT IGNORE' if db.is_mysql else 'INSERT OR IGNORE'
+    db.cursor.execute(f"{insert_ignore} INTO data_version (id, version) VALUES (1, 0)")
+
+
+def _search_index(db):
+    """
+    Índices de texto completo para la búsqueda (ver src/search.py).
+
+    - MySQL: índices FULLTEXT sobre quotes(text) y authors(name, about).
+    - SQLite: tablas FTS5 `quotes_fts` (contenido externo sobre quotes, las Frases no se
+    modifican) y `authors_fts` (con su propio contenido, las biografías se actualizan),
+    cargadas con los datos existentes. Sin FTS5 no se crea nada y se usa el índice en memoria.
+    """
+    if db.is_mysql:
+        indexes = _index_columns(db, 'quotes')
+        if 'ft_quotes_text' not in indexes:
+            db.cursor.execute("ALTER TABLE quotes ADD FULLTEXT INDEX ft_quotes_text (text)")
+        if 'ft_authors_text' not in _index_columns(db, 'authors'):
+            db.cursor.execute("ALTER TABLE authors ADD FULLTEXT INDEX ft_authors_text (name, about)")
+        return
+    if not fts5_available(db.connection):
+        logging.warning("SQLite sin FTS5: la búsqueda usará el índice invertido en memoria")
+        return
+    db.cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS quotes_fts USING fts5(
+            text, content='quotes', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    db.cursor.execute("INSERT INTO quotes_fts (quotes_fts) VALUES ('rebuild')")
+    db.cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS authors_fts USING fts5(
+            name, about, tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    db.cursor.execute("DELETE FROM authors_fts")
+    db.cursor.execute("INSERT INTO authors_fts (rowid, name, about) SELECT id, name, COALESCE(about, '') FROM authors")
+
+
+def _stats_tables(db):
+    """
+    Tablas de contadores para el TOP 5: `author_stats(quote_count)` y `tag_stats(usage_count)`,
+    indexadas por el contador para que el TOP-N sea un ORDER BY ... LIMIT sobre el índice.
+    Database.insert_data las mantiene de forma incremental y Database.rebuild_stats las repara.
+    """
+    count_type = 'INT' if db.is_mysql else 'INTEGER'
+    for table, key, column, parent in (
+        ('author_stats', 'author_id', 'quote_count', 'authors'),
+        ('tag_stats', 'tag_id', 'usage_count', 'tags'),
+    ):
+        db.cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                {key} {count_type} PRIMARY KEY,
+                {column} {count_type} NOT NULL DEFAULT 0,
+                FOREIGN KEY ({key}) REFERENCES {parent}(id)
+            )
+        """)
+        _ensure_index(db, f'idx_{table}_{column}', table, [column, key])
+    db._rebuild_stats()
+
+
+def _page_fingerprints(db):
+    """
+    Tabla `page_fingerprints` con la huella de cada página del listado, usada por el
+    rastreo incremental para saltarse las páginas que no han cambiado.
+    """
+    if db.is_mysql:
+        db.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS page_fingerprints (
+                url VARCHAR(255) PRIMARY KEY,
+                body_hash CHAR(64) NOT NULL,
+                quotes_hash CHAR(64) NOT NULL,
+                quote_count INT NOT NULL,
+                changed_at DOUBLE NOT NULL
+            )
+        """)
+    else:
+        db.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS page_fingerprints (
+                url TEXT PRIMARY KEY,
+                body_hash TEXT NOT NULL,
+                quotes_hash TEXT NOT NULL,
+                quote_count INTEGER NOT NULL,
+                changed_at REAL NOT NULL
+            )
+        """)
+
+
+def _runs(db):
+    """Tabla `runs` con el registro de cada ejecución de la actualización periódica."""
+    if db.is_mysql:
+        db.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                started_at DOUBLE NOT NULL,
+                duration DOUBLE NOT NULL,
+                status VARCHAR(16) NOT NULL,
+                rows_changed INT NOT NULL,
+                pages_fetched INT NOT NULL,
+                overrun_intervals INT NOT NULL,
+                error TEXT
+            )
+        """)
+    else:
+        db.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at REAL NOT NULL,
+                duration REAL NOT NULL,
+                status TEXT NOT NULL,
+                rows_changed INTEGER NOT NULL,
+                pages_fetched INTEGER NOT NULL,
+                overrun_intervals INTEGER NOT NULL,
+                error TEXT
+            )
+        """)
+
+
+def _runs_overrun_intervals(db):
+    """
+    Renombra `runs.coalesced` a `runs.overrun_intervals` en las bases de datos creadas con la
+    versión anterior de la migración 7: la columna cuenta los intervalos completos que ha
+    durado de más una ejecución; `schedule` no acumula ni agrupa ticks.
+    """
+    if not _has_column(db, 'runs', 'coalesced'):
+        return
+    if db.is_mysql:
+        db.cursor.execute("ALTER TABLE runs CHANGE coalesced overrun_intervals INT NOT NULL")
+    else:
+        db.cursor.execute("ALTER TABLE runs RENAME COLUMN coalesced TO overrun_intervals")
+
+
+MIGRATIONS = [
+    Migration(1, "Claves naturales en quotes y quote_tags", _natural_keys),
+    Migration(2, "Índices para las consultas de la aplicación", _query_indexes),
+    Migration(3, "Contador de versión de datos", _data_version),
+    Migration(4, "Índices de texto completo para la búsqueda", _search_index),
+    Migration(5, "Contadores precalculados para el TOP 5", _stats_tables),
+    Migration(6, "Huellas de las páginas del listado", _page_fingerprints),
+    Migration(7, "Registro de ejecuciones de la actualización", _runs),
+    Migration(8, "Intervalos excedidos en el registro de ejecuciones", _runs_overrun_intervals),
+]
+
+
+def _ensure_version_table(db):
+    description_type = 'VARCHAR(255)' if db.is_mysql else 'TEXT'
+    applied_type = 'DOUBLE' if db.is_mysql else 'REAL'
+    db.cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description {description_type},
+            applied_at {applied_type}
+        )
+    """)
+
+
+def current_version(db):
+    """Devuelve la última versión de esquema aplicada (0 si no se ha aplicado ninguna)."""
+    _ensure_version_table(db)
+    db.cursor.execute("SELECT MAX(version) FROM schema_version")
+    row = db.cursor.fetchone()
+    return row[0] or 0
+
+
+def migrate(db, target=None):
+    """
+    Aplica en orden las migraciones pendientes hasta `target` (por defecto, la última).
+
+    Cada migración se confirma y se registra en `schema_version` por separado, de modo
+    que una migración fallida puede reintentarse sin repetir las anteriores.
+
+    Returns:
+        int: Versión del esquema tras aplicar las migraciones.
+    """
+    version = current_version(db)
+    target = MIGRATIONS[-1].version if target is None else target
+    for migration in MIGRATIONS:
+        if version < migration.version <= target:
+            logging.info(f"Aplicando migración {migration.version}: {migration.description}")
+            migration.apply(db)
+            db.cursor.execute(
+                f"INSERT INTO schema_version (version, description, applied_at) "
+                f"VALUES ({db.placeholder}, {db.placeholder}, {db.placeholder})",
+                (migration.version, migration.description, time.time())
+            )
+            db.commit()
+            version = migration.version
+    return version
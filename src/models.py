@@ -1,18 +1,36 @@
+import sys
+import hashlib
+from collections import namedtuple
+
+def _intern(value):
+    """Interna las cadenas que se repiten entre Frases (autores, etiquetas y enlaces)."""
+    return sys.intern(value) if type(value) is str else value
+
 class Quote:
     """
     Representa una Frase extraída de la web.
 
+    Usa `__slots__` en lugar de un `__dict__` por instancia; el autor, el enlace y las
+    etiquetas se internan, de modo que todas las Frases comparten una sola copia de cada uno.
+
     Attributes:
         text (str): El texto de la Frase.
         author (str): El autor de la Frase.
-        tags (list): Lista de etiquetas asociadas a la Frase.
+        tags (tuple): Etiquetas asociadas a la Frase.
         author_about_link (str): Enlace a la biografía del autor.
     """
+    __slots__ = ('text', 'author', 'tags', 'author_about_link')
+
     def __init__(self, text, author, tags, author_about_link):
         self.text = text
-        self.author = author
-        self.tags = tags
-        self.author_about_link = author_about_link
+        self.author = _intern(author)
+        self.tags = tuple(_intern(tag) for tag in tags)
+        self.author_about_link = _intern(author_about_link)
+
+    def __reduce__(self):
+        # Al deserializar (por ejemplo, al volver del pool de procesos de clean_data) se pasa
+        # por __init__ para que las cadenas se vuelvan a internar en este proceso
+        return (Quote, (self.text, self.author, self.tags, self.author_about_link))
 
 class Author:
     """
@@ -23,7 +41,30 @@ class Author:
         about (str): La biografía del autor.
         about_link (str): Enlace a la biografía del autor.
     """
+    __slots__ = ('name', 'about', 'about_link')
+
     def __init__(self, name, about, about_link):
-        self.name = name
+        self.name = _intern(name)
         self.about = about
-        self.about_link = about_link
+        self.about_link = _intern(about_link)
+
+    def __reduce__(self):
+        return (Author, (self.name, self.about, self.about_link))
+
+
+def content_hash(text):
+    """Devuelve la clave natural de una Frase: el SHA-256 en hexadecimal de su texto."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def quotes_fingerprint(quotes):
+    """
+    Devuelve la huella del conjunto de Frases de una página del listado: el SHA-256 de
+    sus claves (texto y autor) ordenadas, independiente del orden y del HTML de la página.
+    """
+    keys = sorted(f"{content_hash(quote.text)}\t{quote.author}" for quote in quotes)
+    return hashlib.sha256('\n'.join(keys).encode('utf-8')).hexdigest()
+
+
+# Huella de una página del listado: hash del HTML, hash del conjunto de Frases y número de Frases
+PageFingerprint = namedtuple('PageFingerprint', ['url', 'body_hash', 'quotes_hash', 'quote_count'])
@@ -0,0 +1,76 @@
+import re
+import functools
+from html import unescape
+
+'''
+En este archivo se define el motor de normalización de textos usado por src/clean_data.py:
+- Los patrones se compilan una sola vez.
+- Los nombres de autor y las etiquetas se repiten miles de veces con un vocabulario pequeño,
+por lo que su resultado se memoriza en cachés LRU acotadas.
+- Los textos de las Frases y las biografías son casi siempre únicos y no se memorizan.
+'''
+
+_SPECIAL_CHARS = re.compile(r'[^\w\s.,!?"-]')
+_TITLES = re.compile(r'^(Mr\.|Mrs\.|Ms\.|Dr\.|Prof\.)\s+')
+
+
+class TextNormalizer:
+    """
+    Normalizador de textos con patrones precompilados y cachés acotadas.
+
+    Attributes:
+        author_name (callable): Limpia un nombre de autor (memorizado).
+        tag (callable): Limpia una etiqueta (memorizado).
+    """
+    def __init__(self, name_cache_size=4096, tag_cache_size=4096):
+        self.author_name = functools.lru_cache(maxsize=name_cache_size)(self._author_name)
+        self.tag = functools.lru_cache(maxsize=tag_cache_size)(self._tag)
+
+    @staticmethod
+    def text(text):
+        """
+        Limpia el texto eliminando espacios extra, caracteres especiales y decodificando entidades HTML.
+        """
+        # Decodificar entidades HTML
+        text = unescape(text)
+        # Eliminar espacios extra
+        text = ' '.join(text.split())
+        # Eliminar caracteres especiales, manteniendo puntuación básica
+        return _SPECIAL_CHARS.sub('', text).strip()
+
+    def _author_name(self, name):
+        # Eliminar títulos comunes
+        name = _TITLES.sub('', name, count=1)
+        # Asegurarse de que cada palabra comience con mayúscula
+        name = ' '.join(word.capitalize() for word in name.split())
+        return self.text(name)
+
+    def _tag(self, tag):
+        return self.text(tag.lower())
+
+    def tags(self, tags):
+        """Limpia una lista de etiquetas, eliminando duplicados y conservando el orden."""
+        return list(dict.fromkeys(self.tag(tag) for tag in tags))
+
+    def clear(self):
+        self.author_name.cache_clear()
+        self.tag.cache_clear()
+
+    def stats(self):
+        """Devuelve aciertos, fallos, tamaño y capacidad de cada caché."""
+        stats = {}
+        for name, cache in (('author_names', self.author_name), ('tags', self.tag)):
+            info = cache.cache_info()
+            total = info.hits + info.misses
+            stats[name] = {
+                'hits': info.hits,
+                'misses': info.misses,
+                'size': info.currsize,
+                'maxsize': info.maxsize,
+                'hit_rate': round(info.hits / total, 3) if total else 0.0,
+            }
+        return stats
+
+
+# Instancia compartida por las funciones de src/clean_data.py (una por proceso)
+normalizer = TextNormalizer()
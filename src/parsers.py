@@ -0,0 +1,157 @@
+import re
+import logging
+from bs4 import BeautifulSoup
+from .models import Quote, Author
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml es opcional
+    lxml = None
+
+'''
+En este archivo se definen los parsers HTML del scraper:
+- SoupParser: implementación de referencia con BeautifulSoup y 'html.parser'.
+- LxmlParser: implementación rápida con lxml y expresiones XPath precompiladas
+(requiere tener lxml instalado).
+Ambos producen exactamente los mismos objetos Quote y Author: el HTML se prepara igual
+para los dos (saltos de línea normalizados) antes de parsearlo.
+'''
+
+# Declaración XML inicial de las páginas XHTML (lxml no la admite en cadenas de texto)
+_XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+
+def _prepare(html):
+    """
+    Normaliza los saltos de línea (CRLF y CR a LF) como indica HTML5. lxml lo hace al
+    parsear y html.parser no, así que sin este paso las Frases con saltos de línea
+    tendrían un texto (y un content_hash) distinto según el parser.
+    """
+    return html.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _format_about(born_date, born_location, description):
+    """Compone la biografía de un autor a partir de sus campos."""
+    return f"Born: {born_date} in {born_location}\n\n{description}"
+
+
+class SoupParser:
+    """Parser de referencia basado en BeautifulSoup."""
+    name = 'soup'
+
+    def parse_quotes(self, html, base_url):
+        """
+        Extrae los objetos Quote de una página del listado.
+
+        Args:
+            html (str): HTML de la página.
+            base_url (str): URL base a la que se añaden los enlaces a los autores.
+        """
+        soup = BeautifulSoup(_prepare(html), 'html.parser')
+        quotes = []
+        for quote_div in soup.find_all('div', class_='quote'):
+            text = quote_div.find('span', class_='text').text.strip()
+            author = quote_div.find('small', class_='author').text.strip()
+            tags = [tag.text for tag in quote_div.find_all('a', class_='tag')]
+            author_about_link = base_url + quote_div.find('a')['href']
+            quotes.append(Quote(text, author, tags, author_about_link))
+        return quotes
+
+    def parse_author(self, html, name, about_link):
+        """Construye un objeto Author a partir del HTML de su página."""
+        soup = BeautifulSoup(_prepare(html), 'html.parser')
+        born_date = soup.find('span', class_='author-born-date')
+        born_date = born_date.text.strip() if born_date else "Unknown"
+        born_location = soup.find('span', class_='author-born-location')
+        born_location = born_location.text.strip() if born_location else "Unknown"
+        description = soup.find('div', class_='author-description')
+        description = description.text.strip() if description else "No description available"
+        return Author(name, _format_about(born_date, born_location, description), about_link)
+
+
+def _has_class(tag, cls):
+    """Expresión XPath equivalente a `class_=cls` de BeautifulSoup."""
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+
+
+class LxmlParser:
+    """Parser rápido basado en lxml con expresiones XPath precompiladas."""
+    name = 'lxml'
+
+    def __init__(self):
+        if lxml is None:
+            raise ImportError("El parser 'lxml' requiere tener instalado el paquete lxml")
+        self._quote_divs = etree.XPath('//' + _has_class('div', 'quote'))
+        self._text = etree.XPath('(.//' + _has_class('span', 'text') + ')[1]')
+        self._author = etree.XPath('(.//' + _has_class('small', 'author') + ')[1]')
+        self._tags = etree.XPath('.//' + _has_class('a', 'tag'))
+        self._first_link = etree.XPath('(.//a)[1]')
+        self._born_date = etree.XPath('(//' + _has_class('span', 'author-born-date') + ')[1]')
+        self._born_location = etree.XPath('(//' + _has_class('span', 'author-born-location') + ')[1]')
+        self._description = etree.XPath('(//' + _has_class('div', 'author-description') + ')[1]')
+
+    @staticmethod
+    def _document(html):
+        html = _XML_DECLARATION.sub('', _prepare(html), count=1)
+        return lxml.html.document_fromstring(html) if html.strip() else None
+
+    @staticmethod
+    def _first_text(xpath, node, default=None):
+        found = xpath(node)
+        return found[0].text_content().strip() if found else default
+
+    def parse_quotes(self, html, base_url):
+        """
+        Extrae los objetos Quote de una página del listado.
+
+        Args:
+            html (str): HTML de la página.
+            base_url (str): URL base a la que se añaden los enlaces a los autores.
+        """
+        document = self._document(html)
+        if document is None:
+            return []
+        quotes = []
+        for quote_div in self._quote_divs(document):
+            text = self._first_text(self._text, quote_div)
+            author = self._first_text(self._author, quote_div)
+            tags = [tag.text_content() for tag in self._tags(quote_div)]
+            author_about_link = base_url + self._first_link(quote_div)[0].attrib['href']
+            quotes.append(Quote(text, author, tags, author_about_link))
+        return quotes
+
+    def parse_author(self, html, name, about_link):
+        """Construye un objeto Author a partir del HTML de su página."""
+        document = self._document(html)
+        if document is None:
+            return Author(name, _format_about("Unknown", "Unknown", "No description available"), about_link)
+        born_date = self._first_text(self._born_date, document, "Unknown")
+        born_location = self._first_text(self._born_location, document, "Unknown")
+        description = self._first_text(self._description, document, "No description available")
+        return Author(name, _format_about(born_date, born_location, description), about_link)
+
+
+PARSERS = {
+    SoupParser.name: SoupParser,
+    LxmlParser.name: LxmlParser,
+}
+
+
+def get_parser(name='auto'):
+    """
+    Devuelve una instancia del parser indicado.
+
+    Args:
+        name (str): 'soup', 'lxml' o 'auto' (lxml si está instalado y, si no, soup).
+
+    Raises:
+        ValueError: Si el nombre del parser no existe.
+    """
+    if name == 'auto':
+        name = LxmlParser.name if lxml is not None else SoupParser.name
+    if name not in PARSERS:
+        raise ValueError(f"Parser HTML desconocido: {name}")
+    parser = PARSERS[name]()
+    logging.info(f"Usando el parser HTML '{name}'")
+    return parser
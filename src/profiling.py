@@ -0,0 +1,159 @@
+import os
+import time
+import cProfile
+import logging
+import threading
+import functools
+import asyncio
+
+'''
+En este archivo se define el modo de perfilado del pipeline (PROFILE=1 o --profile):
+- `profiled(scope)` marca las rutas críticas (Scraper.scrape_quotes, Scraper.scrape_authors,
+clean_data y Database.insert_data). Sin una sesión activa el decorador solo comprueba una
+variable global, por lo que el coste con el perfilado desactivado es despreciable.
+- `ProfilingSession` perfila con cProfile (perfil determinista) cada ámbito por separado,
+acumulando todas sus llamadas de la ejecución; al terminar guarda un fichero .prof por ámbito
+(legible con pstats o snakeviz) y resume en el log las funciones con más tiempo propio.
+Solo se perfila el hilo que abre la sesión; las descargas en los hilos del ThreadPoolExecutor
+aparecen como tiempo de espera del bucle de eventos.
+'''
+
+# Sesión de perfilado activa (None = perfilado desactivado)
+_session = None
+
+
+class ProfilingSession:
+    """
+    Sesión de perfilado de una ejecución.
+
+    Attributes:
+        run_name (str): Nombre de la ejecución ('main', 'update_database'...).
+        output_dir (str): Directorio base de los perfiles; cada sesión escribe en un subdirectorio propio.
+        top_n (int): Número de funciones resumidas en el log por ámbito.
+        sort (str): Criterio del resumen: 'tottime' (tiempo propio) o 'cumtime' (acumulado).
+        profiles (dict): {ámbito: cProfile.Profile} con las llamadas perfiladas.
+        timings (dict): {ámbito: [llamadas, segundos]} medidos por el decorador.
+    """
+    def __init__(self, run_name, output_dir, top_n=15, sort='tottime'):
+        self.run_name = run_name
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.sort = sort
+        self.profiles = {}
+        self.timings = {}
+        self._active = None
+        self._thread = None
+
+    def start(self):
+        global _session
+        self._thread = threading.get_ident()
+        _session = self
+        logging.info(f"Perfilado activado para la ejecución {self.run_name}")
+        return self
+
+    def stop(self):
+        """Desactiva la sesión, guarda los perfiles y escribe el resumen en el log."""
+        global _session
+        if _session is self:
+            _session = None
+        return self.report()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def begin(self, scope):
+        """Empieza a perfilar `scope`; devuelve False si no procede (otro hilo u otro ámbito activo)."""
+        if self._active is not None or threading.get_ident() != self._thread:
+            return False
+        profile = self.profiles.get(scope)
+        if profile is None:
+            profile = self.profiles[scope] = cProfile.Profile()
+        self._active = (scope, time.perf_counter())
+        profile.enable()
+        return True
+
+    def end(self, scope):
+        self.profiles[scope].disable()
+        _, start = self._active
+        self._active = None
+        timing = self.timings.setdefault(scope, [0, 0.0])
+        timing[0] += 1
+        timing[1] += time.perf_counter() - start
+
+    def hotspots(self, scope):
+        """
+        Devuelve las `top_n` funciones de un ámbito ordenadas por `sort`.
+
+        Returns:
+            list: Diccionarios con function, calls, tottime y cumtime.
+        """
+        self.profiles[scope].create_stats()
+        rows = []
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in self.profiles[scope].stats.items():
+            location = f"{os.path.basename(filename)}:{line}" if line else filename
+            rows.append({'function': f"{name} ({location})", 'calls': calls,
+                         'tottime': round(tottime, 6), 'cumtime': round(cumtime, 6)})
+        rows.sort(key=lambda row: row[self.sort], reverse=True)
+        return rows[:self.top_n]
+
+    def report(self):
+        """
+        Guarda un fichero .prof por ámbito y resume los puntos calientes en el log.
+
+        Returns:
+            dict: {ámbito: ruta del fichero .prof}
+        """
+        if not self.profiles:
+            return {}
+        directory = os.path.join(self.output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.run_name}-{os.getpid()}")
+        os.makedirs(directory, exist_ok=True)
+        paths = {}
+        for scope, profile in self.profiles.items():
+            paths[scope] = os.path.join(directory, f"{scope}.prof")
+            profile.dump_stats(paths[scope])
+            calls, seconds = self.timings.get(scope, (0, 0.0))
+            lines = [f"{row['cumtime']:9.4f} {row['tottime']:9.4f} {row['calls']:8d}  {row['function']}"
+                     for row in self.hotspots(scope)]
+            logging.info(
+                f"Perfil de {scope}: {calls} llamadas, {seconds:.3f} s ({paths[scope]})\n"
+                f"  cumtime   tottime    calls  función\n" + '\n'.join(lines)
+            )
+        return paths
+
+
+def start_session(run_name, enabled=False, output_dir='profiles', top_n=15, sort='tottime'):
+    """Abre y activa una sesión de perfilado si `enabled` (ver PROFILE_CONFIG); si no, devuelve None."""
+    if not enabled:
+        return None
+    return ProfilingSession(run_name, output_dir, top_n=top_n, sort=sort).start()
+
+
+def profiled(scope):
+    """Decorador que perfila la función (síncrona o asíncrona) dentro de la sesión activa."""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                session = _session
+                if session is None or not session.begin(scope):
+                    return await func(*args, **kwargs)
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    session.end(scope)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            session = _session
+            if session is None or not session.begin(scope):
+                return func(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                session.end(scope)
+        return wrapper
+    return decorator
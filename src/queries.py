@@ -0,0 +1,164 @@
+from collections import namedtuple
+
+'''
+En este archivo se define la capa de acceso a datos de la aplicación Streamlit:
+- Cada función resuelve una vista completa con una sola consulta (Frase + autor + etiquetas),
+en lugar de una consulta por Frase.
+- Los listados se paginan en SQL con LIMIT / OFFSET.
+- Las consultas usan el marcador de parámetros del backend (MySQL o SQLite).
+'''
+
+# Frase con su autor y sus etiquetas [(id, nombre), ...]
+QuoteView = namedtuple('QuoteView', ['id', 'text', 'author_id', 'author_name', 'about_link', 'tags'])
+
+
+def _quotes_with_tags_query(source):
+    """
+    Consulta que une un conjunto de Frases (`source`, una subconsulta con las columnas
+    id, text y author_id) con su autor y sus etiquetas, una fila por etiqueta.
+    """
+    return f"""
+        SELECT q.id, q.text, q.author_id, authors.name, authors.about_link, tags.id, tags.name
+        FROM ({source}) q
+        LEFT JOIN authors ON authors.id = q.author_id
+        LEFT JOIN quote_tags ON quote_tags.quote_id = q.id
+        LEFT JOIN tags ON tags.id = quote_tags.tag_id
+    """
+
+
+def _group_quote_rows(rows):
+    """Agrupa las filas (una por etiqueta) en objetos QuoteView, conservando el orden."""
+    quotes = {}
+    for quote_id, text, author_id, author_name, about_link, tag_id, tag_name in rows:
+        quote = quotes.get(quote_id)
+        if quote is None:
+            quote = quotes[quote_id] = QuoteView(quote_id, text, author_id, author_name, about_link, [])
+        if tag_id is not None:
+            quote.tags.append((tag_id, tag_name))
+    return list(quotes.values())
+
+
+def count_quotes(db):
+    """Devuelve el número total de Frases."""
+    row = db.fetch_one("SELECT COUNT(*) FROM quotes")
+    return row[0] if row else 0
+
+
+def count_authors(db):
+    """Devuelve el número total de autores."""
+    row = db.fetch_one("SELECT COUNT(*) FROM authors")
+    return row[0] if row else 0
+
+
+def fetch_quotes_page(db, page, per_page):
+    """
+    Devuelve una página de Frases con su autor y etiquetas en una sola consulta.
+
+    Args:
+        db (Database): Base de datos.
+        page (int): Número de página, empezando en 1.
+        per_page (int): Frases por página.
+
+    Returns:
+        list: Objetos QuoteView ordenados por ID.
+    """
+    p = db.placeholder
+    query = _quotes_with_tags_query(
+        f"SELECT id, text, author_id FROM quotes ORDER BY id LIMIT {p} OFFSET {p}"
+    ) + " ORDER BY q.id, tags.name"
+    return _group_quote_rows(db.fetch_all(query, (per_page, (page - 1) * per_page)))
+
+
+def fetch_quote(db, quote_id):
+    """Devuelve una Frase con su autor y etiquetas, o None si no existe."""
+    query = _quotes_with_tags_query(
+        f"SELECT id, text, author_id FROM quotes WHERE id = {db.placeholder}"
+    ) + " ORDER BY tags.name"
+    quotes = _group_quote_rows(db.fetch_all(query, (quote_id,)))
+    return quotes[0] if quotes else None
+
+
+def fetch_quotes_by_tag(db, tag_id):
+    """Devuelve las Frases de una etiqueta con el nombre de su autor: [(id, texto, autor), ...]."""
+    query = f"""
+        SELECT quotes.id, quotes.text, authors.name FROM quote_tags
+        JOIN quotes ON quotes.id = quote_tags.quote_id
+        LEFT JOIN authors ON authors.id = quotes.author_id
+        WHERE quote_tags.tag_id = {db.placeholder}
+        ORDER BY quotes.id
+    """
+    return db.fetch_all(query, (tag_id,))
+
+
+def fetch_top_quotes(db, limit=5):
+    """Devuelve las últimas Frases insertadas con el nombre de su autor: [(id, texto, autor), ...]."""
+    query = f"""
+        SELECT quotes.id, quotes.text, authors.name FROM quotes
+        LEFT JOIN authors ON authors.id = quotes.author_id
+        ORDER BY quotes.id DESC
+        LIMIT {db.placeholder}
+    """
+    return db.fetch_all(query, (limit,))
+
+
+def fetch_authors_page(db, page, per_page):
+    """Devuelve una página de autores ordenados por ID: [(id, nombre, about, about_link), ...]."""
+    p = db.placeholder
+    return db.fetch_all(
+        f"SELECT id, name, about, about_link FROM authors ORDER BY id LIMIT {p} OFFSET {p}",
+        (per_page, (page - 1) * per_page)
+    )
+
+
+def fetch_author(db, author_id):
+    """Devuelve un autor (id, nombre, about, about_link) o None si no existe."""
+    return db.fetch_one(
+        f"SELECT id, name, about, about_link FROM authors WHERE id = {db.placeholder}", (author_id,)
+    )
+
+
+def fetch_quotes_by_author(db, author_id):
+    """Devuelve las Frases de un autor: [(id, texto), ...]."""
+    return db.fetch_all(
+        f"SELECT id, text FROM quotes WHERE author_id = {db.placeholder} ORDER BY id", (author_id,)
+    )
+
+
+def fetch_top_authors(db, limit=5):
+    """
+    Devuelve los autores con más Frases: [(id, nombre, número de Frases), ...].
+    Lee los contadores precalculados de `author_stats` por su índice.
+    """
+    query = f"""
+        SELECT authors.id, authors.name, author_stats.quote_count
+        FROM author_stats
+        JOIN authors ON authors.id = author_stats.author_id
+        ORDER BY author_stats.quote_count DESC, author_stats.author_id DESC
+        LIMIT {db.placeholder}
+    """
+    return db.fetch_all(query, (limit,))
+
+
+def fetch_top_tags(db, limit=5):
+    """
+    Devuelve las etiquetas más usadas: [(id, nombre, número de usos), ...].
+    Lee los contadores precalculados de `tag_stats` por su índice.
+    """
+    query = f"""
+        SELECT tags.id, tags.name, tag_stats.usage_count
+        FROM tag_stats
+        JOIN tags ON tags.id = tag_stats.tag_id
+        ORDER BY tag_stats.usage_count DESC, tag_stats.tag_id DESC
+        LIMIT {db.placeholder}
+    """
+    return db.fetch_all(query, (limit,))
+
+
+def search_quotes(db, text, limit=20):
+    """Busca Frases por su texto, ordenadas por relevancia: [(id, texto, autor), ...]."""
+    return db.search_index.search_quotes(text, limit)
+
+
+def search_authors(db, text, limit=20):
+    """Busca autores por su nombre y biografía, ordenados por relevancia: [(id, nombre, about_link), ...]."""
+    return db.search_index.search_authors(text, limit)
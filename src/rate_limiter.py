@@ -0,0 +1,215 @@
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+'''
+En este archivo se define el limitador de peticiones adaptativo del scraper, uno por host:
+- Un cubo de fichas limita las peticiones por segundo (con ráfagas de hasta `burst` peticiones).
+- Una ventana de concurrencia limita las peticiones en vuelo.
+- Ambos siguen un control AIMD (aumento aditivo, disminución multiplicativa): cada respuesta
+correcta con latencia por debajo de `latency_target` sube un poco el ritmo y la ventana; un 429,
+un 5xx o un error de red los reduce a la mitad (como mucho una vez cada `cooldown` segundos,
+para que una ráfaga de errores simultáneos no los hunda).
+- La cabecera Retry-After (en segundos o como fecha HTTP) detiene todas las peticiones al host
+hasta el instante indicado.
+Así el scraper encuentra solo el ritmo máximo que el servidor tolera sin ajustes manuales.
+'''
+
+# Respuestas con las que el servidor pide reducir el ritmo; se reintentan tras esperar
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+def parse_retry_after(value):
+    """
+    Interpreta la cabecera Retry-After.
+
+    Returns:
+        float: Segundos de espera, o None si la cabecera falta o no es válida.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    Cubo de fichas. No es seguro entre hilos por sí mismo: lo protege AdaptiveLimiter.
+
+    Attributes:
+        rate (float): Fichas que se reponen por segundo.
+        burst (float): Capacidad del cubo.
+        tokens (float): Fichas disponibles; negativo si hay reservas pendientes.
+    """
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self, now):
+        """Toma una ficha y devuelve los segundos que hay que esperar hasta que esté disponible."""
+        self._refill(now)
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def set_rate(self, rate, now):
+        self._refill(now)
+        self.rate = rate
+
+
+class AdaptiveLimiter:
+    """
+    Limitador AIMD de las peticiones a un host.
+
+    Attributes:
+        rate (float): Peticiones por segundo permitidas actualmente.
+        limit (float): Peticiones en vuelo permitidas actualmente (se usa su parte entera).
+        in_flight (int): Peticiones en curso.
+        blocked_until (float): Instante (reloj monotónico) hasta el que el servidor ha pedido esperar.
+    """
+    def __init__(self, rate=5.0, burst=5, min_rate=0.5, max_rate=50.0, concurrency=2, max_concurrency=16,
+                 latency_target=1.0, increase=0.2, decrease=0.5, cooldown=1.0, max_retry_after=60.0,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.bucket = TokenBucket(rate, burst, clock())
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.limit = float(concurrency)
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.max_retry_after = max_retry_after
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self._last_decrease = None
+        self._cond = threading.Condition()
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self.decreases = 0
+        self.wait_time = 0.0
+
+    @property
+    def rate(self):
+        return self.bucket.rate
+
+    def acquire(self):
+        """Espera a que haya hueco en la ventana de concurrencia, a que pase el Retry-After y a tener ficha."""
+        with self._cond:
+            while self.in_flight >= max(1, int(self.limit)):
+                self._cond.wait()
+            self.in_flight += 1
+            now = self.clock()
+            delay = max(0.0, self.blocked_until - now) + self.bucket.reserve(now)
+            self.wait_time += delay
+        if delay > 0:
+            self.sleep(delay)
+
+    def release(self, status, latency, retry_after=None):
+        """
+        Registra el resultado de una petición y ajusta el ritmo y la ventana.
+
+        Args:
+            status (int): Código de estado HTTP (None si la petición ha fallado sin respuesta).
+            latency (float): Duración de la petición en segundos.
+            retry_after (float): Segundos indicados por la cabecera Retry-After, si la hay.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            self.requests += 1
+            now = self.clock()
+            if status is None or status in THROTTLE_STATUSES or status >= 500:
+                if status in THROTTLE_STATUSES:
+                    self.throttled += 1
+                else:
+                    self.errors += 1
+                if retry_after is not None:
+                    self.blocked_until = max(self.blocked_until, now + min(retry_after, self.max_retry_after))
+                self._back_off(now, status)
+            elif latency <= self.latency_target:
+                # Aumento aditivo: la ventana crece en una petición por cada ventana completa de respuestas
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+                self.bucket.set_rate(min(self.max_rate, self.rate + self.increase), now)
+            self._cond.notify_all()
+
+    def _back_off(self, now, status):
+        if self._last_decrease is not None and now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.decreases += 1
+        self.limit = max(1.0, self.limit * self.decrease)
+        self.bucket.set_rate(max(self.min_rate, self.rate * self.decrease), now)
+        logging.warning(
+            f"Limitador: respuesta {status}; ritmo reducido a {self.rate:.2f} peticiones/s "
+            f"y {int(self.limit)} peticiones simultáneas"
+        )
+
+    def stats(self):
+        with self._cond:
+            return {
+                'rate': round(self.rate, 2),
+                'concurrency': int(self.limit),
+                'requests': self.requests,
+                'throttled': self.throttled,
+                'errors': self.errors,
+                'decreases': self.decreases,
+                'wait_time': round(self.wait_time, 3),
+            }
+
+
+class HostRateLimiter:
+    """
+    Conjunto de limitadores adaptativos, uno por host.
+
+    Attributes:
+        retries (int): Reintentos de una petición rechazada con 429 o 503.
+        options (dict): Parámetros de cada AdaptiveLimiter (ver RATE_LIMIT_CONFIG).
+    """
+    def __init__(self, retries=3, **options):
+        self.retries = retries
+        self.options = options
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url):
+        """Devuelve el limitador del host de `url`, creándolo si no existe."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = AdaptiveLimiter(**self.options)
+            return limiter
+
+    def stats(self):
+        """Devuelve el estado de los limitadores: {host: estadísticas}."""
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {host: limiter.stats() for host, limiter in limiters.items()}
+
+
+def create_rate_limiter(config):
+    """Crea el limitador del scraper a partir de RATE_LIMIT_CONFIG (None si está desactivado)."""
+    options = dict(config)
+    if not options.pop('enabled', True):
+        return None
+    return HostRateLimiter(**options)
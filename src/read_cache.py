@@ -0,0 +1,88 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+'''
+En este archivo se define la caché de lecturas de la aplicación Streamlit:
+- Guarda el resultado de las funciones de consulta con un TTL y un número máximo de entradas (LRU).
+- Se invalida por completo cuando cambia la versión de datos que incrementa el proceso de
+actualización tras cada inserción, de modo que nunca se sirven datos anteriores a una actualización.
+'''
+
+
+class ReadCache:
+    """
+    Caché LRU con TTL e invalidación por versión de datos.
+
+    Attributes:
+        ttl (float): Segundos de validez de cada entrada.
+        maxsize (int): Número máximo de entradas.
+        version: Versión de datos a la que corresponden las entradas actuales.
+        hits (int): Consultas servidas desde la caché.
+        misses (int): Consultas que se han tenido que ejecutar.
+        invalidations (int): Veces que la caché se ha vaciado por un cambio de versión.
+    """
+    def __init__(self, ttl, maxsize):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def set_version(self, version):
+        """Registra la versión de datos actual y vacía la caché si ha cambiado."""
+        with self._lock:
+            if version != self.version:
+                if self.version is not None:
+                    self.invalidations += 1
+                self._entries.clear()
+                self.version = version
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_load(self, key, loader):
+        """Devuelve el valor de `key` o lo calcula con `loader()` y lo guarda."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            version = self.version
+        value = loader()
+        with self._lock:
+            # Si la versión ha cambiado mientras se cargaba, el valor puede estar obsoleto
+            if version == self.version:
+                self._entries[key] = (now + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def cached(self, func):
+        """Decorador que cachea `func` según su nombre y sus argumentos."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            return self.get_or_load(key, lambda: func(*args, **kwargs))
+        return wrapper
+
+    def stats(self):
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'version': self.version,
+        }
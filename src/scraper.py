@@ -1,7 +1,27 @@
+import asyncio
+import hashlib
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from bs4 import BeautifulSoup
 import logging
-from .models import Quote, Author
+from config.config import HTTP_CONFIG, PARSER_BACKEND
+from .author_store import canonical_link
+from .http_client import create_session, connection_stats
+from . import metrics
+from .profiling import profiled
+from .rate_limiter import THROTTLE_STATUSES, parse_retry_after
+from .models import Quote, Author, PageFingerprint, quotes_fingerprint
+from .parsers import get_parser
+
+# Página descargada. `not_modified` indica que el cuerpo procede de la caché tras un 304
+# y `payload` contiene el resultado parseado guardado en la caché, si lo hay.
+Page = namedtuple('Page', ['url', 'status_code', 'text', 'not_modified', 'payload'])
+
+
+class BudgetExceededError(Exception):
+    """Se ha agotado el presupuesto de tiempo de la ejecución."""
+
 
 class Scraper:
     """
@@ -9,15 +29,346 @@ class Scraper:
 
     Attributes:
         url (str): La URL base del sitio web a scrapear.
+        concurrency (int): Número máximo de peticiones simultáneas en el modo asíncrono.
+        session (requests.Session): Sesión HTTP con pool de conexiones usada para todas las peticiones.
+        timeout (tuple): Timeouts de conexión y lectura de cada petición.
+        author_store (AuthorStore): Almacén persistente de biografías de autores (opcional);
+            se cierra junto con el scraper.
+        cache (ResponseCache): Caché HTTP condicional (opcional); se cierra junto con el scraper.
+        parser: Parser HTML usado para extraer Frases y autores (ver src/parsers.py).
+        rate_limiter (HostRateLimiter): Limitador adaptativo de peticiones por host (opcional);
+            con él, las respuestas 429 y 503 se reintentan tras el Retry-After en lugar de en urllib3.
+        frontier (CrawlFrontier): Frontera persistente del recorrido (opcional); con ella las
+            páginas ya procesadas se sirven sin descargarlas y un autor que falla se registra
+            para reintentarlo en lugar de abortar la extracción. Se cierra junto con el scraper.
+        deadline (float): Instante (time.monotonic) a partir del cual no se piden más páginas
+            y se lanza BudgetExceededError (None = sin límite).
+        pages_fetched (int): Páginas pedidas al servidor (listado y biografías).
         quotes (list): Lista de objetos Quote extraídos.
         authors (dict): Diccionario de objetos Author extraídos.
     """
-    def __init__(self, url):
+    def __init__(self, url, concurrency=1, session=None, http_config=None, author_store=None, cache=None, parser=None,
+                 rate_limiter=None, frontier=None):
         self.url = url
+        self.concurrency = max(1, int(concurrency))
+        http_config = http_config or HTTP_CONFIG
+        self.rate_limiter = rate_limiter
+        if rate_limiter is not None:
+            # Los 429 y 503 los gestiona el limitador, que necesita verlos para reducir el ritmo
+            http_config = dict(http_config, status_forcelist=[
+                status for status in http_config['status_forcelist'] if status not in THROTTLE_STATUSES
+            ])
+        self._owns_session = session is None
+        self.session = session or create_session(http_config, pool_maxsize=self.concurrency)
+        self.timeout = (http_config['connect_timeout'], http_config['read_timeout'])
+        self.author_store = author_store
+        self.cache = cache
+        self.parser = parser or get_parser(PARSER_BACKEND)
+        self.frontier = frontier
+        self.deadline = None
+        self.pages_fetched = 0
         self.quotes = []
         self.authors = {}
         logging.info(f"Scraper inicializado con URL: {url}")
-    
+
+    def _get(self, url, headers=None):
+        """
+        Realiza una petición GET a la URL indicada usando la sesión compartida y mide su latencia.
+
+        Con `rate_limiter`, espera el turno del host antes de cada intento y reintenta hasta
+        `rate_limiter.retries` veces las respuestas 429 y 503.
+        """
+        limiter = self.rate_limiter.for_url(url) if self.rate_limiter is not None else None
+        attempt = 0
+        while True:
+            if limiter is not None:
+                limiter.acquire()
+            start = time.perf_counter()
+            response = None
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            finally:
+                latency = time.perf_counter() - start
+                status = response.status_code if response is not None else None
+                metrics.HTTP_REQUEST_SECONDS.observe(latency, status=status or 'error')
+                if limiter is not None:
+                    retry_after = parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+                    limiter.release(status, latency, retry_after)
+            if limiter is None or status not in THROTTLE_STATUSES or attempt >= self.rate_limiter.retries:
+                return response
+            attempt += 1
+            metrics.HTTP_THROTTLED.inc(status=status)
+            logging.warning(f"Respuesta {status} en {url}: reintento {attempt} de {self.rate_limiter.retries}")
+
+    def _get_page(self, url):
+        """
+        Descarga una página, revalidándola con la caché HTTP si está disponible.
+
+        Returns:
+            Page: Página descargada, servida desde la caché tras un 304 o, si ya se procesó
+            en un recorrido interrumpido, servida desde la frontera con su resultado parseado.
+
+        Raises:
+            BudgetExceededError: Si se ha superado `deadline`.
+        """
+        if self.frontier is not None:
+            payload = self.frontier.get_done(url)
+            if payload is not None:
+                return Page(url, 200, '', True, payload)
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise BudgetExceededError(f"Presupuesto de tiempo agotado antes de pedir {url}")
+        self.pages_fetched += 1
+        entry = self.cache.get(url) if self.cache is not None else None
+        headers = entry.conditional_headers() if entry else {}
+        response = self._get(url, headers=headers)
+        if self.rate_limiter is not None and response.status_code in THROTTLE_STATUSES:
+            # Agotados los reintentos: no confundir la limitación con el final del listado
+            raise requests.HTTPError(f"{response.status_code} Error for url: {url} (reintentos agotados)")
+        if self.cache is None:
+            return Page(url, response.status_code, response.text, False, None)
+        if response.status_code == 304 and entry:
+            self.cache.record_hit()
+            return Page(url, 200, entry.body, True, entry.payload)
+        if response.status_code == 200:
+            self.cache.put(url, response.headers, response.text)
+        return Page(url, response.status_code, response.text, False, None)
+
+    def _raise_for_status(self, page):
+        """Lanza HTTPError si la página no se ha descargado correctamente."""
+        if page.status_code >= 400:
+            raise requests.HTTPError(f"{page.status_code} Error for url: {page.url}")
+
+    def _page_quotes(self, page):
+        """Devuelve las Frases de una página del listado, sin parsearla si no ha cambiado."""
+        if page.not_modified and page.payload is not None:
+            payload = page.payload
+            quotes = [Quote(*fields) for fields in payload]
+        else:
+            quotes = self._parse_quotes(page.text)
+            payload = [[q.text, q.author, list(q.tags), q.author_about_link] for q in quotes]
+            if self.cache is not None:
+                self.cache.set_payload(page.url, payload)
+        if self.frontier is not None:
+            self.frontier.mark_done(page.url, 'listing', payload)
+        return quotes
+
+    def _page_author(self, page, name, about_link):
+        """Devuelve el autor de una página de biografía, sin parsearla si no ha cambiado."""
+        if page.not_modified and page.payload is not None:
+            author = Author(name, page.payload, about_link)
+        else:
+            author = self._parse_author(page.text, name, about_link)
+            if self.cache is not None:
+                self.cache.set_payload(page.url, author.about)
+        if self.frontier is not None:
+            self.frontier.mark_done(page.url, 'author', author.about)
+        return author
+
+    def _record_failure(self, about_link, name, error):
+        """
+        Registra en la frontera el fallo de la página de un autor.
+
+        Returns:
+            bool: True si el fallo queda registrado para reintentarlo (hay frontera), False si hay que propagarlo.
+        """
+        if self.frontier is None:
+            return False
+        attempts = self.frontier.mark_failed(about_link, 'author', str(error))
+        logging.warning(f"Autor {name} omitido tras {attempts} intentos fallidos; se reintentará según la política de reintentos")
+        return True
+
+    def _fetchable_authors(self, pending):
+        """Filtra los autores pendientes [(about_link, nombres)] a los que la frontera permite pedir ahora."""
+        if self.frontier is None:
+            return pending
+        self.frontier.enqueue([about_link for about_link, _ in pending], 'author')
+        return [(about_link, names) for about_link, names in pending if self.frontier.should_fetch(about_link)]
+
+    def connection_stats(self):
+        """Devuelve los contadores de reutilización de conexiones de la sesión, si están disponibles."""
+        return connection_stats(self.session, self.url)
+
+    def close(self):
+        """Cierra la sesión HTTP si la ha creado el propio scraper."""
+        stats = self.connection_stats()
+        if stats:
+            logging.info(f"Estadísticas de conexiones HTTP: {stats}")
+        if self.rate_limiter is not None:
+            logging.info(f"Estadísticas del limitador de peticiones: {self.rate_limiter.stats()}")
+        if self._owns_session:
+            self.session.close()
+        if self.author_store:
+            self.author_store.close()
+        if self.cache:
+            self.cache.close()
+        if self.frontier:
+            self.frontier.close()
+
+    def _page_url(self, page):
+        """Devuelve la URL de una página del listado de Frases."""
+        return f"{self.url}/page/{page}/"
+
+    def _parse_quotes(self, html):
+        """Extrae los objetos Quote del HTML de una página del listado."""
+        with metrics.PARSE_SECONDS.time(page='quotes'):
+            return self.parser.parse_quotes(html, self.url)
+
+    def _parse_author(self, html, name, about_link):
+        """Construye un objeto Author a partir del HTML de su página."""
+        with metrics.PARSE_SECONDS.time(page='author'):
+            return self.parser.parse_author(html, name, about_link)
+
+    def _pending_authors(self, quotes=None):
+        """
+        Agrupa por enlace canónico los autores de las Frases (por defecto `self.quotes`) que aún no se han extraído.
+
+        Returns:
+            dict: {enlace canónico: (about_link, [nombres])} en orden de aparición. Las
+            variantes de nombre que comparten enlace se descargan una sola vez.
+        """
+        pending = {}
+        for quote in self.quotes if quotes is None else quotes:
+            if quote.author in self.authors:
+                continue
+            about_link, names = pending.setdefault(canonical_link(quote.author_about_link), (quote.author_about_link, []))
+            if quote.author not in names:
+                names.append(quote.author)
+        return pending
+
+    def _stored_about(self, about_link):
+        """Devuelve la biografía vigente del almacén de autores, si lo hay."""
+        if self.author_store is None:
+            return None
+        return self.author_store.get(about_link)
+
+    def _store_author(self, author):
+        """Guarda la biografía descargada de un autor en el almacén."""
+        if self.author_store is not None:
+            self.author_store.put(author.about_link, author.about)
+
+    def _add_authors(self, about, about_link, names):
+        """Registra un objeto Author por cada variante de nombre que comparte biografía y los devuelve."""
+        added = {}
+        for name in names:
+            added[name] = self.authors[name] = Author(name, about, about_link)
+        return added
+
+    def iter_quote_pages(self):
+        """
+        Recorre el listado de Frases página a página.
+
+        Yields:
+            list: Objetos Quote de cada página, en orden. No se acumulan en `self.quotes`.
+        """
+        page = 1
+        while True:
+            response = self._get_page(self._page_url(page))
+            if response.status_code != 200:
+                logging.warning(f"Finalizada la extracción de Frases en la página {page}. Código de estado: {response.status_code}")
+                return
+            quotes = self._page_quotes(response)
+            if not quotes:
+                logging.info(f"No se encontraron más Frases en la página {page}")
+                return
+            yield quotes
+            page += 1
+
+    def fetch_authors(self, quotes):
+        """
+        Extrae los autores de `quotes` que aún no se han extraído.
+
+        Args:
+            quotes (list): Objetos Quote cuyos autores se necesitan.
+
+        Returns:
+            dict: Objetos Author nuevos, indexados por nombre.
+
+        Raises:
+            RequestException: Si hay un problema al acceder a la página de un autor.
+            Exception: Para cualquier otro error inesperado.
+        """
+        added = {}
+        for about_link, names in self._fetchable_authors(list(self._pending_authors(quotes).values())):
+            about = self._stored_about(about_link)
+            if about is None:
+                try:
+                    response = self._get_page(about_link)
+                    self._raise_for_status(response)
+                    author = self._page_author(response, names[0], about_link)
+                except requests.RequestException as e:
+                    logging.error(f"Error en la solicitud HTTP al extraer información del autor {names[0]}: {e}")
+                    if self._record_failure(about_link, names[0], e):
+                        continue
+                    raise
+                except Exception as e:
+                    logging.error(f"Error inesperado al extraer información del autor {names[0]}: {e}")
+                    raise
+                self._store_author(author)
+                about = author.about
+            added.update(self._add_authors(about, about_link, names))
+        return added
+
+    def iter_pages(self):
+        """
+        Recorre el sitio en modo streaming.
+
+        Yields:
+            tuple: (Frases de la página, autores nuevos que aparecen en ella), sin
+            acumular las Frases en memoria.
+        """
+        logging.info(f"Iniciando scrape en streaming desde {self.url}")
+        for quotes in self.iter_quote_pages():
+            yield quotes, self.fetch_authors(quotes)
+
+    def iter_changed_pages(self, known, stop_after=1):
+        """
+        Recorre el listado en modo incremental, comparando cada página con su huella guardada.
+
+        - Si el HTML no ha cambiado, la página no se parsea.
+        - Si el HTML ha cambiado pero el conjunto de Frases no, se devuelve solo la huella
+          nueva (sin Frases), para no volver a parsearla en la siguiente ejecución.
+        - Si han cambiado las Frases, se devuelven junto con sus autores nuevos.
+        El recorrido termina en la primera página sin Frases o tras `stop_after` páginas
+        seguidas sin cambios (0 recorre siempre todo el listado).
+
+        Args:
+            known (dict): Huellas guardadas {url: PageFingerprint}.
+            stop_after (int): Páginas sin cambios seguidas tras las que se detiene.
+
+        Yields:
+            tuple: (PageFingerprint, Frases de la página, autores nuevos) de las páginas modificadas.
+        """
+        logging.info(f"Iniciando scrape incremental desde {self.url} ({len(known)} páginas conocidas)")
+        page = 1
+        unchanged_run = 0
+        while True:
+            url = self._page_url(page)
+            response = self._get_page(url)
+            if response.status_code != 200:
+                logging.warning(f"Finalizada la extracción de Frases en la página {page}. Código de estado: {response.status_code}")
+                return
+            previous = known.get(url)
+            body_hash = hashlib.sha256(response.text.encode('utf-8')).hexdigest()
+            if previous is not None and previous.body_hash == body_hash:
+                unchanged_run += 1
+            else:
+                quotes = self._page_quotes(response)
+                if not quotes:
+                    logging.info(f"No se encontraron más Frases en la página {page}")
+                    return
+                fingerprint = PageFingerprint(url, body_hash, quotes_fingerprint(quotes), len(quotes))
+                if previous is not None and previous.quotes_hash == fingerprint.quotes_hash:
+                    unchanged_run += 1
+                    yield fingerprint, [], {}
+                else:
+                    unchanged_run = 0
+                    yield fingerprint, quotes, self.fetch_authors(quotes)
+            if stop_after and unchanged_run >= stop_after:
+                logging.info(f"Extracción incremental detenida en la página {page}: {unchanged_run} páginas sin cambios")
+                return
+            page += 1
+
+    @profiled('scrape_quotes')
     def scrape_quotes(self):
         """
         Extrae todas las Frases de la página principal.
@@ -27,24 +378,8 @@ class Scraper:
         """
         try:
             logging.info(f"Iniciando scrape de Frases desde {self.url}")
-            page = 1
-            while True:
-                response = requests.get(f"{self.url}/page/{page}/")
-                if response.status_code != 200:
-                    logging.warning(f"Finalizada la extracción de Frases en la página {page}. Código de estado: {response.status_code}")
-                    break
-                soup = BeautifulSoup(response.text, 'html.parser')
-                quote_divs = soup.find_all('div', class_='quote')
-                if not quote_divs:
-                    logging.info(f"No se encontraron más Frases en la página {page}")
-                    break
-                for quote_div in quote_divs:
-                    text = quote_div.find('span', class_='text').text.strip()
-                    author = quote_div.find('small', class_='author').text.strip()
-                    tags = [tag.text for tag in quote_div.find_all('a', class_='tag')]
-                    author_about_link = self.url + quote_div.find('a')['href']
-                    self.quotes.append(Quote(text, author, tags, author_about_link))
-                page += 1
+            for quotes in self.iter_quote_pages():
+                self.quotes.extend(quotes)
             logging.info(f"Se han extraído {len(self.quotes)} Frases con éxito")
         except requests.RequestException as e:
             logging.error(f"Error en la solicitud HTTP al extraer Frases: {e}")
@@ -53,6 +388,7 @@ class Scraper:
             logging.error(f"Error inesperado al extraer Frases: {e}")
             raise
 
+    @profiled('scrape_authors')
     def scrape_authors(self):
         """
         Extrae la información de los autores de las Frases.
@@ -60,33 +396,129 @@ class Scraper:
         Raises:
             RequestException: Si hay un problema al acceder a la página de un autor.
             Exception: Para cualquier otro error inesperado.
-        """ 
+        """
         try:
             logging.info("Iniciando extracción de información de autores")
-            for quote in self.quotes:
-                if quote.author not in self.authors:
-                    try:
-                        response = requests.get(quote.author_about_link)
-                        response.raise_for_status()
-                        soup = BeautifulSoup(response.text, 'html.parser')
-                        
-                        name = quote.author
-                        born_date = soup.find('span', class_='author-born-date')
-                        born_date = born_date.text.strip() if born_date else "Unknown"
-                        born_location = soup.find('span', class_='author-born-location')
-                        born_location = born_location.text.strip() if born_location else "Unknown"
-                        description = soup.find('div', class_='author-description')
-                        description = description.text.strip() if description else "No description available"
-                        
-                        about = f"Born: {born_date} in {born_location}\n\n{description}"
-                        self.authors[quote.author] = Author(name, about, quote.author_about_link)
-                    except requests.RequestException as e:
-                        logging.error(f"Error en la solicitud HTTP al extraer información del autor {quote.author}: {e}")
-                        raise
-                    except Exception as e:
-                        logging.error(f"Error inesperado al extraer información del autor {quote.author}: {e}")
-                        raise
+            self.fetch_authors(self.quotes)
+            logging.info(f"Se han extraído {len(self.authors)} autores con éxito")
+        except Exception as e:
+            logging.error(f"Error extrayendo autores: {e}")
+            raise
+
+    @profiled('scrape_quotes')
+    async def scrape_quotes_async(self):
+        """
+        Versión asíncrona de scrape_quotes.
+
+        Mantiene una ventana de `concurrency` páginas del listado solicitadas por
+        adelantado y las procesa en orden, de modo que el resultado es idéntico
+        al de la versión secuencial. Las peticiones especulativas que quedan
+        más allá de la última página se cancelan.
+
+        Raises:
+            Exception: Si ocurre un error durante el scraping.
+        """
+        loop = asyncio.get_running_loop()
+        pending = {}
+        next_page = 1
+
+        def schedule(executor):
+            nonlocal next_page
+            pending[next_page] = loop.run_in_executor(executor, self._get_page, self._page_url(next_page))
+            next_page += 1
+
+        try:
+            logging.info(f"Iniciando scrape asíncrono de Frases desde {self.url} (concurrencia {self.concurrency})")
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                for _ in range(self.concurrency):
+                    schedule(executor)
+                page = 1
+                try:
+                    while True:
+                        response = await pending.pop(page)
+                        if response.status_code != 200:
+                            logging.warning(f"Finalizada la extracción de Frases en la página {page}. Código de estado: {response.status_code}")
+                            break
+                        quotes = self._page_quotes(response)
+                        if not quotes:
+                            logging.info(f"No se encontraron más Frases en la página {page}")
+                            break
+                        self.quotes.extend(quotes)
+                        schedule(executor)
+                        page += 1
+                finally:
+                    for future in pending.values():
+                        future.cancel()
+                    await asyncio.gather(*pending.values(), return_exceptions=True)
+            logging.info(f"Se han extraído {len(self.quotes)} Frases con éxito")
+        except requests.RequestException as e:
+            logging.error(f"Error en la solicitud HTTP al extraer Frases: {e}")
+            raise
+        except Exception as e:
+            logging.error(f"Error inesperado al extraer Frases: {e}")
+            raise
+
+    @profiled('scrape_authors')
+    async def scrape_authors_async(self):
+        """
+        Versión asíncrona de scrape_authors.
+
+        Descarga las páginas de los autores pendientes de forma concurrente,
+        con un máximo de `concurrency` peticiones en vuelo, y conserva el orden
+        de aparición de los autores en `self.authors`.
+
+        Raises:
+            RequestException: Si hay un problema al acceder a la página de un autor.
+            Exception: Para cualquier otro error inesperado.
+        """
+        loop = asyncio.get_running_loop()
+
+        async def fetch_author(executor, name, about_link):
+            try:
+                response = await loop.run_in_executor(executor, self._get_page, about_link)
+                self._raise_for_status(response)
+                return self._page_author(response, name, about_link)
+            except requests.RequestException as e:
+                logging.error(f"Error en la solicitud HTTP al extraer información del autor {name}: {e}")
+                if self._record_failure(about_link, name, e):
+                    return None
+                raise
+            except Exception as e:
+                logging.error(f"Error inesperado al extraer información del autor {name}: {e}")
+                raise
+
+        try:
+            logging.info(f"Iniciando extracción asíncrona de autores (concurrencia {self.concurrency})")
+            pending = self._fetchable_authors(list(self._pending_authors().values()))
+            abouts = [self._stored_about(about_link) for about_link, _ in pending]
+            to_fetch = [i for i, about in enumerate(abouts) if about is None]
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                fetched = await asyncio.gather(*(
+                    fetch_author(executor, pending[i][1][0], pending[i][0]) for i in to_fetch
+                ))
+            for i, author in zip(to_fetch, fetched):
+                if author is not None:
+                    self._store_author(author)
+                    abouts[i] = author.about
+            for (about_link, names), about in zip(pending, abouts):
+                if about is not None:
+                    self._add_authors(about, about_link, names)
             logging.info(f"Se han extraído {len(self.authors)} autores con éxito")
         except Exception as e:
             logging.error(f"Error extrayendo autores: {e}")
             raise
+
+    async def scrape_async(self):
+        """Extrae Frases y autores en modo asíncrono."""
+        await self.scrape_quotes_async()
+        await self.scrape_authors_async()
+
+    def scrape(self):
+        """
+        Extrae Frases y autores, usando el modo asíncrono cuando `concurrency` es mayor que 1.
+        """
+        if self.concurrency > 1:
+            asyncio.run(self.scrape_async())
+        else:
+            self.scrape_quotes()
+            self.scrape_authors()
@@ -0,0 +1,300 @@
+import re
+import math
+import heapq
+import logging
+import threading
+import unicodedata
+from bisect import bisect_left
+
+'''
+En este archivo se define la búsqueda de texto completo sobre las Frases y las biografías de los autores:
+- SQLite: tablas virtuales FTS5 `quotes_fts` (contenido externo sobre `quotes`) y `authors_fts`.
+- MySQL: índices FULLTEXT sobre quotes(text) y authors(name, about), que InnoDB mantiene solo.
+- Si SQLite no tiene FTS5, un índice invertido en memoria con ranking BM25.
+Los índices se crean en la migración 4 (ver src/migrations.py) y Database.insert_data
+los mantiene al día. Todas las búsquedas exigen todos los términos; el último se busca
+también como prefijo (búsqueda mientras se escribe), los demás como palabras exactas para que
+la consulta no tenga que expandir prefijos sobre todo el vocabulario.
+'''
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    """Divide un texto en términos en minúsculas y sin tildes (como el tokenizador unicode61 de FTS5)."""
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return _TOKEN_RE.findall(text)
+
+
+def fts5_available(connection):
+    """Indica si la conexión SQLite tiene el módulo FTS5."""
+    try:
+        connection.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        connection.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except Exception:
+        return False
+
+
+class Fts5Index:
+    """Búsqueda con las tablas FTS5 de SQLite."""
+    name = 'fts5'
+
+    def __init__(self, db):
+        self.db = db
+
+    def index_quotes(self, rows):
+        """Añade las Frases nuevas [(id, texto), ...] dentro de la transacción en curso."""
+        self.db.executemany("INSERT INTO quotes_fts (rowid, text) VALUES (?, ?)", rows)
+
+    def index_authors(self, rows):
+        """Sustituye la entrada de los autores insertados o actualizados [(id, nombre, about), ...]."""
+        self.db.executemany("DELETE FROM authors_fts WHERE rowid = ?", [(row[0],) for row in rows])
+        self.db.executemany(
+            "INSERT INTO authors_fts (rowid, name, about) VALUES (?, ?, ?)",
+            [(author_id, name, about or '') for author_id, name, about in rows]
+        )
+
+    def reset(self):
+        pass
+
+    @staticmethod
+    def _match(query):
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+        return ' '.join(f'"{token}"' for token in tokens[:-1]) + f' "{tokens[-1]}"*'
+
+    def search_quotes(self, query, limit):
+        match = self._match(query)
+        if match is None:
+            return []
+        return self.db.fetch_all("""
+            SELECT quotes.id, quotes.text, authors.name FROM quotes_fts
+            JOIN quotes ON quotes.id = quotes_fts.rowid
+            LEFT JOIN authors ON authors.id = quotes.author_id
+            WHERE quotes_fts MATCH ?
+            ORDER BY quotes_fts.rank
+            LIMIT ?
+        """, (match, limit))
+
+    def search_authors(self, query, limit):
+        match = self._match(query)
+        if match is None:
+            return []
+        # El nombre pesa más que la biografía en el ranking
+        return self.db.fetch_all("""
+            SELECT authors.id, authors.name, authors.about_link FROM authors_fts
+            JOIN authors ON authors.id = authors_fts.rowid
+            WHERE authors_fts MATCH ?
+            ORDER BY bm25(authors_fts, 10.0, 1.0)
+            LIMIT ?
+        """, (match, limit))
+
+
+class MysqlFulltextIndex:
+    """Búsqueda con los índices FULLTEXT de MySQL (en modo booleano, con prefijos)."""
+    name = 'fulltext'
+    # Longitud mínima de término de InnoDB (innodb_ft_min_token_size)
+    min_token_size = 3
+
+    def __init__(self, db):
+        self.db = db
+
+    def index_quotes(self, rows):
+        pass
+
+    def index_authors(self, rows):
+        pass
+
+    def reset(self):
+        pass
+
+    def _against(self, query):
+        tokens = [token for token in tokenize(query) if len(token) >= self.min_token_size]
+        if not tokens:
+            return None
+        return ' '.join(f'+{token}' for token in tokens[:-1]) + f' +{tokens[-1]}*'
+
+    def search_quotes(self, query, limit):
+        against = self._against(query)
+        if against is None:
+            return []
+        return self.db.fetch_all("""
+            SELECT quotes.id, quotes.text, authors.name FROM quotes
+            LEFT JOIN authors ON authors.id = quotes.author_id
+            WHERE MATCH(quotes.text) AGAINST (%s IN BOOLEAN MODE)
+            ORDER BY MATCH(quotes.text) AGAINST (%s IN BOOLEAN MODE) DESC
+            LIMIT %s
+        """, (against, against, limit))
+
+    def search_authors(self, query, limit):
+        against = self._against(query)
+        if against is None:
+            return []
+        return self.db.fetch_all("""
+            SELECT id, name, about_link FROM authors
+            WHERE MATCH(name, about) AGAINST (%s IN BOOLEAN MODE)
+            ORDER BY MATCH(name, about) AGAINST (%s IN BOOLEAN MODE) DESC
+            LIMIT %s
+        """, (against, against, limit))
+
+
+class _Postings:
+    """Listas invertidas {término: {id: frecuencia}} con las longitudes de cada documento."""
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self.postings = {}
+        self.lengths = {}
+        self.total_length = 0
+        self._vocabulary = None
+
+    def add(self, doc_id, tokens):
+        if doc_id in self.lengths:
+            return
+        for token in tokens:
+            docs = self.postings.setdefault(token, {})
+            docs[doc_id] = docs.get(doc_id, 0) + 1
+        self.lengths[doc_id] = len(tokens)
+        self.total_length += len(tokens)
+        self._vocabulary = None
+
+    def _expand(self, prefix):
+        """Términos del vocabulario que empiezan por `prefix`."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, prefix)
+        end = start
+        while end < len(vocabulary) and vocabulary[end].startswith(prefix):
+            end += 1
+        return vocabulary[start:end]
+
+    def search(self, tokens, limit):
+        """
+        Devuelve los IDs de los `limit` documentos con todos los términos, ordenados por BM25.
+        El último término se busca como prefijo.
+        """
+        if not tokens or not self.lengths:
+            return []
+        count = len(self.lengths)
+        average = self.total_length / count or 1
+        scores = None
+        for position, token in enumerate(tokens):
+            token_scores = {}
+            terms = self._expand(token) if position == len(tokens) - 1 else [token] if token in self.postings else []
+            for term in terms:
+                docs = self.postings[term]
+                idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc_id, frequency in docs.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / average)
+                    score = idf * frequency * (self.k1 + 1) / (frequency + norm)
+                    token_scores[doc_id] = token_scores.get(doc_id, 0.0) + score
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {doc_id: score + token_scores[doc_id] for doc_id, score in scores.items() if doc_id in token_scores}
+            if not scores:
+                return []
+        return [doc_id for doc_id, _ in heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))]
+
+
+class InvertedIndex:
+    """
+    Índice invertido en memoria para SQLite sin FTS5.
+
+    Se carga desde la base de datos en la primera búsqueda y se actualiza de forma
+    incremental (Frases con ID mayor que la última indexada) cuando cambia la versión
+    de datos; Database.insert_data le añade directamente las Frases que inserta.
+    """
+    name = 'python'
+
+    def __init__(self, db):
+        self.db = db
+        self.version = None
+        self.last_quote_id = 0
+        self.quotes = _Postings()
+        self.authors = None
+        self._lock = threading.Lock()
+
+    def index_quotes(self, rows):
+        with self._lock:
+            if self.version is None:
+                return  # Aún no cargado: se leerá completo en la primera búsqueda
+            for quote_id, text in rows:
+                self.quotes.add(quote_id, tokenize(text))
+                self.last_quote_id = max(self.last_quote_id, quote_id)
+
+    def index_authors(self, rows):
+        with self._lock:
+            self.authors = None  # Pocos autores: se recargan en la siguiente búsqueda
+
+    def reset(self):
+        with self._lock:
+            self.version = None
+            self.last_quote_id = 0
+            self.quotes = _Postings()
+            self.authors = None
+
+    def _refresh(self):
+        version = self.db.get_data_version()
+        with self._lock:
+            if version != self.version:
+                rows = self.db.fetch_all(
+                    "SELECT id, text FROM quotes WHERE id > ? ORDER BY id", (self.last_quote_id,)
+                )
+                for quote_id, text in rows:
+                    self.quotes.add(quote_id, tokenize(text))
+                    self.last_quote_id = quote_id
+                self.authors = None
+                self.version = version
+            if self.authors is None:
+                authors = _Postings()
+                for author_id, name, about in self.db.fetch_all("SELECT id, name, about FROM authors"):
+                    # El nombre cuenta doble para que pese más que la biografía
+                    authors.add(author_id, tokenize(name) * 2 + tokenize(about))
+                self.authors = authors
+
+    def _fetch_ranked(self, query, ids):
+        if not ids:
+            return []
+        placeholders = ', '.join('?' * len(ids))
+        rows = {row[0]: row for row in self.db.fetch_all(query.format(placeholders=placeholders), ids)}
+        return [rows[doc_id] for doc_id in ids if doc_id in rows]
+
+    def search_quotes(self, query, limit):
+        self._refresh()
+        ids = self.quotes.search(tokenize(query), limit)
+        return self._fetch_ranked("""
+            SELECT quotes.id, quotes.text, authors.name FROM quotes
+            LEFT JOIN authors ON authors.id = quotes.author_id
+            WHERE quotes.id IN ({placeholders})
+        """, ids)
+
+    def search_authors(self, query, limit):
+        self._refresh()
+        ids = self.authors.search(tokenize(query), limit)
+        return self._fetch_ranked("SELECT id, name, about_link FROM authors WHERE id IN ({placeholders})", ids)
+
+
+def has_fts_tables(db):
+    """Indica si la base de datos SQLite tiene las tablas FTS5 de la migración 4."""
+    row = db.fetch_one("SELECT COUNT(*) FROM sqlite_master WHERE name IN ('quotes_fts', 'authors_fts')")
+    return bool(row) and row[0] == 2
+
+
+def get_search_index(db):
+    """Elige el índice de búsqueda según el backend y el esquema de la base de datos."""
+    if db.is_mysql:
+        index = MysqlFulltextIndex(db)
+    elif has_fts_tables(db):
+        index = Fts5Index(db)
+    else:
+        index = InvertedIndex(db)
+    logging.info(f"Índice de búsqueda: {index.name}")
+    return index
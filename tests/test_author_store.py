@@ -0,0 +1,77 @@
+import logging
+import pytest
+from src.author_store import AuthorStore, canonical_link
+from src.models import Quote
+from src.scraper import Scraper
+from tests.test_scraper import BASE_URL, SITE_QUOTES, fake_session
+
+
+@pytest.fixture
+def store():
+    """
+    Crea un almacén de autores en memoria con un TTL de una hora.
+
+    Yields:
+        AuthorStore: Almacén vacío.
+    """
+    store = AuthorStore(':memory:', ttl=3600)
+    yield store
+    store.close()
+
+
+def author_requests(scraper):
+    """Devuelve las URLs de autores solicitadas a través del transporte ficticio."""
+    return [url for url in scraper.session.get_adapter(BASE_URL).requested if '/author/' in url]
+
+
+def test_canonical_link():
+    """
+    Verifica que las variantes de un mismo enlace se normalizan a la misma clave.
+    """
+    expected = 'https://quotes.toscrape.com/author/Albert-Einstein'
+    assert canonical_link('https://quotes.toscrape.com//author/Albert-Einstein') == expected
+    assert canonical_link('HTTPS://Quotes.toscrape.com/author/Albert-Einstein/') == expected
+    assert canonical_link(' https://quotes.toscrape.com/author/Albert-Einstein?x=1#bio ') == expected
+
+
+def test_store_ttl(store):
+    """
+    Verifica que las biografías se sirven mientras son vigentes y caducan tras el TTL.
+    """
+    link = 'https://quotes.toscrape.com//author/Albert-Einstein'
+    assert store.get(link) is None
+    store.put(link, 'Físico teórico alemán.', now=1000)
+    assert store.get('https://quotes.toscrape.com/author/Albert-Einstein/', now=1000 + 3599) == 'Físico teórico alemán.'
+    assert store.get(link, now=1000 + 3600) is None
+    assert store.stats() == {'hits': 1, 'misses': 1, 'stale': 1}
+
+
+@pytest.mark.parametrize('concurrency', [1, 4])
+def test_authors_fetched_once_across_runs(store, concurrency):
+    """
+    Verifica que cada autor se descarga una sola vez y que una segunda ejecución usa el almacén.
+    """
+    first = Scraper(BASE_URL, concurrency=concurrency, session=fake_session(), author_store=store)
+    first.scrape()
+    assert len(author_requests(first)) == len({link for _, _, _, link in SITE_QUOTES})
+
+    second = Scraper(BASE_URL, concurrency=concurrency, session=fake_session(), author_store=store)
+    second.scrape()
+    assert author_requests(second) == []
+    assert {k: a.about for k, a in second.authors.items()} == {k: a.about for k, a in first.authors.items()}
+    logging.info(f"Estadísticas del almacén: {store.stats()}")
+
+
+def test_name_variants_share_one_fetch():
+    """
+    Verifica que dos variantes de nombre con el mismo enlace generan una sola descarga.
+    """
+    scraper = Scraper(BASE_URL, session=fake_session())
+    scraper.quotes = [
+        Quote('Frase uno', 'Albert Einstein', [], BASE_URL + '/author/Albert-Einstein'),
+        Quote('Frase dos', 'A. Einstein', [], BASE_URL + 'author/Albert-Einstein/'),
+    ]
+    scraper.scrape_authors()
+    assert len(author_requests(scraper)) == 1
+    assert set(scraper.authors) == {'Albert Einstein', 'A. Einstein'}
+    assert scraper.authors['A. Einstein'].about == scraper.authors['Albert Einstein'].about
@@ -0,0 +1,27 @@
+import pytest
+from benchmarks.bench_pipeline import run_benchmark
+from benchmarks.site_server import SyntheticSite
+
+
+def test_synthetic_site_shape():
+    """El sitio sintético termina con una página sin Frases y sirve las biografías."""
+    site = SyntheticSite(pages=2, authors=3, quotes_per_page=4)
+    assert site.render('/page/2/')[1].count('class="quote"') == 4
+    assert 'class="quote"' not in site.render('/page/3/')[1]
+    assert site.render('/author/Author-Number-2')[0] == 200
+    assert site.render('/author/Author-Number-3')[0] == 404
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_pipeline_benchmark_smoke(streaming):
+    """El benchmark recorre el pipeline completo y devuelve métricas por etapa."""
+    result = run_benchmark(pages=3, authors=2, quotes_per_page=5, concurrency=2, streaming=streaming)
+    stages = result['stages']
+    assert result['config']['pages'] == 3
+    if streaming:
+        assert stages['pipeline']['quotes'] == 15
+    else:
+        # 3 páginas + la página vacía final + 2 autores (el modo asíncrono puede pedir alguna página especulativa más)
+        assert stages['scrape']['pages'] >= 4 + 2
+        assert stages['insert']['quotes'] == 15 and stages['insert']['rows_per_s'] > 0
+    assert stages['total']['rss_peak_mb'] > 0
@@ -0,0 +1,78 @@
+from unittest.mock import patch
+from src import clean_data as clean_module
+from src.clean_data import clean_data, clean_tags
+from src.models import Quote, Author
+from src.normalizer import TextNormalizer
+
+
+def sample_data(count):
+    """Genera Frases y autores con espacios, entidades HTML y etiquetas repetidas."""
+    authors = [Author(f"dr. autor  {i}", f"Biografía &amp; obra   {i}", f"quotes.toscrape.com/author/{i}") for i in range(count // 10 + 1)]
+    quotes = [
+        Quote(f"  “Frase &quot;{i}&quot;”  ", f"autor {i % len(authors)}", [f"Tag{i % 7}", "común", f"tag{i % 7}"], authors[i % len(authors)].about_link)
+        for i in range(count)
+    ]
+    return quotes, authors
+
+
+def as_tuples(cleaned):
+    """Representación comparable del resultado de clean_data."""
+    quotes, authors = cleaned
+    return (
+        [(q.text, q.author, q.tags, q.author_about_link) for q in quotes],
+        [(name, a.name, a.about, a.about_link) for name, a in authors.items()],
+    )
+
+
+def test_clean_tags_is_deterministic():
+    """Las etiquetas duplicadas se eliminan conservando el orden de aparición."""
+    assert clean_tags(["Vida", "amor", "vida", "AMOR", "paz"]) == ["vida", "amor", "paz"]
+
+
+def test_parallel_matches_serial():
+    """El modo paralelo produce exactamente el mismo resultado que el secuencial."""
+    quotes, authors = sample_data(500)
+    serial = as_tuples(clean_data(quotes, authors))
+    parallel = as_tuples(clean_data(quotes, authors, workers=2, threshold=100))
+    assert parallel == serial
+    assert len(serial[0]) == 500
+
+
+def test_small_inputs_stay_in_process():
+    """Por debajo del umbral no se crea el pool de procesos."""
+    quotes, authors = sample_data(50)
+    with patch.object(clean_module, 'ProcessPoolExecutor', side_effect=AssertionError("pool")):
+        cleaned = clean_data(quotes, authors, workers=4, threshold=1000)
+    assert len(cleaned[0]) == 50
+
+
+def test_normalizer_caches_are_bounded():
+    """Los nombres de autor y las etiquetas se memorizan en cachés acotadas con estadísticas."""
+    engine = TextNormalizer(name_cache_size=2, tag_cache_size=8)
+    for _ in range(3):
+        assert engine.author_name("Dr.  albert   einstein") == "Albert Einstein"
+    assert engine.tags(["Vida", "vida", "AMOR"]) == ["vida", "amor"]
+    for name in ("a", "b", "c"):
+        engine.author_name(name)
+
+    stats = engine.stats()
+    assert stats['author_names']['hits'] == 2
+    assert stats['author_names']['size'] == 2
+    assert stats['tags']['misses'] == 3 and stats['tags']['size'] == 3
+    engine.clear()
+    assert engine.stats()['tags']['size'] == 0
+
+
+def test_normalizer_matches_reference():
+    """El motor produce el mismo resultado que la limpieza con patrones sin compilar."""
+    import re
+    from html import unescape
+
+    def reference_text(text):
+        return re.sub(r'[^\w\s.,!?"-]', '', ' '.join(unescape(text).split())).strip()
+
+    engine = TextNormalizer()
+    for text in ["  “Hola &amp; adiós”  ", "a — b", "Mrs.  jane   AUSTEN", "¿Qué? ¡Sí!", ""]:
+        assert engine.text(text) == reference_text(text)
+        name = ' '.join(w.capitalize() for w in re.sub(r'^(Mr\.|Mrs\.|Ms\.|Dr\.|Prof\.)\s+', '', text).split())
+        assert engine.author_name(text) == reference_text(name)
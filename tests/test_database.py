@@ -3,11 +3,19 @@ import pytest
 import sqlite3
 from src.database import Database
 from src.models import Quote, Author
+import copy
+import os
+import tempfile
 import logging
 import logging.config
 from config.config import LOG_CONFIG
 
-logging.config.dictConfig(LOG_CONFIG)
+# Los logs de las pruebas van a un directorio temporal para no ensuciar logs/
+LOG_DIR = tempfile.mkdtemp(prefix='quotes-test-logs-')
+TEST_LOG_CONFIG = copy.deepcopy(LOG_CONFIG)
+for handler in TEST_LOG_CONFIG['handlers'].values():
+    handler['filename'] = os.path.join(LOG_DIR, os.path.basename(handler['filename']))
+logging.config.dictConfig(TEST_LOG_CONFIG)
 
 @pytest.fixture
 def database():
@@ -157,4 +165,165 @@ def test_insertion(database):
         logging.info("Inserción de prueba exitosa")
     except Error as e:
         logging.error(f"Error en inserción de prueba: {str(e)}")
-        database.connection.rollback()
\ No newline at end of file
+        database.connection.rollback()
+
+
+def test_bulk_insert_is_set_based(database):
+    """
+    Verifica que insert_data usa un número acotado de sentencias, un único commit y no duplica datos al repetirse.
+
+    Args:
+        database (Database): Instancia de la base de datos de prueba.
+    """
+    authors = {
+        f"Autor {i}": Author(f"Autor {i}", f"Biografía {i}", f"https://quotes.toscrape.com/author/Autor-{i}")
+        for i in range(5)
+    }
+    quotes = [
+        Quote(f"Frase número {i}", f"Autor {i % 5}", [f"tag{i % 7}", f"tag{i % 3}"], authors[f"Autor {i % 5}"].about_link)
+        for i in range(40)
+    ]
+    statements = []
+    database.connection.set_trace_callback(statements.append)
+    counts = database.insert_data(quotes, authors)
+    database.connection.set_trace_callback(None)
+
+    expected_links = sum(len({f"tag{i % 7}", f"tag{i % 3}"}) for i in range(40))
+    assert counts['quotes'] == 40
+    assert counts['quote_tags'] == expected_links
+    selects = [s for s in statements if s.lstrip().upper().startswith('SELECT')]
+    commits = [s for s in statements if s.strip().upper() == 'COMMIT']
+    assert len(selects) <= 5
+    assert len(commits) == 1
+
+    counts = database.insert_data(quotes, authors)
+    assert counts['quotes'] == 0
+    database.cursor.execute("SELECT COUNT(*) FROM quotes")
+    assert database.cursor.fetchone()[0] == 40
+    database.cursor.execute("SELECT COUNT(*) FROM quote_tags")
+    assert database.cursor.fetchone()[0] == expected_links
+
+
+def test_id_caches(database):
+    """
+    Verifica que los IDs de autores y etiquetas se resuelven desde la caché y que un rollback la invalida.
+
+    Args:
+        database (Database): Instancia de la base de datos de prueba.
+    """
+    link = "https://quotes.toscrape.com/author/Albert-Einstein"
+    authors = {"Albert Einstein": Author("Albert Einstein", "Físico teórico alemán.", link)}
+    database.insert_data([Quote("Frase uno", "Albert Einstein", ["vida", "ciencia"], link)], authors)
+
+    statements = []
+    database.connection.set_trace_callback(statements.append)
+    database.insert_data([Quote("Frase dos", "Albert Einstein", ["vida"], link)], authors)
+    database.connection.set_trace_callback(None)
+
+    lookups = [s for s in statements if s.lstrip().startswith('SELECT') and ('FROM authors' in s or 'FROM tags' in s)]
+    assert lookups == []
+    assert database.get_author_id("Albert Einstein") == database.author_ids.get("Albert Einstein")
+    stats = database.id_cache_stats()
+    assert stats['authors']['hits'] >= 1 and stats['tags']['hits'] >= 1
+
+    database.rollback()
+    assert not database.author_ids.loaded and len(database.tag_ids) == 0
+    assert database.get_tag_id("vida") is not None
+
+
+LEGACY_SQLITE_SCHEMA = [
+    "CREATE TABLE authors (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE, about TEXT, about_link TEXT)",
+    "CREATE TABLE quotes (id INTEGER PRIMARY KEY AUTOINCREMENT, text TEXT, author_id INTEGER)",
+    "CREATE TABLE tags (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE)",
+    "CREATE TABLE quote_tags (quote_id INTEGER, tag_id INTEGER)",
+]
+
+
+def test_upsert_uses_natural_keys(database):
+    """
+    Verifica que repetir la inserción no duplica Frases ni relaciones gracias a las claves naturales.
+
+    Args:
+        database (Database): Instancia de la base de datos de prueba.
+    """
+    link = "https://quotes.toscrape.com/author/Albert-Einstein"
+    authors = {"Albert Einstein": Author("Albert Einstein", "Físico teórico alemán.", link)}
+    quotes = [Quote("Frase uno", "Albert Einstein", ["vida"], link)]
+    for _ in range(3):
+        database.insert_data(quotes, authors)
+    assert database.fetch_one("SELECT COUNT(*) FROM quotes")[0] == 1
+    assert database.fetch_one("SELECT COUNT(*) FROM quote_tags")[0] == 1
+
+    with pytest.raises(sqlite3.IntegrityError):
+        database.cursor.execute(
+            "INSERT INTO quote_tags (quote_id, tag_id) SELECT quote_id, tag_id FROM quote_tags"
+        )
+
+
+def test_migrate_legacy_schema():
+    """
+    Verifica la migración de una base de datos sin claves naturales: rellena los hashes y fusiona duplicados.
+    """
+    db = Database(database=':memory:')
+    for statement in LEGACY_SQLITE_SCHEMA:
+        db.cursor.execute(statement)
+    db.cursor.execute("INSERT INTO authors (name) VALUES ('Albert Einstein')")
+    db.cursor.executemany("INSERT INTO quotes (text, author_id) VALUES (?, 1)", [("Frase uno",), ("Frase uno",), ("Frase dos",)])
+    db.cursor.executemany("INSERT INTO tags (name) VALUES (?)", [("vida",), ("ciencia",)])
+    db.cursor.executemany("INSERT INTO quote_tags VALUES (?, ?)", [(1, 1), (2, 1), (2, 2), (3, 2), (3, 2)])
+    db.connection.commit()
+
+    db.create_tables()
+
+    assert db.fetch_all("SELECT id, text FROM quotes ORDER BY id") == [(1, "Frase uno"), (3, "Frase dos")]
+    assert db.fetch_all("SELECT quote_id, tag_id FROM quote_tags ORDER BY quote_id, tag_id") == [(1, 1), (1, 2), (3, 2)]
+    assert db.fetch_all("SELECT COUNT(*) FROM quotes WHERE content_hash IS NULL") == [(0,)]
+
+    link = "https://quotes.toscrape.com/author/Albert-Einstein"
+    counts = db.insert_data(
+        [Quote("Frase uno", "Albert Einstein", ["vida"], link), Quote("Frase tres", "Albert Einstein", [], link)],
+        {"Albert Einstein": Author("Albert Einstein", "Físico", link)}
+    )
+    assert counts['quotes'] == 1
+    db.create_tables()
+    db.close()
+
+
+def test_failed_sqlite_insert_rolls_back(database):
+    """
+    Verifica que un error de SQLite en insert_data deshace la transacción e invalida las cachés de IDs.
+
+    Args:
+        database (Database): Instancia de la base de datos de prueba.
+    """
+    link = "https://quotes.toscrape.com/author/Albert-Einstein"
+    authors = {"Albert Einstein": Author("Albert Einstein", "Físico teórico alemán.", link)}
+    database.cursor.execute("DROP TABLE quote_tags")
+    database.connection.commit()
+
+    assert database.insert_data([Quote("Frase uno", "Albert Einstein", ["vida"], link)], authors) is None
+    assert not database.connection.in_transaction
+    assert not database.author_ids.loaded and len(database.tag_ids) == 0
+    assert database.fetch_one("SELECT COUNT(*) FROM authors")[0] == 0
+    assert database.rows_written == 0
+
+
+def test_unchanged_authors_are_not_rewritten(database):
+    """
+    Verifica que repetir la carga con los mismos autores no cuenta filas escritas y que un cambio sí se escribe.
+
+    Args:
+        database (Database): Instancia de la base de datos de prueba.
+    """
+    link = "https://quotes.toscrape.com/author/Albert-Einstein"
+    quotes = [Quote("Frase uno", "Albert Einstein", ["vida"], link)]
+    authors = {"Albert Einstein": Author("Albert Einstein", "Físico teórico alemán.", link)}
+    assert database.insert_data(quotes, authors)['authors'] == 1
+    written = database.rows_written
+
+    assert database.insert_data(quotes, authors)['authors'] == 0
+    assert database.rows_written == written
+
+    authors["Albert Einstein"].about = "Físico teórico."
+    assert database.insert_data(quotes, authors)['authors'] == 1
+    assert database.fetch_one("SELECT about FROM authors WHERE name = 'Albert Einstein'")[0] == "Físico teórico."
@@ -0,0 +1,129 @@
+import sqlite3
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from src import queries
+from src.database import Database
+from src.db_pool import ConnectionPool, PoolTimeoutError
+from src.models import Quote, Author
+
+
+class FakeConnection:
+    """Conexión mínima que registra rollbacks y cierres."""
+    def __init__(self):
+        self.closed = False
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+def test_pool_is_bounded_and_reuses_connections():
+    """El pool no abre más de `size` conexiones y las peticiones de más esperan turno."""
+    created = []
+
+    def factory():
+        created.append(FakeConnection())
+        return created[-1]
+
+    pool = ConnectionPool(factory, size=2)
+    held = [pool.acquire(), pool.acquire()]
+
+    def worker():
+        with pool.connection():
+            pass
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    for connection in held:
+        pool.release(connection)
+    for thread in threads:
+        thread.join()
+
+    stats = pool.stats()
+    assert len(created) == 2
+    assert stats['peak_in_use'] == 2
+    assert stats['checkouts'] == 4
+    assert stats['waits'] == 2
+    assert stats['max_wait'] > 0
+    assert stats['in_use'] == 0
+    assert 0 < stats['utilisation'] <= 1
+    assert all(connection.rollbacks >= 1 for connection in created)
+
+
+def test_pool_timeout():
+    """Si no se libera ninguna conexión a tiempo se lanza PoolTimeoutError."""
+    pool = ConnectionPool(FakeConnection, size=1, timeout=0.01)
+    connection = pool.acquire()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    pool.release(connection)
+    assert pool.acquire() is connection
+    assert pool.stats()['timeouts'] == 1
+
+
+def test_pool_replaces_invalid_connections():
+    """Las conexiones que no pasan la validación se cierran y se sustituyen."""
+    pool = ConnectionPool(FakeConnection, size=1, validate=lambda connection: False)
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+    assert second is not first
+    assert first.closed
+    assert pool.stats()['open'] == 1
+
+
+def test_pool_discards_connection_only_on_connection_errors():
+    """
+    Un error de la consulta devuelve la conexión al pool tras el rollback; un error de
+    conexión la cierra y la sustituye.
+    """
+    pool = ConnectionPool(FakeConnection, size=1)
+    with pytest.raises(ValueError):
+        with pool.connection() as first:
+            raise ValueError("fallo en la consulta")
+    assert not first.closed and first.rollbacks == 1
+    with pytest.raises(sqlite3.OperationalError):
+        with pool.connection() as second:
+            raise sqlite3.OperationalError("disk I/O error")
+    assert second is first and first.closed
+    assert pool.stats()['in_use'] == 0
+    with pool.connection() as third:
+        assert third is not first
+
+
+def test_pooled_database_concurrent_reads(tmp_path):
+    """Varios hilos leen a la vez, cada uno con su conexión, sin compartir cursor."""
+    path = str(tmp_path / 'quotes.db')
+    writer = Database(database=path)
+    writer.create_tables()
+    authors = {f"Autor {i}": Author(f"Autor {i}", "Bio", f"https://quotes.toscrape.com/author/Autor-{i}") for i in range(3)}
+    quotes = [Quote(f"Frase {i}", f"Autor {i % 3}", ["tag"], authors[f"Autor {i % 3}"].about_link) for i in range(30)]
+    writer.insert_data(quotes, authors)
+    writer.close()
+
+    db = Database(database=path, pool_size=3, pool_timeout=5)
+    try:
+        assert db.connection is None
+
+        def read(page):
+            return [quote.text for quote in queries.fetch_quotes_page(db, page, 5)], queries.count_quotes(db)
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            results = list(executor.map(read, [1, 2, 3, 4, 5, 6] * 5))
+
+        for page, (texts, total) in zip([1, 2, 3, 4, 5, 6] * 5, results):
+            assert total == 30
+            assert texts == [f"Frase {i}" for i in range((page - 1) * 5, page * 5)]
+        stats = db.pool_stats()
+        assert stats['open'] <= 3
+        assert stats['checkouts'] == 60
+        assert stats['in_use'] == 0
+    finally:
+        db.close()
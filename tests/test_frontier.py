@@ -0,0 +1,89 @@
+import pytest
+from src.frontier import CrawlFrontier, RetryPolicy
+from src.scraper import Scraper
+from tests.test_scraper import BASE_URL, QUOTES_PER_PAGE, SITE_QUOTES, fake_session
+
+
+def test_retry_policy_backs_off_exponentially():
+    """La espera se duplica en cada intento hasta el máximo."""
+    policy = RetryPolicy(max_attempts=5, backoff=10, max_backoff=35)
+    assert [policy.delay(attempts) for attempts in (1, 2, 3, 4)] == [10, 20, 35, 35]
+
+
+def test_failed_urls_are_retried_per_policy():
+    """Una URL fallida se vuelve a pedir al vencer la espera, hasta agotar los intentos."""
+    frontier = CrawlFrontier(':memory:', RetryPolicy(max_attempts=2, backoff=60))
+    url = BASE_URL + 'author/Albert-Einstein'
+    assert frontier.should_fetch(url, now=0)
+    assert frontier.mark_failed(url, 'author', '500 Error', now=0) == 1
+    assert not frontier.should_fetch(url, now=30)
+    assert frontier.should_fetch(url, now=60)
+    assert not frontier.finish()  # queda un intento: el recorrido se conserva
+
+    assert frontier.mark_failed(url, 'author', '500 Error', now=60) == 2
+    assert not frontier.should_fetch(url, now=10_000)
+    assert frontier.finish()  # intentos agotados: el recorrido termina
+    assert frontier.counts() == {'done': 0, 'pending': 0, 'failed': 0}
+    frontier.close()
+
+
+def test_stale_crawl_is_discarded(tmp_path):
+    """Un recorrido sin terminar más antiguo que `max_age` se descarta al abrir la frontera."""
+    path = str(tmp_path / 'frontier.db')
+    frontier = CrawlFrontier(path)
+    frontier.mark_done(BASE_URL + 'page/1/', 'listing', [], now=0)
+    frontier.close()
+    assert CrawlFrontier(path, max_age=3600).counts()['done'] == 0
+
+
+@pytest.mark.parametrize('concurrency', [1, 3])
+def test_crawl_resumes_after_failed_authors(tmp_path, concurrency):
+    """
+    Si fallan los autores, la extracción conserva las Frases; la siguiente ejecución reutiliza
+    el listado guardado sin descargarlo y solo pide los autores pendientes.
+    """
+    path = str(tmp_path / 'frontier.db')
+    policy = RetryPolicy(max_attempts=3, backoff=0)
+
+    failing = Scraper(BASE_URL, concurrency=concurrency, session=fake_session(fail_authors=True),
+                      frontier=CrawlFrontier(path, policy))
+    failing.scrape()
+    failing.close()
+    unique_authors = len({quote[1] for quote in SITE_QUOTES})
+    assert len(failing.quotes) == len(SITE_QUOTES)
+    assert failing.authors == {}
+
+    frontier = CrawlFrontier(path, policy)
+    assert frontier.counts()['failed'] == unique_authors
+    session = fake_session()
+    resumed = Scraper(BASE_URL, concurrency=concurrency, session=session, frontier=frontier)
+    resumed.scrape()
+    requested = session.get_adapter(BASE_URL).requested
+    # Las páginas procesadas (incluida la última, vacía) no se descargan; en modo asíncrono
+    # solo se repiten las peticiones especulativas posteriores al final del listado
+    last_page = -(-len(SITE_QUOTES) // QUOTES_PER_PAGE) + 1
+    assert not any(resumed._page_url(page) in requested for page in range(1, last_page + 1))
+    assert len([url for url in requested if '/author/' in url]) == unique_authors
+    assert [quote.text for quote in resumed.quotes] == [quote[0] for quote in SITE_QUOTES]
+    assert len(resumed.authors) == unique_authors
+
+    assert frontier.finish()
+    assert frontier.counts() == {'done': 0, 'pending': 0, 'failed': 0}
+    resumed.close()
+
+
+def test_interrupted_listing_resumes(tmp_path):
+    """Las páginas del listado procesadas antes de una interrupción no se vuelven a descargar."""
+    path = str(tmp_path / 'frontier.db')
+    first = Scraper(BASE_URL, session=fake_session(), frontier=CrawlFrontier(path))
+    next(first.iter_quote_pages())
+    first.close()
+
+    session = fake_session()
+    second = Scraper(BASE_URL, session=session, frontier=CrawlFrontier(path))
+    second.scrape_quotes()
+    requested = session.get_adapter(BASE_URL).requested
+    assert second._page_url(1) not in requested and second._page_url(2) in requested
+    assert len(second.quotes) == len(SITE_QUOTES)
+    assert second.frontier.stats()['resumed'] == 1
+    second.close()
@@ -0,0 +1,69 @@
+import logging
+from unittest.mock import patch
+import pytest
+from src.http_cache import ResponseCache
+from src.scraper import Scraper
+from tests.test_scraper import BASE_URL, SITE_QUOTES, fake_session, snapshot
+
+
+@pytest.fixture
+def cache():
+    """
+    Crea una caché HTTP en memoria.
+
+    Yields:
+        ResponseCache: Caché vacía con un límite de 1 MB.
+    """
+    cache = ResponseCache(':memory:', max_bytes=1024 * 1024)
+    yield cache
+    cache.close()
+
+
+def test_conditional_headers(cache):
+    """
+    Verifica que una entrada guardada genera las cabeceras de revalidación.
+    """
+    cache.put('http://x/1', {'ETag': '"abc"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}, '<html></html>')
+    entry = cache.get('http://x/1')
+    assert entry.conditional_headers() == {
+        'If-None-Match': '"abc"',
+        'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+    }
+    cache.put('http://x/2', {}, '<html></html>')
+    assert cache.get('http://x/2') is None
+
+
+def test_lru_eviction():
+    """
+    Verifica que al superar el tamaño máximo se expulsa la entrada usada menos recientemente.
+    """
+    cache = ResponseCache(':memory:', max_bytes=25)
+    cache.put('http://x/1', {'ETag': '"1"'}, 'a' * 10)
+    cache.put('http://x/2', {'ETag': '"2"'}, 'b' * 10)
+    assert cache.get('http://x/1') is not None
+    cache.put('http://x/3', {'ETag': '"3"'}, 'c' * 10)
+    assert cache.get('http://x/2') is None
+    assert cache.get('http://x/1') is not None
+    assert cache.get('http://x/3') is not None
+    assert cache.stats()['evictions'] == 1
+    cache.close()
+
+
+@pytest.mark.parametrize('concurrency', [1, 3])
+def test_not_modified_pages_skip_parsing(cache, concurrency):
+    """
+    Verifica que en una segunda ejecución las páginas sin cambios se sirven desde la caché sin parsearlas.
+    """
+    first = Scraper(BASE_URL, concurrency=concurrency, session=fake_session(), cache=cache)
+    first.scrape()
+
+    with patch.object(Scraper, '_parse_quotes', autospec=True, side_effect=Scraper._parse_quotes) as parse_quotes, \
+            patch.object(Scraper, '_parse_author', autospec=True, side_effect=Scraper._parse_author) as parse_author:
+        second = Scraper(BASE_URL, concurrency=concurrency, session=fake_session(), cache=cache)
+        second.scrape()
+
+    assert snapshot(second) == snapshot(first)
+    assert parse_quotes.call_count == 0
+    assert parse_author.call_count == 0
+    assert cache.stats()['hits'] >= len(SITE_QUOTES) // 2 + 3
+    logging.info(f"Estadísticas de la caché HTTP: {cache.stats()}")
@@ -0,0 +1,68 @@
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from config.config import HTTP_CONFIG
+from src.http_client import create_session, connection_stats
+from src.scraper import Scraper
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Servidor HTTP/1.1 local que mantiene las conexiones abiertas."""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'<html><body></body></html>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    """
+    Levanta un servidor HTTP local en un puerto libre.
+
+    Yields:
+        str: URL base del servidor.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_session_reuses_connections(local_server):
+    """
+    Verifica que varias peticiones al mismo host reutilizan una única conexión.
+    """
+    session = create_session(HTTP_CONFIG)
+    for page in range(1, 6):
+        response = session.get(f"{local_server}/page/{page}/")
+        assert response.status_code == 200
+    stats = connection_stats(session, local_server)
+    session.close()
+    assert stats['requests'] == 5
+    assert stats['connections'] == 1
+    assert stats['reused'] == 4
+    logging.info(f"Estadísticas de conexiones: {stats}")
+
+
+def test_scraper_uses_pooled_session(local_server):
+    """
+    Verifica que el scraper recorre el listado sobre la sesión compartida y expone sus contadores.
+    """
+    scraper = Scraper(local_server, concurrency=4)
+    scraper.scrape()
+    stats = scraper.connection_stats()
+    scraper.close()
+    assert scraper.quotes == []
+    assert stats['requests'] >= 1
+    assert stats['connections'] <= stats['requests']
@@ -0,0 +1,90 @@
+import time
+import pytest
+from src.database import Database
+from src.job_runner import JobRunner, FileLock, RunContext
+from src.scraper import Scraper, BudgetExceededError
+from tests.test_scraper import BASE_URL, fake_session
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    """Solo un poseedor del bloqueo a la vez; se puede volver a obtener tras liberarlo."""
+    path = str(tmp_path / 'locks' / 'update.lock')
+    first, second = FileLock(path), FileLock(path)
+    assert first.acquire()
+    assert not second.acquire()
+    first.release()
+    assert second.acquire()
+    second.release()
+
+
+def test_tick_skips_when_locked(tmp_path):
+    """Si otra ejecución tiene el bloqueo, el tick se omite sin ejecutar el trabajo."""
+    path = str(tmp_path / 'update.lock')
+    calls = []
+    runner = JobRunner(calls.append, interval=60, lock=FileLock(path))
+    holder = FileLock(path)
+    assert holder.acquire()
+    run = runner.tick()
+    holder.release()
+    assert run.status == 'skipped'
+    assert calls == []
+    assert runner.tick().status == 'ok'
+    assert len(calls) == 1
+
+
+def test_tick_records_runs():
+    """Cada ejecución se registra con su estado, duración, filas, páginas e intervalos excedidos."""
+    db = Database(database=':memory:')
+    db.create_tables()
+
+    def slow_job(context):
+        context.rows_changed = 7
+        context.pages_fetched = 3
+        time.sleep(0.05)
+
+    def failing_job(context):
+        raise ValueError("fallo")
+
+    def timeout_job(context):
+        raise BudgetExceededError("sin tiempo")
+
+    for job in (slow_job, failing_job, timeout_job):
+        JobRunner(job, interval=0.01, recorder=db.record_run).tick()
+
+    rows = db.fetch_all("SELECT status, rows_changed, pages_fetched, overrun_intervals, error, duration FROM runs ORDER BY id")
+    assert [row[0] for row in rows] == ['ok', 'error', 'timeout']
+    assert rows[0][1:3] == (7, 3)
+    assert rows[0][3] >= 4 and rows[0][5] >= 0.05
+    assert rows[1][4] == "fallo"
+    db.close()
+
+
+def test_budget_covers_the_whole_run():
+    """
+    El presupuesto se comprueba entre etapas y una ejecución que termina fuera de plazo
+    (por ejemplo, durante la inserción) se registra como 'timeout'.
+    """
+    context = RunContext(budget=60)
+    context.check_deadline('la limpieza')
+    context.deadline = time.monotonic() - 1
+    with pytest.raises(BudgetExceededError):
+        context.check_deadline('la limpieza')
+
+    def overrunning_job(context):
+        time.sleep(0.05)
+
+    run = JobRunner(overrunning_job, interval=60, budget=0.01).tick()
+    assert run.status == 'timeout'
+
+
+def test_scraper_respects_deadline():
+    """El scraper no pide más páginas una vez agotado el presupuesto de tiempo."""
+    scraper = Scraper(BASE_URL, session=fake_session())
+    scraper.deadline = RunContext(budget=60).deadline
+    next(scraper.iter_quote_pages())
+    assert scraper.pages_fetched == 1
+
+    scraper.deadline = time.monotonic() - 1
+    with pytest.raises(BudgetExceededError):
+        next(scraper.iter_quote_pages())
+    assert scraper.session.get_adapter(BASE_URL).requested == [f"{BASE_URL}/page/1/"]
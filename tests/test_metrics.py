@@ -0,0 +1,105 @@
+import json
+import logging
+import urllib.request
+from src import metrics
+from src.database import Database
+from src.models import Quote, Author
+from src.scraper import Scraper
+from tests.test_scraper import BASE_URL, fake_session
+
+
+def test_histogram_buckets_and_prometheus_text():
+    """El histograma acumula las cubetas y se exporta en el formato de texto de Prometheus."""
+    registry = metrics.Registry()
+    latency = registry.histogram('latency_seconds', "Latencia", buckets=(0.1, 1.0))
+    requests_total = registry.counter('requests_total', "Peticiones")
+    for value in (0.05, 0.5, 2.0):
+        latency.observe(value, status=200)
+    requests_total.inc(3, status=200)
+
+    text = registry.render_prometheus()
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{status="200",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{status="200",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{status="200",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{status="200"} 3' in text
+    assert 'requests_total{status="200"} 3' in text
+
+    snapshot = registry.snapshot()['latency_seconds']['{status="200"}']
+    assert snapshot['count'] == 3 and snapshot['p50'] == 1.0
+
+
+def test_prometheus_label_values_are_escaped():
+    """Las comillas, barras invertidas y saltos de línea de las etiquetas se escapan en el texto de Prometheus."""
+    registry = metrics.Registry()
+    registry.counter('queries_total', "Consultas\npor tipo").inc(kind='say "hi"\\\n')
+    text = registry.render_prometheus()
+    assert '# HELP queries_total Consultas\\npor tipo' in text
+    assert 'queries_total{kind="say \\"hi\\"\\\\\\n"} 1' in text
+    assert len(text.splitlines()) == 3
+
+
+def test_pipeline_is_instrumented():
+    """Las peticiones, el parseo, las sentencias SQL, los commits y las filas por tabla se miden."""
+    requests_before = sum(s['count'] for s in metrics.HTTP_REQUEST_SECONDS.snapshot().values())
+    commits_before = metrics.DB_COMMITS.value()
+    quote_rows_before = metrics.DB_ROWS.value(table='quotes')
+
+    scraper = Scraper(BASE_URL, session=fake_session())
+    scraper.scrape()
+    scraper.close()
+    assert sum(s['count'] for s in metrics.HTTP_REQUEST_SECONDS.snapshot().values()) - requests_before == scraper.pages_fetched
+    assert metrics.PARSE_SECONDS.snapshot()['{page="quotes"}']['count'] >= 1
+
+    db = Database(database=':memory:')
+    db.create_tables()
+    link = "https://quotes.toscrape.com/author/Albert-Einstein"
+    selects_before = metrics.DB_QUERIES.value(kind='select')
+    db.insert_data([Quote("Frase uno", "Albert Einstein", ["vida"], link)],
+                   {"Albert Einstein": Author("Albert Einstein", "Físico", link)})
+    assert metrics.DB_QUERIES.value(kind='select') > selects_before
+    assert metrics.DB_COMMITS.value() - commits_before >= 2  # create_tables + insert_data
+    assert metrics.DB_ROWS.value(table='quotes') - quote_rows_before == 1
+    assert metrics.rows_per_second()['{table="quotes"}'] > 0
+    db.close()
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_log_summary_writes_json():
+    """El resumen de una ejecución es una línea JSON en el logger `metrics`."""
+    logger = logging.getLogger('metrics')
+    handler = _ListHandler()
+    logger.addHandler(handler)
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    try:
+        metrics.log_summary('prueba', rows_changed=3)
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+    record = json.loads(handler.messages[-1])
+    assert record['event'] == 'prueba' and record['rows_changed'] == 3
+    assert metrics.DB_COMMITS.name in record['metrics']
+
+
+def test_serve_prometheus():
+    """El endpoint /metrics sirve el registro en texto plano."""
+    registry = metrics.Registry()
+    registry.counter('runs_total', "Ejecuciones").inc()
+    server = metrics.serve_prometheus(0, registry=registry, host='127.0.0.1')
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            body = response.read().decode('utf-8')
+        assert 'runs_total 1' in body
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,113 @@
+import logging
+import pytest
+from src import migrations
+from src.database import Database
+from tests.test_database import LEGACY_SQLITE_SCHEMA
+
+
+@pytest.fixture
+def database():
+    """
+    Crea una base de datos SQLite en memoria con las tablas y migraciones aplicadas.
+
+    Yields:
+        Database: Instancia conectada a una base de datos en memoria.
+    """
+    db = Database(database=':memory:')
+    db.create_tables()
+    yield db
+    db.close()
+
+
+def query_plan(db, query, params=()):
+    db.cursor.execute(f"EXPLAIN QUERY PLAN {query}", params)
+    return ' '.join(row[-1] for row in db.cursor.fetchall())
+
+
+def test_schema_version_recorded(database):
+    """
+    Verifica que se registran todas las versiones y que volver a migrar no hace nada.
+    """
+    latest = migrations.MIGRATIONS[-1].version
+    assert migrations.current_version(database) == latest
+    assert [row[0] for row in database.fetch_all("SELECT version FROM schema_version ORDER BY version")] == \
+        [m.version for m in migrations.MIGRATIONS]
+    database.create_tables()
+    assert migrations.migrate(database) == latest
+    assert database.fetch_one("SELECT COUNT(*) FROM schema_version")[0] == len(migrations.MIGRATIONS)
+
+
+def test_query_indexes_used(database):
+    """
+    Verifica que las consultas de la aplicación por autor y etiqueta usan índices.
+    """
+    assert 'idx_quotes_author' in query_plan(database, "SELECT * FROM quotes WHERE author_id = ?", (1,))
+    assert 'idx_quote_tags_tag' in query_plan(database, "SELECT quote_id FROM quote_tags WHERE tag_id = ?", (1,))
+    plan = query_plan(database, "SELECT tag_id FROM quote_tags WHERE quote_id = ?", (1,))
+    assert 'USING' in plan and 'INDEX' in plan
+    logging.info("Las consultas por autor y etiqueta usan índices")
+
+
+def test_partial_migration_resumes():
+    """
+    Verifica que una base de datos en una versión intermedia aplica solo las migraciones pendientes.
+    """
+    db = Database(database=':memory:')
+    db._create_sqlite_tables()
+    assert migrations.migrate(db, target=1) == 1
+    assert 'idx_quotes_author' not in migrations._index_columns(db, 'quotes')
+    assert migrations.migrate(db) == migrations.MIGRATIONS[-1].version
+    assert 'idx_quotes_author' in migrations._index_columns(db, 'quotes')
+    db.close()
+
+
+def legacy_database(statements):
+    """Crea una base de datos en memoria con el esquema antiguo, dos Frases repetidas y las sentencias indicadas."""
+    db = Database(database=':memory:')
+    for statement in LEGACY_SQLITE_SCHEMA:
+        db.cursor.execute(statement)
+    db.cursor.execute("INSERT INTO authors (name) VALUES ('Albert Einstein')")
+    db.cursor.executemany("INSERT INTO quotes (text, author_id) VALUES (?, 1)", [("Frase uno",), ("Frase uno",)])
+    db.cursor.execute("INSERT INTO tags (name) VALUES ('vida')")
+    db.cursor.executemany("INSERT INTO quote_tags VALUES (?, 1)", [(1,), (2,)])
+    for statement in statements:
+        db.cursor.execute(statement)
+    db.connection.commit()
+    return db
+
+
+@pytest.mark.parametrize('statements', [
+    # Se añadió la columna, pero falló antes de crear las claves
+    ["ALTER TABLE quotes ADD COLUMN content_hash TEXT"],
+    # Se copiaron las relaciones y se borró la tabla original, pero falló antes de renombrar la copia
+    ["ALTER TABLE quotes ADD COLUMN content_hash TEXT",
+     "CREATE TABLE quote_tags_new (quote_id INTEGER, tag_id INTEGER, PRIMARY KEY (quote_id, tag_id))",
+     "INSERT OR IGNORE INTO quote_tags_new SELECT quote_id, tag_id FROM quote_tags",
+     "DROP TABLE quote_tags"],
+])
+def test_half_migrated_schema_completes(statements):
+    """
+    Verifica que reintentar la migración 1 sobre un esquema a medias crea las claves que faltan.
+    """
+    db = legacy_database(statements)
+    assert migrations.migrate(db) == migrations.MIGRATIONS[-1].version
+    assert migrations._index_columns(db, 'quotes')['uq_quotes_hash_author'] == ('content_hash', 'author_id')
+    assert migrations._primary_key(db, 'quote_tags') == ('quote_id', 'tag_id')
+    assert not migrations._has_table(db, 'quote_tags_new')
+    assert db.fetch_all("SELECT id FROM quotes") == [(1,)]
+    assert db.fetch_all("SELECT quote_id, tag_id FROM quote_tags") == [(1, 1)]
+    db.close()
+
+
+def test_runs_coalesced_column_renamed():
+    """
+    Verifica que la migración 8 renombra la columna `coalesced` de las tablas `runs` antiguas.
+    """
+    db = Database(database=':memory:')
+    db._create_sqlite_tables()
+    migrations.migrate(db, target=7)
+    db.cursor.execute("ALTER TABLE runs RENAME COLUMN overrun_intervals TO coalesced")
+    migrations.migrate(db)
+    assert migrations._has_column(db, 'runs', 'overrun_intervals')
+    assert not migrations._has_column(db, 'runs', 'coalesced')
+    db.close()
@@ -0,0 +1,31 @@
+import pickle
+from src.models import Quote, Author
+
+
+def test_models_are_compact():
+    """Los modelos no tienen __dict__, las etiquetas son tuplas y las cadenas repetidas se comparten."""
+    link = ''.join("https://quotes.toscrape.com/author/Albert-Einstein")
+    first = Quote("Frase uno", ''.join("Albert Einstein"), [''.join("vida"), "ciencia"], link)
+    second = Quote("Frase dos", ''.join("Albert Einstein"), [''.join("vida")], ''.join(link))
+    author = Author(''.join("Albert Einstein"), "Físico teórico alemán.", ''.join(link))
+
+    assert not hasattr(first, '__dict__') and not hasattr(author, '__dict__')
+    assert first.tags == ("vida", "ciencia")
+    assert first.author is second.author is author.name
+    assert first.tags[0] is second.tags[0]
+    assert first.author_about_link is second.author_about_link is author.about_link
+
+
+def test_unpickled_models_are_interned():
+    """Las Frases y autores que vuelven de otro proceso (pickle) comparten las cadenas internadas."""
+    quote = Quote("Frase uno", ''.join("Albert Einstein"), [''.join("vida")], ''.join("/author/Albert-Einstein"))
+    copy = pickle.loads(pickle.dumps(quote))
+    author = pickle.loads(pickle.dumps(Author(''.join("Albert Einstein"), "Físico", ''.join("/author/Albert-Einstein"))))
+
+    # Simula otro proceso: las cadenas deserializadas no son las internadas de este
+    fresh = pickle.loads(pickle.dumps([''.join("Albert Einstein")]))[0]
+    assert fresh is not quote.author
+    assert copy.author is quote.author is author.name
+    assert copy.tags[0] is quote.tags[0]
+    assert copy.author_about_link is quote.author_about_link is author.about_link
+    assert (copy.text, copy.tags) == (quote.text, quote.tags)
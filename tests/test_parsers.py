@@ -0,0 +1,96 @@
+import os
+import logging
+import pytest
+from src import parsers
+from src.parsers import SoupParser, LxmlParser, get_parser
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+BASE_URL = 'https://quotes.toscrape.com/'
+
+requires_lxml = pytest.mark.skipif(parsers.lxml is None, reason="lxml no está instalado")
+
+
+def read_fixture(name):
+    # newline='' conserva los CRLF de las páginas guardadas tal como llegan del servidor
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def quote_fields(quotes):
+    return [(q.text, q.author, list(q.tags), q.author_about_link) for q in quotes]
+
+
+def author_fields(author):
+    return (author.name, author.about, author.about_link)
+
+
+@requires_lxml
+@pytest.mark.parametrize('fixture', [
+    'listing_page.html', 'empty_page.html', 'xhtml_listing_page.html', 'crlf_listing_page.html'
+])
+def test_quotes_parity(fixture):
+    """
+    Verifica que ambos parsers extraen las mismas Frases de las páginas guardadas.
+    """
+    html = read_fixture(fixture)
+    reference = quote_fields(SoupParser().parse_quotes(html, BASE_URL))
+    assert quote_fields(LxmlParser().parse_quotes(html, BASE_URL)) == reference
+    logging.info(f"{fixture}: {len(reference)} Frases idénticas en ambos parsers")
+
+
+def test_listing_fixture_content():
+    """
+    Verifica el contenido extraído de la página de listado de referencia.
+    """
+    quotes = SoupParser().parse_quotes(read_fixture('listing_page.html'), BASE_URL)
+    assert len(quotes) == 6
+    assert quotes[0].author == 'Albert Einstein'
+    assert quotes[0].tags == ('change', 'deep-thoughts', 'thinking', 'world')
+    assert quotes[0].author_about_link == BASE_URL + '/author/Albert-Einstein'
+    assert quotes[4].text == '“Don\'t be "afraid" & never   stop\xa0trying.”'
+    assert quotes[4].author == 'Marilyn Monroe'
+    assert quotes[4].tags == ()
+
+
+@requires_lxml
+@pytest.mark.parametrize('fixture', ['author_page.html', 'author_page_partial.html', 'empty_page.html'])
+def test_author_parity(fixture):
+    """
+    Verifica que ambos parsers construyen el mismo autor a partir de las páginas guardadas.
+    """
+    html = read_fixture(fixture)
+    link = BASE_URL + '/author/Albert-Einstein'
+    reference = author_fields(SoupParser().parse_author(html, 'Albert Einstein', link))
+    assert author_fields(LxmlParser().parse_author(html, 'Albert Einstein', link)) == reference
+
+
+def test_crlf_and_xhtml_fixture_content():
+    """
+    Verifica que los saltos de línea CRLF se normalizan y que las páginas XHTML con declaración XML se parsean.
+    """
+    quotes = SoupParser().parse_quotes(read_fixture('crlf_listing_page.html'), BASE_URL)
+    assert quotes[0].text == '“Two roads diverged in a wood,\nand I took the one less traveled by.”'
+    assert quotes[0].author == 'Robert\nFrost'
+    assert quotes[0].tags == ('choices\n',)
+    assert quotes[1].text == '“Line one\r\nline two.”'
+    quotes = SoupParser().parse_quotes(read_fixture('xhtml_listing_page.html'), BASE_URL)
+    assert [quote.author for quote in quotes] == ['Albert Einstein', 'Jane Austen']
+    assert quotes[1].text == '“Café, niño & acción.”'
+
+
+def test_partial_author_defaults():
+    """
+    Verifica los valores por defecto cuando faltan campos en la página del autor.
+    """
+    author = SoupParser().parse_author(read_fixture('author_page_partial.html'), 'Marilyn Monroe', 'x')
+    assert author.about.startswith('Born: June 01, 1926 in Unknown\n\nMarilyn Monroe')
+
+
+def test_get_parser():
+    """
+    Verifica la selección del parser por nombre.
+    """
+    assert isinstance(get_parser('soup'), SoupParser)
+    assert isinstance(get_parser('auto'), LxmlParser if parsers.lxml else SoupParser)
+    with pytest.raises(ValueError):
+        get_parser('regex')
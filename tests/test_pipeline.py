@@ -0,0 +1,127 @@
+import logging
+from unittest.mock import patch
+import pytest
+from src.clean_data import clean_data, iter_clean_pages
+from src.database import Database
+from src.scraper import Scraper
+from tests.test_scraper import BASE_URL, SITE_QUOTES, QUOTES_PER_PAGE, fake_session
+
+
+def table_contents(db):
+    """Devuelve el contenido de las tablas de forma comparable."""
+    return {
+        'authors': db.fetch_all("SELECT name, about, about_link FROM authors ORDER BY name"),
+        'quotes': db.fetch_all(
+            "SELECT quotes.text, authors.name FROM quotes JOIN authors ON authors.id = quotes.author_id ORDER BY quotes.text"
+        ),
+        'tags': db.fetch_all("SELECT name FROM tags ORDER BY name"),
+        'quote_tags': db.fetch_all("SELECT COUNT(*) FROM quote_tags"),
+    }
+
+
+@pytest.fixture
+def databases():
+    """
+    Crea dos bases de datos SQLite en memoria con las tablas creadas.
+
+    Yields:
+        tuple: (base de datos para el modo por lotes, base de datos para el modo streaming).
+    """
+    dbs = (Database(database=':memory:'), Database(database=':memory:'))
+    for db in dbs:
+        db.create_tables()
+    yield dbs
+    for db in dbs:
+        db.close()
+
+
+def test_iter_pages_is_lazy():
+    """
+    Verifica que el scraper en streaming entrega la primera página antes de pedir la siguiente.
+    """
+    scraper = Scraper(BASE_URL, session=fake_session())
+    pages = scraper.iter_pages()
+    quotes, authors = next(pages)
+    requested = scraper.session.get_adapter(BASE_URL).requested
+    assert len(quotes) == QUOTES_PER_PAGE
+    assert set(authors) == {quote.author for quote in quotes}
+    assert not any('/page/2/' in url for url in requested)
+    assert scraper.quotes == []
+
+
+def test_streaming_matches_batch(databases):
+    """
+    Verifica que el pipeline en streaming deja la base de datos igual que el modo por lotes.
+    """
+    batch_db, stream_db = databases
+
+    scraper = Scraper(BASE_URL, session=fake_session())
+    scraper.scrape()
+    batch_db.insert_data(*clean_data(scraper.quotes, scraper.authors.values()))
+
+    with patch.object(Database, 'insert_data', autospec=True, side_effect=Database.insert_data) as insert_data:
+        pages = iter_clean_pages(Scraper(BASE_URL, session=fake_session()).iter_pages())
+        processed = stream_db.insert_stream(pages, batch_size=3)
+
+    assert processed == len(SITE_QUOTES)
+    assert insert_data.call_count == 2
+    assert all(len(call.args[1]) <= 3 + QUOTES_PER_PAGE for call in insert_data.call_args_list)
+    assert table_contents(stream_db) == table_contents(batch_db)
+    logging.info(f"Streaming: {processed} Frases en {insert_data.call_count} lotes")
+
+
+def test_incremental_update_skips_unchanged_pages():
+    """
+    Verifica que la actualización incremental solo procesa las páginas modificadas, que una
+    ejecución sin cambios hace una sola petición y ninguna escritura, y que `stop_after=0`
+    recorre todo el listado.
+    """
+    from update_database import update_incremental
+    site = list(SITE_QUOTES)
+    db = Database(database=':memory:')
+    db.create_tables()
+
+    def run(stop_after=1):
+        session = fake_session(quotes=site)
+        changed = update_incremental(Scraper(BASE_URL, session=session), db, stop_after=stop_after)
+        listing = [url for url in session.get_adapter(BASE_URL).requested if '/page/' in url]
+        return changed, listing
+
+    pages = -(-len(SITE_QUOTES) // QUOTES_PER_PAGE)
+    changed, listing = run()
+    assert changed == pages
+    assert len(db.get_page_fingerprints()) == pages
+    assert db.fetch_one("SELECT COUNT(*) FROM quotes")[0] == len(SITE_QUOTES)
+
+    statements = []
+    db.connection.set_trace_callback(statements.append)
+    changed, listing = run()
+    db.connection.set_trace_callback(None)
+    assert changed == 0
+    assert listing == [f"{BASE_URL}/page/1/"]
+    assert all(s.lstrip().upper().startswith('SELECT') for s in statements)
+
+    # Una Frase nueva al final del listado solo se detecta recorriendo todas las páginas
+    # (update_database lo hace periódicamente, ver test_full_sweep_due)
+    site.append(('“Frase nueva.”', 'Albert Einstein', ['nueva'], '/author/Albert-Einstein'))
+    assert run()[0] == 0
+    changed, listing = run(stop_after=0)
+    assert changed == 1
+    assert db.fetch_one("SELECT COUNT(*) FROM quotes")[0] == len(SITE_QUOTES) + 1
+    db.close()
+
+
+def test_full_sweep_due(monkeypatch):
+    """
+    Verifica que el modo incremental recorre el listado completo en la primera ejecución y
+    después cada `full_sweep_interval` segundos, y nunca si el intervalo es 0.
+    """
+    import update_database
+    monkeypatch.setitem(update_database.PIPELINE_CONFIG, 'full_sweep_interval', 3600)
+    monkeypatch.setattr(update_database, '_last_full_sweep', None)
+    assert update_database.full_sweep_due(now=100)
+    monkeypatch.setattr(update_database, '_last_full_sweep', 100)
+    assert not update_database.full_sweep_due(now=3000)
+    assert update_database.full_sweep_due(now=3700)
+    monkeypatch.setitem(update_database.PIPELINE_CONFIG, 'full_sweep_interval', 0)
+    assert not update_database.full_sweep_due(now=10_000)
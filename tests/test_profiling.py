@@ -0,0 +1,73 @@
+import copy
+import logging
+import os
+import pstats
+from src import profiling
+from src.clean_data import clean_data
+from src.database import Database
+from src.models import Quote
+from src.profiling import ProfilingSession, profiled, start_session
+from src.scraper import Scraper
+from tests.test_scraper import BASE_URL, fake_session
+
+
+def test_profiled_is_transparent_without_session():
+    """Sin sesión activa el decorador solo llama a la función."""
+    @profiled('prueba')
+    def add(a, b):
+        return a + b
+
+    assert profiling._session is None
+    assert add(1, 2) == 3
+    assert start_session('prueba', enabled=False) is None
+
+
+def test_session_profiles_hot_paths(tmp_path, caplog):
+    """Cada ámbito se perfila por separado, se guarda en un .prof y se resume en el log."""
+    with caplog.at_level('INFO'):
+        session = ProfilingSession('prueba', str(tmp_path), top_n=5).start()
+        for concurrency in (1, 3):
+            scraper = Scraper(BASE_URL, concurrency=concurrency, session=fake_session())
+            scraper.scrape()
+            scraper.close()
+        quotes, authors = clean_data(scraper.quotes, scraper.authors.values())
+        db = Database(database=':memory:')
+        db.create_tables()
+        db.insert_data(quotes, authors)
+        db.close()
+        paths = session.stop()
+
+    assert profiling._session is None
+    assert set(paths) == {'scrape_quotes', 'scrape_authors', 'clean_data', 'insert_data'}
+    assert session.timings['scrape_quotes'][0] == 2  # versión secuencial y asíncrona
+    for path in paths.values():
+        assert pstats.Stats(path).total_calls > 0
+    hotspots = session.hotspots('insert_data')
+    assert 0 < len(hotspots) <= 5
+    assert hotspots == sorted(hotspots, key=lambda row: row['tottime'], reverse=True)
+    assert any('Perfil de insert_data' in message for message in caplog.messages)
+
+
+def test_profile_summary_reaches_configured_log(tmp_path, monkeypatch):
+    """Con el logging de update_database configurado, el resumen de puntos calientes llega al fichero de log."""
+    import update_database
+    config = copy.deepcopy(update_database.LOG_CONFIG)
+    for handler in config['handlers'].values():
+        handler['filename'] = str(tmp_path / os.path.basename(handler['filename']))
+    monkeypatch.setattr(update_database, 'LOG_CONFIG', config)
+    loggers = [logging.getLogger(), logging.getLogger('metrics')]
+    saved = [(logger.handlers[:], logger.level, logger.propagate) for logger in loggers]
+    update_database.setup_logging()
+    try:
+        session = start_session('prueba', enabled=True, output_dir=str(tmp_path / 'profiles'), top_n=3)
+        clean_data([Quote("Frase", "Autor", ["vida"], "/author/Autor")], [])
+        session.stop()
+    finally:
+        for logger, (handlers, level, propagate) in zip(loggers, saved):
+            for handler in logger.handlers:
+                handler.close()
+            logger.handlers[:] = handlers
+            logger.setLevel(level)
+            logger.propagate = propagate
+    log = (tmp_path / 'scraping.log').read_text(encoding='utf-8')
+    assert 'Perfil de clean_data' in log
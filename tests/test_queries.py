@@ -0,0 +1,124 @@
+import pytest
+from src import queries
+from src.database import Database
+from src.models import Quote, Author
+
+
+@pytest.fixture
+def database():
+    """
+    Crea una base de datos SQLite en memoria con 12 Frases de 3 autores.
+
+    Yields:
+        Database: Base de datos con datos de prueba.
+    """
+    db = Database(database=':memory:')
+    db.create_tables()
+    authors = {
+        f"Autor {i}": Author(f"Autor {i}", f"Biografía {i}", f"https://quotes.toscrape.com/author/Autor-{i}")
+        for i in range(3)
+    }
+    quotes = [
+        Quote(f"Frase {i:02d}", f"Autor {i % 3}", [f"tag{i % 4}", "comun"] if i % 5 else [], authors[f"Autor {i % 3}"].about_link)
+        for i in range(12)
+    ]
+    db.insert_data(quotes, authors)
+    yield db
+    db.close()
+
+
+def count_statements(db, function, *args):
+    """Ejecuta `function` y devuelve su resultado junto con el número de sentencias SQL lanzadas."""
+    statements = []
+    db.connection.set_trace_callback(statements.append)
+    try:
+        result = function(db, *args)
+    finally:
+        db.connection.set_trace_callback(None)
+    return result, len(statements)
+
+
+def test_quotes_page_single_query(database):
+    """
+    Verifica que una página de Frases trae autor y etiquetas con una sola consulta.
+    """
+    page, statements = count_statements(database, queries.fetch_quotes_page, 2, 5)
+    assert statements == 1
+    assert [quote.text for quote in page] == [f"Frase {i:02d}" for i in range(5, 10)]
+    first = page[0]
+    assert first.author_name == "Autor 2"
+    assert first.about_link.endswith("Autor-2")
+    assert first.tags == []
+    assert [name for _, name in page[1].tags] == ["comun", "tag2"]
+
+    last_page = queries.fetch_quotes_page(database, 3, 5)
+    assert len(last_page) == 2
+    assert queries.count_quotes(database) == 12
+
+
+def test_fetch_quote(database):
+    """
+    Verifica la consulta de una Frase por ID con sus etiquetas y el caso inexistente.
+    """
+    quote = queries.fetch_quote(database, 2)
+    assert quote.text == "Frase 01"
+    assert {name for _, name in quote.tags} == {"tag1", "comun"}
+    assert queries.fetch_quote(database, 999) is None
+
+
+def test_tag_and_top_views_include_author(database):
+    """
+    Verifica que las vistas por etiqueta y TOP 5 devuelven el nombre del autor sin consultas adicionales.
+    """
+    tag_id = database.get_tag_id("tag1")
+    rows, statements = count_statements(database, queries.fetch_quotes_by_tag, tag_id)
+    assert statements == 1
+    assert [(text, author) for _, text, author in rows] == [("Frase 01", "Autor 1"), ("Frase 09", "Autor 0")]
+
+    top = queries.fetch_top_quotes(database, 5)
+    assert [row[1] for row in top] == [f"Frase {i:02d}" for i in range(11, 6, -1)]
+    assert all(row[2] for row in top)
+
+    assert [row[2] for row in queries.fetch_top_authors(database)] == [4, 4, 4]
+    assert queries.fetch_top_tags(database)[0][1:] == ("comun", 9)
+    assert len(queries.fetch_authors_page(database, 1, 2)) == 2
+    assert queries.count_authors(database) == 3
+
+
+def test_stats_tables_are_incremental(database):
+    """
+    Verifica que insert_data mantiene los contadores del TOP 5 y que rebuild_stats los repara.
+    """
+    def counters():
+        return (database.fetch_all("SELECT author_id, quote_count FROM author_stats ORDER BY author_id"),
+                database.fetch_all("SELECT tag_id, usage_count FROM tag_stats ORDER BY tag_id"))
+
+    link = "https://quotes.toscrape.com/author/Autor-Nuevo"
+    database.insert_data(
+        [Quote("Frase nueva", "Autor 2", ["comun", "nueva"], "https://quotes.toscrape.com/author/Autor-2"),
+         Quote("Frase 00", "Autor 0", ["comun"], "https://quotes.toscrape.com/author/Autor-0")],
+        {"Autor Nuevo": Author("Autor Nuevo", "Sin Frases", link)}
+    )
+    assert queries.fetch_top_authors(database, 1)[0][1:] == ("Autor 2", 5)
+    assert queries.fetch_top_tags(database, 1)[0][1:] == ("comun", 10)
+    assert queries.fetch_top_authors(database, 10)[-1][1:] == ("Autor Nuevo", 0)
+
+    incremental = counters()
+    database.cursor.execute("UPDATE author_stats SET quote_count = 99")
+    database.cursor.execute("DELETE FROM tag_stats")
+    database.connection.commit()
+    assert database.rebuild_stats() == {'author_stats': 4, 'tag_stats': len(incremental[1])}
+    assert counters() == incremental
+
+
+def test_top_views_read_the_counter_index(database):
+    """Verifica que el TOP 5 recorre el índice de los contadores en lugar de agrupar."""
+    for function, index in ((queries.fetch_top_authors, 'idx_author_stats_quote_count'),
+                            (queries.fetch_top_tags, 'idx_tag_stats_usage_count')):
+        statements = []
+        database.connection.set_trace_callback(statements.append)
+        function(database)
+        database.connection.set_trace_callback(None)
+        plan = ' '.join(row[3] for row in database.fetch_all("EXPLAIN QUERY PLAN " + statements[0]))
+        assert index in plan
+        assert 'GROUP BY' not in statements[0]
@@ -0,0 +1,146 @@
+import threading
+import time
+import pytest
+import requests
+from src.rate_limiter import AdaptiveLimiter, HostRateLimiter, parse_retry_after
+from src.scraper import Scraper
+from tests.test_scraper import BASE_URL, SITE_QUOTES, FakeSiteAdapter
+
+
+class FakeClock:
+    """Reloj manual: `sleep` avanza el tiempo y registra las esperas."""
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+
+def make_limiter(clock, **kwargs):
+    return AdaptiveLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_parse_retry_after():
+    """Retry-After se acepta en segundos o como fecha HTTP."""
+    assert parse_retry_after('5') == 5.0
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after('pronto') is None
+    assert parse_retry_after(None) is None
+
+
+def test_token_bucket_allows_burst_then_paces():
+    """Tras consumir la ráfaga, las peticiones se espacian según el ritmo."""
+    clock = FakeClock()
+    limiter = make_limiter(clock, rate=2.0, burst=2, increase=0.0)
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(200, 0.01)
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_aimd_increases_on_healthy_latency_and_halves_on_throttling():
+    """Las respuestas rápidas suben el ritmo y la ventana; un 429 los reduce una vez por cooldown."""
+    clock = FakeClock()
+    limiter = make_limiter(clock, rate=4.0, burst=100, concurrency=2, increase=0.5, cooldown=1.0)
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(200, 0.05)
+    assert limiter.rate == 6.0 and int(limiter.limit) == 3
+
+    limiter.acquire()
+    limiter.release(200, 5.0)  # lenta: no sube
+    assert limiter.rate == 6.0
+
+    limiter.acquire()
+    limiter.release(429, 0.05)
+    limiter.acquire()
+    limiter.release(503, 0.05)  # dentro del cooldown: no se vuelve a reducir
+    assert limiter.rate == 3.0 and int(limiter.limit) == 1
+    assert limiter.stats()['throttled'] == 2 and limiter.stats()['decreases'] == 1
+
+
+def test_retry_after_blocks_the_host():
+    """Retry-After retiene la siguiente petición al host el tiempo indicado."""
+    clock = FakeClock()
+    limiter = make_limiter(clock, rate=100.0, burst=100)
+    limiter.acquire()
+    limiter.release(429, 0.05, retry_after=3.0)
+    limiter.acquire()
+    assert clock.sleeps == [3.0]
+
+
+def test_concurrency_window_limits_in_flight_requests():
+    """Nunca hay más peticiones en vuelo que la ventana de concurrencia."""
+    limiter = AdaptiveLimiter(rate=1000.0, burst=1000, concurrency=2, max_concurrency=2)
+    lock = threading.Lock()
+    in_flight = peak = 0
+
+    def worker():
+        nonlocal in_flight, peak
+        for _ in range(5):
+            limiter.acquire()
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.002)
+            with lock:
+                in_flight -= 1
+            limiter.release(200, 0.002)
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak == 2
+
+
+class ThrottlingSiteAdapter(FakeSiteAdapter):
+    """Sitio ficticio que responde 429 con Retry-After a las primeras `throttle` peticiones."""
+    def __init__(self, throttle, **kwargs):
+        super().__init__(**kwargs)
+        self.throttle = throttle
+
+    def send(self, request, **kwargs):
+        if self.throttle:
+            self.throttle -= 1
+            self.requested.append(request.url)
+            response = requests.Response()
+            response.status_code = 429
+            response.headers['Retry-After'] = '0'
+            response.url = request.url
+            response.request = request
+            response._content = b''
+            return response
+        return super().send(request, **kwargs)
+
+
+def throttling_session(throttle):
+    session = requests.Session()
+    session.mount('https://', ThrottlingSiteAdapter(throttle))
+    return session
+
+
+@pytest.mark.parametrize('concurrency', [1, 3])
+def test_scraper_retries_throttled_requests(concurrency):
+    """Un 429 se reintenta tras el Retry-After y la extracción termina completa."""
+    limiter = HostRateLimiter(retries=3, rate=1000.0, burst=1000)
+    scraper = Scraper(BASE_URL, concurrency=concurrency, session=throttling_session(2), rate_limiter=limiter)
+    scraper.scrape()
+    scraper.close()
+    assert len(scraper.quotes) == len(SITE_QUOTES)
+    assert limiter.stats()['quotes.toscrape.com']['throttled'] == 2
+
+
+def test_scraper_does_not_mistake_throttling_for_the_end():
+    """Si se agotan los reintentos, el listado falla en lugar de terminar como si no hubiera más páginas."""
+    limiter = HostRateLimiter(retries=1, rate=1000.0, burst=1000)
+    scraper = Scraper(BASE_URL, session=throttling_session(10), rate_limiter=limiter)
+    with pytest.raises(requests.HTTPError):
+        scraper.scrape_quotes()
+    assert scraper.quotes == []
@@ -0,0 +1,94 @@
+from src import queries
+from src.database import Database
+from src.models import Quote, Author
+from src.read_cache import ReadCache
+
+
+def counting_loader(calls, value):
+    """Devuelve un cargador que anota cada llamada en `calls`."""
+    def loader():
+        calls.append(value)
+        return value
+    return loader
+
+
+def test_ttl_expiry(monkeypatch):
+    """Las entradas caducan pasado el TTL y se vuelven a cargar."""
+    now = [100.0]
+    monkeypatch.setattr('src.read_cache.time.monotonic', lambda: now[0])
+    cache = ReadCache(ttl=10, maxsize=8)
+    calls = []
+
+    assert cache.get_or_load('k', counting_loader(calls, 1)) == 1
+    assert cache.get_or_load('k', counting_loader(calls, 2)) == 1
+    now[0] += 11
+    assert cache.get_or_load('k', counting_loader(calls, 3)) == 3
+    assert calls == [1, 3]
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
+
+
+def test_lru_bound():
+    """La caché no supera `maxsize` y descarta la entrada usada hace más tiempo."""
+    cache = ReadCache(ttl=60, maxsize=2)
+    calls = []
+    cache.get_or_load('a', counting_loader(calls, 'a'))
+    cache.get_or_load('b', counting_loader(calls, 'b'))
+    cache.get_or_load('a', counting_loader(calls, 'a'))
+    cache.get_or_load('c', counting_loader(calls, 'c'))
+
+    assert len(cache) == 2
+    cache.get_or_load('a', counting_loader(calls, 'a'))
+    cache.get_or_load('b', counting_loader(calls, 'b'))
+    assert calls == ['a', 'b', 'c', 'b']
+
+
+def test_version_invalidation():
+    """Un cambio de versión vacía la caché; repetir la misma versión no."""
+    cache = ReadCache(ttl=60, maxsize=8)
+
+    @cache.cached
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    calls = []
+    cache.set_version(0)
+    assert square(3) == 9
+    assert square(3) == 9
+    cache.set_version(0)
+    assert square(3) == 9
+    assert calls == [3]
+
+    cache.set_version(1)
+    assert len(cache) == 0
+    assert square(3) == 9
+    assert calls == [3, 3]
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_bump_data_version_invalidates_reads():
+    """Una inserción seguida de bump_data_version hace que la app vea los datos nuevos."""
+    db = Database(database=':memory:')
+    db.create_tables()
+    cache = ReadCache(ttl=300, maxsize=8)
+
+    @cache.cached
+    def count_quotes():
+        return queries.count_quotes(db)
+
+    try:
+        assert db.get_data_version() == 0
+        cache.set_version(db.get_data_version())
+        assert count_quotes() == 0
+
+        author = Author("Autor", "Biografía", "https://quotes.toscrape.com/author/Autor")
+        db.insert_data([Quote("Frase", "Autor", ["tag"], author.about_link)], {"Autor": author})
+        cache.set_version(db.get_data_version())
+        assert count_quotes() == 0
+
+        assert db.bump_data_version() == 1
+        cache.set_version(db.get_data_version())
+        assert count_quotes() == 1
+    finally:
+        db.close()
@@ -1,5 +1,8 @@
+import hashlib
 import logging
 import pytest
+import requests
+from requests.adapters import BaseAdapter
 from unittest.mock import patch
 from src.scraper import Scraper
 
@@ -91,3 +94,116 @@ def test_author_structure(scraper):
     assert 'name' in author, "Atributo 'name' no encontrado en el autor"
     assert 'about' in author, "Atributo 'about' no encontrado en el autor"
     logging.info("La estructura del autor es correcta")
+
+# Sitio ficticio con el formato de quotes.toscrape.com
+BASE_URL = 'https://quotes.toscrape.com/'
+SITE_QUOTES = [
+    ('“La vida es lo que pasa mientras estás ocupado haciendo otros planes.”', 'John Lennon', ['vida', 'planes'], '/author/John-Lennon'),
+    ('“El mejor momento para plantar un árbol fue hace 20 años.”', 'Proverbio Chino', ['árbol'], '/author/Proverbio-Chino'),
+    ('“Imagina a toda la gente viviendo la vida en paz.”', 'John Lennon', ['paz'], '/author/John-Lennon'),
+    ('“La imaginación es más importante que el conocimiento.”', 'Albert Einstein', [], '/author/Albert-Einstein'),
+    ('“Si buscas resultados distintos, no hagas siempre lo mismo.”', 'Albert Einstein', ['cambio'], '/author/Albert-Einstein'),
+]
+QUOTES_PER_PAGE = 2
+
+
+def render_listing(quotes):
+    """Genera el HTML de una página del listado."""
+    divs = []
+    for text, author, tags, link in quotes:
+        tag_links = ''.join(f'<a class="tag" href="/tag/{tag}/">{tag}</a>' for tag in tags)
+        divs.append(
+            f'<div class="quote"><span class="text">{text}</span>'
+            f'<span>by <small class="author">{author}</small> <a href="{link}">(about)</a></span>'
+            f'<div class="tags">Tags: {tag_links}</div></div>'
+        )
+    return f'<html><body><div class="col-md-8">{"".join(divs)}</div></body></html>'
+
+
+def render_author(name):
+    """Genera el HTML de la página de un autor."""
+    return (
+        f'<html><body><h3 class="author-title">{name}</h3>'
+        f'<p><strong>Born:</strong> <span class="author-born-date">March 14, 1879</span> '
+        f'<span class="author-born-location">in Ulm, Germany</span></p>'
+        f'<div class="author-description">\n  Biografía de {name}.\n</div></body></html>'
+    )
+
+
+class FakeSiteAdapter(BaseAdapter):
+    """Transporte local que sirve las páginas del sitio ficticio sin acceder a la red."""
+    def __init__(self, fail_authors=False, quotes=None):
+        super().__init__()
+        self.fail_authors = fail_authors
+        self.quotes = SITE_QUOTES if quotes is None else quotes
+        self.requested = []
+
+    def render(self, url):
+        path = url[len(BASE_URL):].strip('/')
+        if path.startswith('page/'):
+            page = int(path.split('/')[1])
+            chunk = self.quotes[(page - 1) * QUOTES_PER_PAGE:page * QUOTES_PER_PAGE]
+            return 200, render_listing(chunk)
+        if path.startswith('author/'):
+            if self.fail_authors:
+                return 500, ''
+            return 200, render_author(path.split('/')[1].replace('-', ' '))
+        return 404, ''
+
+    def send(self, request, **kwargs):
+        self.requested.append(request.url)
+        status, body = self.render(request.url)
+        response = requests.Response()
+        if status == 200:
+            etag = '"%s"' % hashlib.sha1(body.encode('utf-8')).hexdigest()[:16]
+            response.headers['ETag'] = etag
+            if request.headers.get('If-None-Match') == etag:
+                status, body = 304, ''
+        response.status_code = status
+        response.url = request.url
+        response.request = request
+        response.encoding = 'utf-8'
+        response._content = body.encode('utf-8')
+        return response
+
+    def close(self):
+        pass
+
+
+def fake_session(**kwargs):
+    """Crea una sesión de requests que usa el transporte local del sitio ficticio."""
+    session = requests.Session()
+    session.mount('https://', FakeSiteAdapter(**kwargs))
+    return session
+
+
+def snapshot(scraper):
+    """Resume el resultado de un scraper para poder compararlo."""
+    quotes = [(q.text, q.author, list(q.tags), q.author_about_link) for q in scraper.quotes]
+    authors = [(key, a.name, a.about, a.about_link) for key, a in scraper.authors.items()]
+    return quotes, authors
+
+
+def test_async_scrape_matches_sequential():
+    """
+    Verifica que el modo asíncrono produce exactamente las mismas Frases y autores que el secuencial.
+    """
+    sequential = Scraper(BASE_URL, session=fake_session())
+    sequential.scrape()
+    assert len(sequential.quotes) == len(SITE_QUOTES)
+    assert list(sequential.authors) == ['John Lennon', 'Proverbio Chino', 'Albert Einstein']
+
+    for concurrency in (2, 5):
+        concurrent = Scraper(BASE_URL, concurrency=concurrency, session=fake_session())
+        concurrent.scrape()
+        assert snapshot(concurrent) == snapshot(sequential)
+
+
+def test_async_scrape_authors_propagates_errors():
+    """
+    Verifica que un error al descargar un autor en modo asíncrono se propaga.
+    """
+    scraper = Scraper(BASE_URL, concurrency=3, session=fake_session(fail_authors=True))
+    with pytest.raises(requests.HTTPError):
+        scraper.scrape()
+    assert len(scraper.quotes) == len(SITE_QUOTES)
@@ -0,0 +1,107 @@
+import pytest
+from src import queries
+from src.database import Database
+from src.models import Quote, Author
+from src.search import Fts5Index, InvertedIndex, tokenize
+
+QUOTES = [
+    ("The world as we have created it is a process of our thinking.", "Albert Einstein", ["change", "world"]),
+    ("Imperfection is beauty, madness is genius.", "Marilyn Monroe", ["beauty"]),
+    ("Try not to become a man of success. Rather become a man of value.", "Albert Einstein", ["success"]),
+    ("El éxito consiste en ir de fracaso en fracaso sin perder el entusiasmo.", "Winston Churchill", ["éxito"]),
+    ("A day without sunshine is like, you know, night.", "Steve Martin", ["humor"]),
+]
+BIOS = {
+    "Albert Einstein": "Theoretical physicist born in Germany.",
+    "Marilyn Monroe": "American actress and model.",
+    "Winston Churchill": "British statesman and writer.",
+    "Steve Martin": "American comedian, actor and musician.",
+}
+
+
+@pytest.fixture(params=['fts5', 'python'])
+def database(request):
+    """
+    Base de datos SQLite en memoria con datos de prueba, con el índice FTS5 o con el
+    índice invertido en memoria.
+
+    Yields:
+        Database: Base de datos con datos de prueba.
+    """
+    db = Database(database=':memory:')
+    db.create_tables()
+    if request.param == 'python':
+        db._search_index = InvertedIndex(db)
+    authors = {name: Author(name, bio, f"https://quotes.toscrape.com/author/{name.replace(' ', '-')}") for name, bio in BIOS.items()}
+    db.insert_data([Quote(text, author, tags, authors[author].about_link) for text, author, tags in QUOTES], authors)
+    db.bump_data_version()
+    yield db
+    db.close()
+
+
+def test_backend_selection():
+    """SQLite con FTS5 usa las tablas de la migración 4."""
+    db = Database(database=':memory:')
+    db.create_tables()
+    assert isinstance(db.search_index, Fts5Index)
+    db.close()
+
+
+def test_tokenize():
+    assert tokenize("¡El Éxito, sin perder!") == ['el', 'exito', 'sin', 'perder']
+
+
+def test_search_quotes(database):
+    """Busca todos los términos, con prefijos y sin distinguir tildes ni mayúsculas."""
+    results = queries.search_quotes(database, "become VALUE")
+    assert [row[1] for row in results] == [QUOTES[2][0]]
+    assert results[0][2] == "Albert Einstein"
+
+    assert [row[2] for row in queries.search_quotes(database, "exito")] == ["Winston Churchill"]
+    assert [row[1] for row in queries.search_quotes(database, "think")] == [QUOTES[0][0]]
+    assert queries.search_quotes(database, "become sunshine") == []
+    assert queries.search_quotes(database, "  ¿? ") == []
+
+
+def test_search_ranking(database):
+    """Los resultados más relevantes aparecen primero."""
+    results = queries.search_quotes(database, "man")
+    assert results[0][1] == QUOTES[2][0]
+
+
+def test_search_authors(database):
+    """Busca autores por nombre y por biografía."""
+    assert [row[1] for row in queries.search_authors(database, "einstein")] == ["Albert Einstein"]
+    assert {row[1] for row in queries.search_authors(database, "american")} == {"Marilyn Monroe", "Steve Martin"}
+
+
+def test_insert_data_updates_index(database):
+    """Las Frases nuevas y las biografías actualizadas se encuentran sin reconstruir el índice."""
+    link = "https://quotes.toscrape.com/author/Steve-Martin"
+    author = Author("Steve Martin", "Banjo player and writer.", link)
+    database.insert_data([Quote("Some people have a way about them that seems to say banjo.", "Steve Martin", [], link)],
+                         {"Steve Martin": author})
+
+    assert [row[2] for row in queries.search_quotes(database, "banjo")] == ["Steve Martin"]
+    assert [row[1] for row in queries.search_authors(database, "banjo")] == ["Steve Martin"]
+    assert queries.search_authors(database, "comedian") == []
+
+
+def test_migration_indexes_existing_rows():
+    """La migración de búsqueda indexa las Frases que ya existían."""
+    from src import migrations
+    db = Database(database=':memory:')
+    db.create_tables()
+    db.cursor.execute("DROP TABLE quotes_fts")
+    db.cursor.execute("DROP TABLE authors_fts")
+    db.cursor.execute("DELETE FROM schema_version WHERE version = 4")
+    db.connection.commit()
+    authors = {"Albert Einstein": Author("Albert Einstein", BIOS["Albert Einstein"], "link")}
+    db._search_index = InvertedIndex(db)
+    db.insert_data([Quote(QUOTES[0][0], "Albert Einstein", [], "link")], authors)
+
+    migrations.migrate(db)
+    db._search_index = None
+    assert [row[1] for row in queries.search_quotes(db, "process thinking")] == [QUOTES[0][0]]
+    assert [row[1] for row in queries.search_authors(db, "physicist")] == ["Albert Einstein"]
+    db.close()
@@ -1,52 +1,208 @@
-import time
-import schedule
+import argparse
 import logging
+import logging.config
+import time
 from src.scraper import Scraper
+from src.author_store import AuthorStore
+from src.http_cache import ResponseCache
+from src.rate_limiter import create_rate_limiter
+from src.frontier import create_frontier
 from src.database import Database
-from src.clean_data import clean_data
-from config.config import DB_CONFIG, SCRAPE_URL, LOG_CONFIG
+from src.job_runner import JobRunner, FileLock, RunContext
+from src.clean_data import clean_data, iter_clean_pages
+from src import metrics
+from src.profiling import start_session
+from config.config import DB_CONFIG, SCRAPE_URL, SCRAPER_CONCURRENCY, AUTHOR_STORE_CONFIG, HTTP_CACHE_CONFIG, RATE_LIMIT_CONFIG, FRONTIER_CONFIG, PIPELINE_CONFIG, CLEAN_CONFIG, SCHEDULER_CONFIG, METRICS_CONFIG, PROFILE_CONFIG, LOG_CONFIG
+
+
+def setup_logging():
+    '''
+    Esta función:
+    1. Configura el sistema de logging con LOG_CONFIG (log general y resumen JSON de métricas).
+    '''
+    logging.config.dictConfig(LOG_CONFIG)
+
+# Instante (time.monotonic) del último recorrido completo del listado en modo incremental
+_last_full_sweep = None
 
+def full_sweep_due(now=None):
+    '''
+    Esta función:
+    1. Indica si toca recorrer el listado completo en modo incremental: en la primera ejecución
+    del proceso y cada PIPELINE_FULL_SWEEP_INTERVAL segundos (0 = nunca).
+    '''
+    interval = PIPELINE_CONFIG['full_sweep_interval']
+    if not interval:
+        return False
+    now = time.monotonic() if now is None else now
+    return _last_full_sweep is None or now - _last_full_sweep >= interval
+
+def update_incremental(scraper, db, stop_after=1):
+    '''
+    Esta función:
+    1. Recorre solo las páginas del listado cuya huella ha cambiado desde la última ejecución.
+    2. Limpia e inserta sus Frases y guarda la huella de cada página en la misma transacción.
+    3. Devuelve el número de páginas con datos nuevos (0 si no ha cambiado nada: sin escrituras).
+    '''
+    known = db.get_page_fingerprints()
+    changed = 0
+    for fingerprint, quotes, authors in scraper.iter_changed_pages(known, stop_after=stop_after):
+        if not quotes:
+            # Solo ha cambiado el HTML: se guarda la huella para no volver a parsear la página
+            db.save_page_fingerprint(fingerprint)
+            continue
+        cleaned_quotes, cleaned_authors = clean_data(quotes, authors.values())
+        db.save_page_fingerprint(fingerprint, commit=False)
+        if db.insert_data(cleaned_quotes, cleaned_authors) is None:
+            logging.error(f"No se pudo insertar la página {fingerprint.url}; se reintentará en la próxima ejecución")
+            continue
+        changed += 1
+    logging.info(f"Actualización incremental: {changed} páginas con cambios")
+    return changed
 
-def update_database():
+def update_database(context=None, profile=PROFILE_CONFIG['enabled']):
     '''
     Esta función:
     1. Inicializa el scraper y obtiene nuevos datos.
     2. Limpia los datos obtenidos.
     3. Conecta a la base de datos e inserta los nuevos datos.
+    4. Anota en `context` (RunContext) las filas modificadas y las páginas descargadas, y deja
+    de pedir páginas y de empezar etapas al agotar su presupuesto de tiempo (BudgetExceededError).
+    5. Con `profile`, perfila las rutas críticas de la ejecución (ver src/profiling.py).
+    6. En modo incremental, recorre el listado completo cuando toca (ver full_sweep_due).
     '''
+    global _last_full_sweep
     logging.info("Iniciando actualización de la base de datos")
-    
+    context = context or RunContext()
+    start = time.perf_counter()
+    profiler = start_session('update_database', **dict(PROFILE_CONFIG, enabled=profile))
+    scraper = db = None
     try:
         # Inicializar el scraper y obtener nuevos datos
-        scraper = Scraper(SCRAPE_URL)
-        scraper.scrape_quotes()
-        scraper.scrape_authors()
-        
-        # Limpiar los nuevos datos
-        cleaned_quotes, cleaned_authors = clean_data(scraper.quotes, scraper.authors.values())
-        
-        # Conectar a la base de datos e insertar los nuevos datos
-        db = Database(**DB_CONFIG)
-        db.insert_data(cleaned_quotes, cleaned_authors)
+        scraper = Scraper(
+            SCRAPE_URL,
+            concurrency=SCRAPER_CONCURRENCY,
+            author_store=AuthorStore(**AUTHOR_STORE_CONFIG),
+            cache=ResponseCache(**HTTP_CACHE_CONFIG),
+            rate_limiter=create_rate_limiter(RATE_LIMIT_CONFIG),
+        )
+        scraper.deadline = context.deadline
+        if PIPELINE_CONFIG['incremental']:
+            # Procesar solo las páginas que han cambiado y detenerse en las ya conocidas,
+            # salvo en el recorrido completo periódico, que detecta las Frases añadidas
+            # detrás de páginas sin cambios
+            full_sweep = full_sweep_due()
+            db = Database(**DB_CONFIG)
+            db.create_tables()
+            with metrics.stage('incremental'):
+                update_incremental(scraper, db, stop_after=0 if full_sweep else PIPELINE_CONFIG['stop_after'])
+            if full_sweep:
+                _last_full_sweep = time.monotonic()
+        elif PIPELINE_CONFIG['streaming']:
+            # Extraer, limpiar e insertar página a página en lotes acotados
+            db = Database(**DB_CONFIG)
+            db.create_tables()
+            pages = iter_clean_pages(scraper.iter_pages())
+            with metrics.stage('stream'):
+                db.insert_stream(pages, batch_size=PIPELINE_CONFIG['batch_size'])
+        else:
+            # Reanudar el recorrido por lotes si la ejecución anterior no lo terminó
+            scraper.frontier = create_frontier(FRONTIER_CONFIG)
+            with metrics.stage('scrape'):
+                scraper.scrape()
+
+            # Limpiar los nuevos datos
+            context.check_deadline('la limpieza')
+            with metrics.stage('clean'):
+                cleaned_quotes, cleaned_authors = clean_data(scraper.quotes, scraper.authors.values(), **CLEAN_CONFIG)
+
+            # Conectar a la base de datos e insertar los nuevos datos
+            context.check_deadline('la inserción')
+            db = Database(**DB_CONFIG)
+            db.create_tables()
+            with metrics.stage('insert'):
+                inserted = db.insert_data(cleaned_quotes, cleaned_authors)
+            if inserted is not None and scraper.frontier is not None:
+                scraper.frontier.finish()
         
         logging.info("Actualización de la base de datos completada con éxito")
     except Exception as e:
         logging.error(f"Error durante la actualización de la base de datos: {str(e)}")
+        raise
     finally:
-        if 'db' in locals():
+        if scraper is not None:
+            context.pages_fetched = scraper.pages_fetched
+            scraper.close()
+        if db is not None:
+            context.rows_changed = db.rows_written
+            if db.rows_written:
+                # Invalidar las cachés de lectura de la aplicación, también si la
+                # ejecución se ha detenido tras confirmar parte de los datos
+                db.bump_data_version()
             db.close()
+        if profiler:
+            profiler.stop()
+        metrics.log_summary('update_database', duration=round(time.perf_counter() - start, 3),
+                            rows_changed=context.rows_changed, pages_fetched=context.pages_fetched)
+
+def rebuild_stats():
+    '''
+    Esta función:
+    1. Recalcula desde cero los contadores del TOP 5 (author_stats y tag_stats).
+    2. Invalida las cachés de lectura de la aplicación.
+    '''
+    logging.info("Reconstruyendo las estadísticas de la base de datos")
+    db = Database(**DB_CONFIG)
+    try:
+        db.create_tables()
+        db.rebuild_stats()
+        db.bump_data_version()
+    finally:
+        db.close()
+
+def record_run(run):
+    '''
+    Esta función:
+    1. Guarda el resultado de una ejecución (RunRecord) en la tabla `runs`.
+    '''
+    db = Database(**DB_CONFIG)
+    try:
+        db.create_tables()
+        db.record_run(run)
+    finally:
+        db.close()
 
-def run_scheduler():
+def run_scheduler(profile=PROFILE_CONFIG['enabled']):
     '''
     Esta función:
-    1. Programa la ejecución de update_database() cada 24 horas (o en el intervalo de tiempo que interese).
+    1. Programa la ejecución de update_database() cada SCHEDULER_INTERVAL segundos (por defecto, cada minuto).
+    2. Impide ejecuciones simultáneas con un bloqueo de fichero, limita cada ejecución a
+    SCHEDULER_BUDGET segundos y, si una ejecución se alarga, programa la siguiente al terminar
+    en lugar de acumular ejecuciones pendientes.
+    3. Registra cada ejecución en la tabla `runs`.
+    4. Con METRICS_PORT, sirve las métricas del proceso en formato Prometheus en /metrics.
     '''
-    schedule.every(1).minute.do(update_database)
-    
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    if METRICS_CONFIG['port']:
+        metrics.serve_prometheus(METRICS_CONFIG['port'])
+    runner = JobRunner(
+        lambda context: update_database(context, profile=profile),
+        SCHEDULER_CONFIG['interval'],
+        budget=SCHEDULER_CONFIG['budget'],
+        lock=FileLock(SCHEDULER_CONFIG['lock_path']),
+        recorder=record_run,
+    )
+    runner.run_forever()
 
 if __name__ == "__main__":
-    logging.info("Iniciando el programador de actualizaciones")
-    run_scheduler()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Actualización periódica de la base de datos de Frases")
+    parser.add_argument('--rebuild-stats', action='store_true',
+                        help="Recalcula los contadores del TOP 5 y termina")
+    parser.add_argument('--profile', action='store_true', default=PROFILE_CONFIG['enabled'],
+                        help="Perfila cada ejecución y resume los puntos calientes en el log")
+    args = parser.parse_args()
+    setup_logging()
+    if args.rebuild_stats:
+        rebuild_stats()
+    else:
+        logging.info("Iniciando el programador de actualizaciones")
+        run_scheduler(profile=args.profile)
\ No newline at end of file